@@ -1,14 +1,20 @@
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi import APIRouter, HTTPException, Header, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from app.services.langchain_service import LangChainService
 from app.models.request_models import PingRequest, ChatRequest, AnalysisRequest
 from app.utils.app_utils import make_analysis_data
 from app.services.analysis_service import process_analysis_in_background
-from typing import Dict
+from app.services.llm_registry import validate_llm_settings
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
 import httpx
 import uuid
 import json
+import hashlib
 from datetime import datetime
-from app.utils.task_manager import init_task_status, get_task_status
+from app.utils.task_manager import init_task_status, get_task_status, remove_task_status, init_batch_status, get_batch_status
+from app.utils.job_queue import analysis_queue, QueueFullError, QueueUnavailableError
+from app.utils.task_events import task_events, TERMINAL_EVENTS
+from app.utils.metrics import metrics
 
 router = APIRouter()
 
@@ -19,26 +25,25 @@ task_status: Dict[str, Dict] = {}
 async def ping(request: PingRequest):
     return { "response": "ok" }
 
+@router.get("/metrics")
+async def get_metrics():
+    """Prometheus 텍스트 형식의 메트릭을 반환합니다."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @router.post("/chat")
 async def chat(request: ChatRequest):
     #response = await langchain_service.process_chat(request.query)
     return {"response": "ok"}
 
-@router.post("/analysis")
-async def analysis(data: dict, background_tasks: BackgroundTasks):
-    task_id = str(uuid.uuid4())
+def _analysis_job(task_id: str, data: dict) -> Tuple[str, Callable[[], Awaitable[Any]]]:
+    """요청 데이터로 분석 작업을 만들고 (제공자, 실행 함수)를 반환합니다."""
     elk_id = data.get("elk_id", "")
-    provider = data.get("provider", "")
-    model = data.get("model", "")
-    temperature = data.get("temperature", 0.7)
+    provider, model, temperature = validate_llm_settings(
+        data.get("provider", ""), data.get("model", ""), data.get("temperature", 0.7)
+    )
     battle_data = json.loads( data.get("battle_data", {}) )
-    
-    # 작업 상태 초기화
-    init_task_status(task_id)
-    
-    # 백그라운드 작업 추가
-    background_tasks.add_task(
-        process_analysis_in_background,
+
+    return provider, lambda: process_analysis_in_background(
         task_id=task_id,
         elk_id=elk_id,
         provider=provider,
@@ -47,12 +52,122 @@ async def analysis(data: dict, background_tasks: BackgroundTasks):
         battle_data=battle_data,
         callback_api=""
     )
+
+def _payload_hash(data: dict) -> str:
+    """중복 요청 판별용 해시를 만듭니다."""
+    key = [data.get(name) for name in ("elk_id", "provider", "model", "temperature", "battle_data")]
+    return hashlib.sha256(json.dumps(key, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+@router.post("/analysis")
+async def analysis(data: dict):
+    task_id = str(uuid.uuid4())
+    try:
+        provider, run = _analysis_job(task_id, data)
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"invalid analysis request: {e}")
+    
+    # 작업 상태 초기화
+    init_task_status(task_id)
+    
+    # 분석 대기열에 작업 추가
+    try:
+        queue_position = await analysis_queue.submit(task_id, provider, run)
+    except QueueFullError as e:
+        remove_task_status(task_id)
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    except QueueUnavailableError as e:
+        remove_task_status(task_id)
+        raise HTTPException(status_code=503, detail=str(e))
     
-    return {"task_id": task_id}
+    return {"task_id": task_id, "queue_position": queue_position}
+
+@router.post("/analysis/batch")
+async def analysis_batch(data: dict):
+    items = data.get("items")
+    if not isinstance(items, list) or not items or not all(isinstance(item, dict) for item in items):
+        raise HTTPException(status_code=400, detail="items must be a non-empty list of analysis requests")
+
+    batch_id = str(uuid.uuid4())
+    batch_items = []
+    jobs = []
+    # 같은 요청은 하나의 작업으로 처리
+    task_ids: Dict[str, str] = {}
+    try:
+        for item in items:
+            payload_hash = _payload_hash(item)
+            if payload_hash not in task_ids:
+                task_id = str(uuid.uuid4())
+                provider, run = _analysis_job(task_id, item)
+                task_ids[payload_hash] = task_id
+                jobs.append((task_id, provider, run))
+            batch_items.append({"elk_id": item.get("elk_id", ""), "task_id": task_ids[payload_hash]})
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"invalid analysis request: {e}")
+
+    for task_id, _, _ in jobs:
+        init_task_status(task_id)
+
+    # 배치 전체를 한 번에 대기열에 추가 (자리가 부족하면 배치 전체 거절)
+    try:
+        await analysis_queue.submit_many(jobs)
+    except (QueueFullError, QueueUnavailableError) as e:
+        for task_id, _, _ in jobs:
+            remove_task_status(task_id)
+        if isinstance(e, QueueFullError):
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+        raise HTTPException(status_code=503, detail=str(e))
+
+    init_batch_status(batch_id, batch_items)
+    return {"batch_id": batch_id, "unique_tasks": len(jobs), "items": batch_items}
+
+@router.get("/analysis/batch/{batch_id}")
+async def get_analysis_batch_status(batch_id: str):
+    status = get_batch_status(batch_id)
+    if status["status"] == "not_found":
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return status
 
 @router.get("/analysis/{task_id}")
 async def get_analysis_status(task_id: str):
-    status = get_task_status(task_id)
+    status = await get_task_status(task_id)
+    if status["status"] == "not_found":
+        raise HTTPException(status_code=404, detail="Task not found")
+    return status
+
+def _sse(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    """SSE 메시지 형식으로 변환합니다."""
+    message = f"id: {event_id}\n" if event_id is not None else ""
+    return message + f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+@router.get("/analysis/{task_id}/events")
+async def get_analysis_events(task_id: str, request: Request, last_event_id: Optional[str] = Header(None)):
+    status = await get_task_status(task_id, include_result=False)
     if status["status"] == "not_found":
         raise HTTPException(status_code=404, detail="Task not found")
-    return status
\ No newline at end of file
+
+    try:
+        last_id = int(last_event_id) if last_event_id else 0
+    except ValueError:
+        last_id = 0
+
+    async def stream() -> AsyncIterator[str]:
+        # 현재 상태를 먼저 전송 (결과는 GET /analysis/{task_id}로 조회)
+        yield _sse("status", status)
+        if status["status"] in TERMINAL_EVENTS and not task_events.has_events(task_id):
+            # 이벤트 보관 기간이 지난 종료 작업
+            yield _sse(status["status"], {})
+            return
+
+        async for item in task_events.subscribe(task_id, last_id):
+            if await request.is_disconnected():
+                break
+            if item is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield _sse(item["event"], {**item["data"], "time": item["time"]}, item["id"])
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,10 +1,21 @@
 import os
-from typing import TypedDict, Literal
+from typing import TypedDict, Literal, Dict, List, Tuple
+
+class CallbackClientConfig(TypedDict, total=False):
+    timeout: float  # 요청 타임아웃(초)
+    connect_timeout: float  # 연결 타임아웃(초)
+    max_connections: int
+    max_keepalive_connections: int
+    max_retries: int  # 실패 시 재시도 횟수
+    base_backoff: float  # 재시도 대기 시간 기준값(초)
+    max_backoff: float  # 재시도 대기 시간 상한(초)
 
 class BattleVerifierServerConfig():
     protocol: str
     host: str
     port: int
+    batch_path: str  # 배치 콜백 경로 (비어 있으면 콜백을 하나씩 전송)
+    client: CallbackClientConfig
 
 class OpenAIConfig(TypedDict, total=False):
     api_key: str | None
@@ -15,17 +26,113 @@ class GoogleConfig(TypedDict, total=False):
 class AnthropicConfig(TypedDict, total=False):
     api_key: str | None
 
+class MockLLMConfig(TypedDict, total=False):
+    latency_distribution: Literal["fixed", "uniform", "normal", "lognormal"]  # 응답 지연 분포
+    latency_mean: float  # 평균 응답 지연(초)
+    latency_stddev: float  # 응답 지연 표준편차(초, uniform은 평균 ± 이 값)
+    error_rate: float  # 일반 오류 비율 (0~1)
+    rate_limit_rate: float  # 요청 제한(429) 오류 비율 (0~1)
+    retry_after: float  # 429 응답의 retry-after 값(초)
+    verdict: Literal["rule", "success", "fail"]  # rule: 유저/서버 턴 내용 비교, success/fail: 항상 같은 판정
+    seed: int | None  # 지연/오류 난수 시드 (None이면 매번 다름)
+
+class ExecutorConfig(TypedDict, total=False):
+    max_workers: int  # 디코딩/리포트 생성 프로세스 수 (0이면 스레드에서 실행)
+
+class TaskStoreConfig(TypedDict, total=False):
+    max_tasks: int  # 메모리에 유지할 최대 작업 수
+    ttl_seconds: float  # 종료된 작업 보관 시간
+    spill_threshold_bytes: int  # 이 크기 이상의 결과는 디스크에 저장 (0이면 사용 안 함)
+    spill_dir: str
+
+class JobQueueConfig(TypedDict, total=False):
+    max_workers: int  # 동시에 실행할 분석 작업 수
+    max_queue_size: int  # 최대 대기 작업 수 (초과 시 429)
+    provider_limits: Dict[str, int]  # 제공자별 동시 실행 수
+    default_provider_limit: int
+
+class RateLimitConfig(TypedDict, total=False):
+    requests_per_minute: float  # 분당 요청 수 (0이면 제한 없음)
+    max_concurrency: int  # 동시 요청 수
+    burst: int  # 한 번에 몰아서 보낼 수 있는 요청 수
+    max_retries: int  # 실패 시 재시도 횟수
+    base_backoff: float  # 재시도 대기 시간 기준값(초)
+    max_backoff: float  # 재시도 대기 시간 상한(초)
+
+class LLMCacheConfig(TypedDict, total=False):
+    enabled: bool
+    max_memory_entries: int  # 메모리 LRU 항목 수
+    disk_dir: str
+    max_disk_bytes: int  # 디스크 캐시 용량 (0이면 디스크 사용 안 함)
+
+class LLMClientsConfig(TypedDict, total=False):
+    preload: List[Tuple[str, str, float]]  # 앱 시작 시 미리 생성할 (제공자, 모델, temperature)
+    allowed_models: Dict[str, List[str]]  # 제공자별로 요청할 수 있는 모델 (설정한 제공자만 확인, preload 모델은 자동으로 허용)
+
+class CallbackOutboxConfig(TypedDict, total=False):
+    path: str  # SQLite 파일 경로
+    batch_size: int  # 한 번에 전송할 최대 콜백 수
+    poll_interval: float  # 대기 중인 콜백 확인 주기(초)
+    max_attempts: int  # 이 횟수만큼 실패하면 전송 중단
+    base_backoff: float  # 재전송 대기 시간 기준값(초)
+    max_backoff: float  # 재전송 대기 시간 상한(초)
+    dead_retention_seconds: float  # 전송을 중단한 콜백 보관 기간(초, 0이면 삭제 안 함)
+    cleanup_interval: float  # 보관 기간이 지난 콜백 삭제 주기(초)
+
+class ArtifactStoreConfig(TypedDict, total=False):
+    enabled: bool  # 리포트 등 분석 산출물 저장 여부 (기본값: 저장 안 함)
+    backend: str  # 저장소 종류 (local)
+    directory: str
+    compression: Literal["zstd", "gzip"]  # zstandard가 설치되어 있지 않으면 gzip 사용
+    retention_seconds: float  # 산출물 보관 기간(초, 0이면 삭제 안 함)
+    cleanup_interval: float  # 만료된 산출물 정리 주기(초)
+
+class TaskEventsConfig(TypedDict, total=False):
+    max_events_per_task: int  # 작업별로 보관할 최대 이벤트 수
+    heartbeat_seconds: float  # 이벤트가 없을 때 연결 유지 메시지를 보내는 주기(초)
+
+class TurnAnalysisConfig(TypedDict, total=False):
+    context_mode: Literal["rolling", "windowed", "full"]  # rolling: 압축 요약 + 최근 N턴, windowed: 윈도우별 병렬 분석, full: 기존 방식
+    context_turns: int  # 그대로 전달할 최근 턴 분석 수
+    summary_max_chars: int  # 오래된 턴 압축 요약의 최대 길이
+    window_size: int  # windowed 모드에서 한 윈도우가 분석하는 턴 수
+    window_overlap: int  # 앞 윈도우에서 컨텍스트로 가져오는 턴 수
+    window_concurrency: int  # 동시에 분석하는 윈도우 수
+    pack_budget_tokens: int  # 여러 턴을 한 번에 분석할 때의 입력 토큰 예산 (0이면 턴마다 호출)
+    pack_max_turns: int  # 한 번에 묶을 최대 턴 수
+
 class AppConfig(TypedDict):
     battle_verifier: BattleVerifierServerConfig
     openai: OpenAIConfig
     google: GoogleConfig
     anthropic: AnthropicConfig
+    mock_llm: MockLLMConfig
+    executor: ExecutorConfig
+    task_store: TaskStoreConfig
+    job_queue: JobQueueConfig
+    rate_limits: Dict[str, RateLimitConfig]  # "default", 제공자, "제공자:모델"
+    llm_cache: LLMCacheConfig
+    llm_clients: LLMClientsConfig
+    callback_outbox: CallbackOutboxConfig
+    turn_analysis: TurnAnalysisConfig
+    task_events: TaskEventsConfig
+    artifact_store: ArtifactStoreConfig
 
 DEFAULT_CONFIG: AppConfig = {
     "battle_verifier": {
         "protocol": "http",
         "host": "localhost",
         "port": 3000,
+        "batch_path": "",
+        "client": {
+            "timeout": 10.0,
+            "connect_timeout": 3.0,
+            "max_connections": 20,
+            "max_keepalive_connections": 10,
+            "max_retries": 3,
+            "base_backoff": 0.5,
+            "max_backoff": 10.0
+        }
     },
     "openai": {
         "api_key": ""
@@ -35,6 +142,90 @@ DEFAULT_CONFIG: AppConfig = {
     },
     "anthropic": {
         "api_key": ""
+    },
+    "mock_llm": {
+        "latency_distribution": "lognormal",
+        "latency_mean": 0.0,
+        "latency_stddev": 0.0,
+        "error_rate": 0.0,
+        "rate_limit_rate": 0.0,
+        "retry_after": 1.0,
+        "verdict": "rule",
+        "seed": None
+    },
+    "executor": {
+        "max_workers": os.cpu_count() or 1
+    },
+    "task_store": {
+        "max_tasks": 10000,
+        "ttl_seconds": 3600,
+        "spill_threshold_bytes": 16 * 1024,
+        "spill_dir": "./task_results"
+    },
+    "job_queue": {
+        "max_workers": 8,
+        "max_queue_size": 100,
+        "provider_limits": {},
+        "default_provider_limit": 4
+    },
+    "rate_limits": {
+        "default": {
+            "requests_per_minute": 60,
+            "max_concurrency": 4,
+            "burst": 4,
+            "max_retries": 2,
+            "base_backoff": 2.0,
+            "max_backoff": 60.0
+        },
+        # 로컬 모델과 mock 제공자는 설정하지 않으면 분당 요청 수를 제한하지 않음
+        "local": {
+            "requests_per_minute": 0
+        },
+        "mock": {
+            "requests_per_minute": 0
+        }
+    },
+    "llm_cache": {
+        "enabled": True,
+        "max_memory_entries": 2048,
+        "disk_dir": "./llm_cache",
+        "max_disk_bytes": 256 * 1024 * 1024
+    },
+    "llm_clients": {
+        "preload": [],
+        "allowed_models": {}
+    },
+    "callback_outbox": {
+        "path": "./callback_outbox.sqlite3",
+        "batch_size": 50,
+        "poll_interval": 5.0,
+        "max_attempts": 20,
+        "base_backoff": 1.0,
+        "max_backoff": 300.0,
+        "dead_retention_seconds": 7 * 24 * 3600,
+        "cleanup_interval": 3600.0
+    },
+    "turn_analysis": {
+        "context_mode": "rolling",
+        "context_turns": 3,
+        "summary_max_chars": 2000,
+        "window_size": 8,
+        "window_overlap": 2,
+        "window_concurrency": 4,
+        "pack_budget_tokens": 6000,
+        "pack_max_turns": 8
+    },
+    "task_events": {
+        "max_events_per_task": 1000,
+        "heartbeat_seconds": 15.0
+    },
+    "artifact_store": {
+        "enabled": False,
+        "backend": "local",
+        "directory": "./reports",
+        "compression": "zstd",
+        "retention_seconds": 7 * 24 * 3600,
+        "cleanup_interval": 3600.0
     }
 }
 
@@ -49,6 +240,14 @@ def load_config() -> AppConfig:
         config["battle_verifier"]["host"] = os.environ["BATTLE_VERIFIER_HOST"]
     if "BATTLE_VERIFIER_PORT" in os.environ:
         config["battle_verifier"]["port"] = int(os.environ["BATTLE_VERIFIER_PORT"])
+    if "BATTLE_VERIFIER_BATCH_PATH" in os.environ:
+        config["battle_verifier"]["batch_path"] = os.environ["BATTLE_VERIFIER_BATCH_PATH"]
+    if "BATTLE_VERIFIER_TIMEOUT" in os.environ:
+        config["battle_verifier"]["client"]["timeout"] = float(os.environ["BATTLE_VERIFIER_TIMEOUT"])
+    if "BATTLE_VERIFIER_MAX_CONNECTIONS" in os.environ:
+        config["battle_verifier"]["client"]["max_connections"] = int(os.environ["BATTLE_VERIFIER_MAX_CONNECTIONS"])
+    if "BATTLE_VERIFIER_MAX_RETRIES" in os.environ:
+        config["battle_verifier"]["client"]["max_retries"] = int(os.environ["BATTLE_VERIFIER_MAX_RETRIES"])
 
     # OpenAI 설정
     if "OPENAI_API_KEY" in os.environ:
@@ -61,6 +260,133 @@ def load_config() -> AppConfig:
     # Anthropic 설정
     if "ANTHROPIC_API_KEY" in os.environ:
         config["anthropic"]["api_key"] = os.environ["ANTHROPIC_API_KEY"]
+
+    # mock 제공자 설정 (오프라인 부하/동시성 테스트용)
+    mock_llm_envs = {
+        "MOCK_LLM_LATENCY_DISTRIBUTION": ("latency_distribution", str),
+        "MOCK_LLM_LATENCY_MEAN": ("latency_mean", float),
+        "MOCK_LLM_LATENCY_STDDEV": ("latency_stddev", float),
+        "MOCK_LLM_ERROR_RATE": ("error_rate", float),
+        "MOCK_LLM_RATE_LIMIT_RATE": ("rate_limit_rate", float),
+        "MOCK_LLM_RETRY_AFTER": ("retry_after", float),
+        "MOCK_LLM_VERDICT": ("verdict", str),
+        "MOCK_LLM_SEED": ("seed", int),
+    }
+    for env_name, (name, cast) in mock_llm_envs.items():
+        if env_name in os.environ:
+            config["mock_llm"][name] = cast(os.environ[env_name])
+
+    # 프로세스 풀 설정
+    if "EXECUTOR_MAX_WORKERS" in os.environ:
+        config["executor"]["max_workers"] = int(os.environ["EXECUTOR_MAX_WORKERS"])
+
+    # 작업 상태 저장소 설정
+    if "TASK_STORE_MAX_TASKS" in os.environ:
+        config["task_store"]["max_tasks"] = int(os.environ["TASK_STORE_MAX_TASKS"])
+    if "TASK_STORE_TTL_SECONDS" in os.environ:
+        config["task_store"]["ttl_seconds"] = float(os.environ["TASK_STORE_TTL_SECONDS"])
+    if "TASK_STORE_SPILL_BYTES" in os.environ:
+        config["task_store"]["spill_threshold_bytes"] = int(os.environ["TASK_STORE_SPILL_BYTES"])
+    if "TASK_STORE_SPILL_DIR" in os.environ:
+        config["task_store"]["spill_dir"] = os.environ["TASK_STORE_SPILL_DIR"]
+
+    # 분석 대기열 설정
+    if "JOB_QUEUE_MAX_WORKERS" in os.environ:
+        config["job_queue"]["max_workers"] = int(os.environ["JOB_QUEUE_MAX_WORKERS"])
+    if "JOB_QUEUE_MAX_SIZE" in os.environ:
+        config["job_queue"]["max_queue_size"] = int(os.environ["JOB_QUEUE_MAX_SIZE"])
+    if "JOB_QUEUE_PROVIDER_LIMIT" in os.environ:
+        config["job_queue"]["default_provider_limit"] = int(os.environ["JOB_QUEUE_PROVIDER_LIMIT"])
+    if "JOB_QUEUE_PROVIDER_LIMITS" in os.environ:
+        # 예: "openai=8,google=4"
+        for item in os.environ["JOB_QUEUE_PROVIDER_LIMITS"].split(","):
+            if "=" in item:
+                name, limit = item.split("=", 1)
+                config["job_queue"]["provider_limits"][name.strip()] = int(limit)
+
+    # 요청 제한 설정 (RATE_LIMIT_RPM 또는 RATE_LIMIT_OPENAI_RPM 형식)
+    rate_limit_envs = {
+        "RPM": ("requests_per_minute", float),
+        "CONCURRENCY": ("max_concurrency", int),
+        "BURST": ("burst", int),
+        "MAX_RETRIES": ("max_retries", int),
+    }
+    for provider in ("default", "local", "openai", "google", "anthropic", "mock"):
+        prefix = "RATE_LIMIT_" if provider == "default" else f"RATE_LIMIT_{provider.upper()}_"
+        for suffix, (name, cast) in rate_limit_envs.items():
+            if prefix + suffix in os.environ:
+                config["rate_limits"].setdefault(provider, {})[name] = cast(os.environ[prefix + suffix])
+
+    # LLM 응답 캐시 설정
+    if "LLM_CACHE_ENABLED" in os.environ:
+        config["llm_cache"]["enabled"] = os.environ["LLM_CACHE_ENABLED"].lower() in ("1", "true", "yes")
+    if "LLM_CACHE_MEMORY_ENTRIES" in os.environ:
+        config["llm_cache"]["max_memory_entries"] = int(os.environ["LLM_CACHE_MEMORY_ENTRIES"])
+    if "LLM_CACHE_DIR" in os.environ:
+        config["llm_cache"]["disk_dir"] = os.environ["LLM_CACHE_DIR"]
+    if "LLM_CACHE_MAX_DISK_BYTES" in os.environ:
+        config["llm_cache"]["max_disk_bytes"] = int(os.environ["LLM_CACHE_MAX_DISK_BYTES"])
+
+    # 콜백 아웃박스 설정
+    if "CALLBACK_OUTBOX_PATH" in os.environ:
+        config["callback_outbox"]["path"] = os.environ["CALLBACK_OUTBOX_PATH"]
+    if "CALLBACK_OUTBOX_BATCH_SIZE" in os.environ:
+        config["callback_outbox"]["batch_size"] = int(os.environ["CALLBACK_OUTBOX_BATCH_SIZE"])
+    if "CALLBACK_OUTBOX_MAX_ATTEMPTS" in os.environ:
+        config["callback_outbox"]["max_attempts"] = int(os.environ["CALLBACK_OUTBOX_MAX_ATTEMPTS"])
+    if "CALLBACK_OUTBOX_DEAD_RETENTION_SECONDS" in os.environ:
+        config["callback_outbox"]["dead_retention_seconds"] = float(os.environ["CALLBACK_OUTBOX_DEAD_RETENTION_SECONDS"])
+
+    # 턴 분석 컨텍스트 설정
+    if "TURN_CONTEXT_MODE" in os.environ:
+        config["turn_analysis"]["context_mode"] = os.environ["TURN_CONTEXT_MODE"]
+    if "TURN_CONTEXT_TURNS" in os.environ:
+        config["turn_analysis"]["context_turns"] = int(os.environ["TURN_CONTEXT_TURNS"])
+    if "TURN_SUMMARY_MAX_CHARS" in os.environ:
+        config["turn_analysis"]["summary_max_chars"] = int(os.environ["TURN_SUMMARY_MAX_CHARS"])
+    if "TURN_WINDOW_SIZE" in os.environ:
+        config["turn_analysis"]["window_size"] = int(os.environ["TURN_WINDOW_SIZE"])
+    if "TURN_WINDOW_OVERLAP" in os.environ:
+        config["turn_analysis"]["window_overlap"] = int(os.environ["TURN_WINDOW_OVERLAP"])
+    if "TURN_WINDOW_CONCURRENCY" in os.environ:
+        config["turn_analysis"]["window_concurrency"] = int(os.environ["TURN_WINDOW_CONCURRENCY"])
+    if "TURN_PACK_BUDGET_TOKENS" in os.environ:
+        config["turn_analysis"]["pack_budget_tokens"] = int(os.environ["TURN_PACK_BUDGET_TOKENS"])
+    if "TURN_PACK_MAX_TURNS" in os.environ:
+        config["turn_analysis"]["pack_max_turns"] = int(os.environ["TURN_PACK_MAX_TURNS"])
+
+    # 작업 이벤트 스트림 설정
+    if "TASK_EVENTS_MAX_EVENTS" in os.environ:
+        config["task_events"]["max_events_per_task"] = int(os.environ["TASK_EVENTS_MAX_EVENTS"])
+    if "TASK_EVENTS_HEARTBEAT" in os.environ:
+        config["task_events"]["heartbeat_seconds"] = float(os.environ["TASK_EVENTS_HEARTBEAT"])
+
+    # 분석 산출물 저장소 설정
+    if "ARTIFACT_STORE_ENABLED" in os.environ:
+        config["artifact_store"]["enabled"] = os.environ["ARTIFACT_STORE_ENABLED"].lower() in ("1", "true", "yes")
+    if "ARTIFACT_STORE_BACKEND" in os.environ:
+        config["artifact_store"]["backend"] = os.environ["ARTIFACT_STORE_BACKEND"]
+    if "ARTIFACT_STORE_DIR" in os.environ:
+        config["artifact_store"]["directory"] = os.environ["ARTIFACT_STORE_DIR"]
+    if "ARTIFACT_STORE_COMPRESSION" in os.environ:
+        config["artifact_store"]["compression"] = os.environ["ARTIFACT_STORE_COMPRESSION"]
+    if "ARTIFACT_STORE_RETENTION_SECONDS" in os.environ:
+        config["artifact_store"]["retention_seconds"] = float(os.environ["ARTIFACT_STORE_RETENTION_SECONDS"])
+
+    # 미리 생성할 LLM 클라이언트 (예: "openai:gpt-4o:0.7,google:gemini-2.0-flash:0.7")
+    if "LLM_CLIENT_PRELOAD" in os.environ:
+        for item in os.environ["LLM_CLIENT_PRELOAD"].split(","):
+            parts = item.strip().split(":")
+            if len(parts) >= 2:
+                temperature = float(parts[2]) if len(parts) > 2 else 0.7
+                config["llm_clients"]["preload"].append((parts[0], parts[1], temperature))
+
+    # 요청할 수 있는 모델 (예: "openai=gpt-4o|gpt-4o-mini,google=gemini-2.0-flash", 지정하지 않은 제공자는 모든 모델 허용)
+    if "LLM_ALLOWED_MODELS" in os.environ:
+        for item in os.environ["LLM_ALLOWED_MODELS"].split(","):
+            if "=" in item:
+                name, models = item.split("=", 1)
+                config["llm_clients"]["allowed_models"][name.strip()] = [model.strip() for model in models.split("|") if model.strip()]
     
     return config
 
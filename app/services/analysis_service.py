@@ -1,51 +1,76 @@
-import httpx
 from app.services.langchain_service import LangChainService
-from app.utils.app_utils import make_analysis_data
+from app.services.report_service import prepare_analysis, report_artifacts
+from app.utils.executor import run_cpu_bound
 from app.utils.task_manager import update_task_status
-from app.config.app_config import app_config
+from app.utils.callback_client import callback_client, get_callback_url
+from app.utils.callback_outbox import callback_outbox
+from app.utils.task_events import task_events
+from app.utils.artifact_store import artifact_store
+from app.utils.metrics import ANALYSIS_STAGE_SECONDS, ANALYSIS_TASKS
 from datetime import datetime
+import time
 
-def get_callback_url() -> str:
-    """Battle Verifier 서버의 콜백 URL을 생성합니다."""
-    verifier_config = app_config["battle_verifier"]
-    return f"{verifier_config['protocol']}://{verifier_config['host']}:{verifier_config['port']}/api/report_gen_finish"
+async def send_callback(payload: dict) -> None:
+    """콜백을 아웃박스에 기록합니다. 실제 전송은 디스패처가 백그라운드에서 수행합니다."""
+    try:
+        await callback_outbox.enqueue(payload)
+        return
+    except Exception as e:
+        print(f"콜백 아웃박스 기록 실패 ({payload.get('task_id')}): {e}")
+
+    # 아웃박스를 사용할 수 없으면 바로 전송
+    try:
+        await callback_client.post(payload, get_callback_url())
+    except Exception as e:
+        print(f"콜백 전송 실패 ({payload.get('task_id')}): {e}")
 
 async def process_analysis_in_background(task_id: str, elk_id: str, provider: str, model: str, temperature: float, battle_data: dict, callback_api: str):
+    def publish(event: str, data: dict = None) -> None:
+        task_events.publish(task_id, event, data)
+
+    started = time.perf_counter()
     try:
-        user_data = make_analysis_data(battle_data, "result_info", "user_record_minimal")
-        verify_data = make_analysis_data(battle_data, "result_info", "verify_record_minimal")
+        await update_task_status(task_id, "processing")
+        publish("processing")
+        report_types = ["status", "hp", "attack"]
+
+        # 디코딩, 리포트 생성, 구조 비교는 이벤트 루프 밖에서 실행
+        publish("stage", {"stage": "decode"})
+        with ANALYSIS_STAGE_SECONDS.time(stage="prepare"):
+            prepared = await run_cpu_bound(prepare_analysis, battle_data, report_types)
+        for stage, seconds in prepared["timings"].items():
+            ANALYSIS_STAGE_SECONDS.observe(seconds, stage=stage)
+        diff = prepared["diff"]
+        # 리포트 저장은 백그라운드에서 실행 (저장소를 사용하지 않으면 아무 작업도 하지 않음)
+        if artifact_store.enabled:
+            artifact_store.save(task_id, elk_id, report_artifacts(prepared))
+        publish("stage", {
+            "stage": "report_build",
+            "identical": diff["identical"],
+            "diverging_turns": diff["diverging_turns"],
+            "first_divergence": diff["first_divergence"]
+        })
         
         # 분석 서비스 초기화
-        langchain_service = LangChainService(provider=provider, model=model, temperature=temperature)
+        langchain_service = LangChainService(provider=provider, model=model, temperature=temperature, on_event=publish)
+        publish("stage", {"stage": "turn_analysis"})
         
-        # 분석 실행
-        result = await langchain_service.run(
-            user_data=user_data,
-            verify_data=verify_data,
-            report_types=["status", "hp", "attack"]
-        )
-        
-        # 콜백 API 호출
-        callback_url = get_callback_url()
-        async with httpx.AsyncClient() as client:
-            await client.post(callback_url, json={
-                "task_id": task_id,
-                "elk_id": elk_id,
-                "provider": provider,
-                "ai_model": model,
-                "temperature": temperature,
-                "status": "completed",
-                "result": result
-            })
-        
-        # 작업 상태 업데이트
-        update_task_status(task_id, "completed", result=result)
+        # 분석 실행 (구조 비교에서 차이가 난 턴만 LLM으로 분석)
+        with ANALYSIS_STAGE_SECONDS.time(stage="turn_analysis"):
+            result = await langchain_service.analyze_reports(
+                user_reports=prepared["user"],
+                verify_reports=prepared["verify"],
+                report_types=report_types,
+                flagged_turns=set(diff["diverging_turns"])
+            )
+        result["diff"] = diff
+        # 작업 전체/리포트 타입별 토큰 사용량 (제공자가 알려준 값 기준)
+        result["token_usage"] = langchain_service.token_usage.to_dict()
         
     except Exception as e:
         # 에러 발생 시 콜백 API 호출
-        callback_url = get_callback_url()
-        async with httpx.AsyncClient() as client:
-            await client.post(callback_url, json={
+        with ANALYSIS_STAGE_SECONDS.time(stage="callback_enqueue"):
+            await send_callback({
                 "task_id": task_id,
                 "elk_id": elk_id,
                 "provider": provider,
@@ -54,6 +79,30 @@ async def process_analysis_in_background(task_id: str, elk_id: str, provider: st
                 "status": "failed",
                 "error": str(e)
             })
+        publish("stage", {"stage": "callback"})
         
         # 작업 상태 업데이트
-        update_task_status(task_id, "failed", error=str(e)) 
\ No newline at end of file
+        await update_task_status(task_id, "failed", error=str(e))
+        publish("failed", {"error": str(e)})
+        ANALYSIS_TASKS.inc(status="failed")
+        ANALYSIS_STAGE_SECONDS.observe(time.perf_counter() - started, stage="total")
+        return
+
+    # 콜백 API 호출
+    with ANALYSIS_STAGE_SECONDS.time(stage="callback_enqueue"):
+        await send_callback({
+            "task_id": task_id,
+            "elk_id": elk_id,
+            "provider": provider,
+            "ai_model": model,
+            "temperature": temperature,
+            "status": "completed",
+            "result": result
+        })
+    publish("stage", {"stage": "callback"})
+    
+    # 작업 상태 업데이트
+    await update_task_status(task_id, "completed", result=result)
+    publish("completed")
+    ANALYSIS_TASKS.inc(status="completed")
+    ANALYSIS_STAGE_SECONDS.observe(time.perf_counter() - started, stage="total")
\ No newline at end of file
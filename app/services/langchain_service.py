@@ -1,18 +1,24 @@
 import asyncio
-import os
-from typing import Literal, List, Optional, Dict, Any
-from langchain_community.llms.ollama import Ollama
-from langchain_openai import ChatOpenAI
+import time
+from typing import Literal, List, Optional, Dict, Any, Iterable, Set, Callable, Awaitable
 from langchain.chains import LLMChain, SequentialChain
 from langchain.prompts import ChatPromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_anthropic import ChatAnthropic
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
 from app.prompts.battle_prompts import BATTLE_PROMPTS
-from battle_report import generate_battle_report
-from app.utils.app_utils import split_turns
-from app.config.app_config import app_config  # 설정 파일 import
+from app.services.report_service import create_battle_reports
+from app.utils.app_utils import split_turns, normalize_turn_content, turn_number
+from app.services.llm_registry import get_llm
+from app.utils.rate_limiter import get_rate_limiter
+from app.utils.llm_cache import llm_cache, template_hash
+from app.services.turn_context import RollingTurnContext, overlap_preamble, split_turn_verdicts
+from app.utils.token_utils import count_tokens
+from app.utils.token_usage import TokenUsage
+from app.utils.metrics import LLM_REQUEST_SECONDS, LLM_REQUESTS, TURN_VERDICTS, SUMMARY_PARSE_SECONDS, SUMMARY_PARSE_FAILURES
+from app.config.app_config import app_config
+
+# 묶음 분석 시 턴마다 응답에 필요한 토큰 수 (예산 계산용)
+PACK_OUTPUT_TOKENS_PER_TURN = 150
 
 class SummaryTopic(BaseModel):
     topic: str = Field(description="The topic of the summary")
@@ -22,50 +28,103 @@ class SummaryTopic(BaseModel):
 
 class LangChainService:
     
-    def __init__(self, provider: Literal["local", "openai", "google", "anthropic"], model: str, temperature: float):
+    def __init__(self, provider: Literal["local", "openai", "google", "anthropic", "mock"], model: str, temperature: float, skip_identical_turns: bool = True, context_mode: Optional[Literal["rolling", "windowed", "full"]] = None, on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None):
 
         self.provider = provider
         self.model = model
         self.temperature = temperature
+        # 유저/서버 턴 내용이 같으면 LLM 호출 없이 verify_success로 기록
+        self.skip_identical_turns = skip_identical_turns
+
+        # 턴 분석 시 이전 턴 컨텍스트 구성 방식
+        turn_analysis = app_config["turn_analysis"]
+        self.context_mode = context_mode or turn_analysis["context_mode"]
+        self.context_turns = turn_analysis["context_turns"]
+        self.summary_max_chars = turn_analysis["summary_max_chars"]
+        self.window_size = max(turn_analysis["window_size"], 1)
+        self.window_overlap = turn_analysis["window_overlap"]
+        self.window_concurrency = max(turn_analysis["window_concurrency"], 1)
+        # 여러 턴을 한 번의 호출로 묶을 때의 입력 토큰 예산 (0이면 묶지 않음)
+        self.pack_budget_tokens = turn_analysis["pack_budget_tokens"]
+        self.pack_max_turns = turn_analysis["pack_max_turns"]
         
-        # LLM 초기화
-        if provider == "local":
-            self.llm = Ollama(
-                model=self.model,
-                base_url="http://localhost:11434"
-            )
-        elif provider == "openai":
-            self.llm = ChatOpenAI(
-                model=self.model,
-                temperature=self.temperature,
-                openai_api_key=app_config["openai"]["api_key"]
-            )
-        elif provider == "google":
-            self.llm = ChatGoogleGenerativeAI(
-                model=self.model,
-                temperature=self.temperature,
-                google_api_key=app_config["google"]["api_key"]
-            )
-        elif provider == "anthropic":
-            self.llm = ChatAnthropic(
-                model=self.model,
-                temperature=self.temperature,
-                anthropic_api_key=app_config["anthropic"]["api_key"]
-            )
-        else:
-            raise ValueError(f"지원하지 않는 모델 제공자입니다: {provider}")
+        # 작업 간에 공유되는 LLM 클라이언트
+        self.llm = get_llm(provider, model, temperature)
+
+        # 제공자/모델별로 공유되는 요청 제한기
+        self.rate_limiter = get_rate_limiter(provider, model)
+
+        # 진행 이벤트 수신 함수 (턴별 판정, 요약 완료 등)
+        self.on_event = on_event
+
+        # 이 서비스로 실행한 LLM 호출의 리포트 타입별 토큰 사용량
+        self.token_usage = TokenUsage(provider, model)
+
+    def emit(self, event: str, data: Dict[str, Any]) -> None:
+        """진행 이벤트를 전달합니다. 수신 측 오류는 분석에 영향을 주지 않습니다."""
+        if self.on_event is None:
+            return
+        try:
+            self.on_event(event, data)
+        except Exception as e:
+            print(f"진행 이벤트 전달 중 오류 발생 ({event}): {e}")
+
+    def instrument(self, call: str, func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        """LLM 호출 함수를 감싸 시도마다 소요 시간과 결과(success/error)를 메트릭에 기록합니다."""
+        async def instrumented(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                result = await func(*args, **kwargs)
+                outcome = "success"
+                return result
+            finally:
+                LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, provider=self.provider, model=self.model, call=call)
+                LLM_REQUESTS.inc(provider=self.provider, model=self.model, call=call, outcome=outcome)
+        return instrumented
+
+    async def cached_call(self, template: str, inputs: Dict[str, Any], func, *args, parse: Optional[Callable[[Any], Any]] = None, **kwargs) -> Any:
+        """요청 제한 안에서 호출하고, 같은 프롬프트/입력의 응답은 캐시에서 반환합니다.
+
+        func(또는 parse)는 JSON으로 직렬화 가능한 값을 반환해야 합니다. parse가 주어지면
+        응답을 parse로 변환한 값을 캐시하며, 변환에 실패하면 예외를 그대로 전달하고 캐시하지 않습니다.
+        """
+        key = llm_cache.make_key(self.provider, self.model, self.temperature, template, inputs)
+
+        async def call() -> Any:
+            response = await self.rate_limiter.call(func, *args, **kwargs)
+            return parse(response) if parse is not None else response
+        return await llm_cache.get_or_call(key, call)
+
+    async def run(self, user_data: Iterable[Dict[str, Any]], verify_data: Iterable[Dict[str, Any]], report_types: List[str]) -> Dict[str, Any]:
+        # 유저/서버 기록을 각각 한 번만 순회하여 모든 타입의 리포트를 생성
+        user_reports = create_battle_reports(user_data, report_types)
+        verify_reports = create_battle_reports(verify_data, report_types)
+
+        return await self.analyze_reports(user_reports, verify_reports, report_types)
 
-    async def run(self, user_data: Dict[str, Any], verify_data: Dict[str, Any], report_types: List[str]) -> Dict[str, Any]:
-        # 각 리포트 타입에 대한 리포트 생성 및 분석 태스크 생성
+    async def analyze_reports(self, user_reports: Dict[str, Optional[str]], verify_reports: Dict[str, Optional[str]], report_types: List[str], flagged_turns: Optional[Set[Any]] = None) -> Dict[str, Any]:
+        """리포트를 타입별로 분석합니다. flagged_turns가 주어지면 해당 턴만 LLM으로 분석합니다.
+
+        분석하지 않는 리포트 타입(예: effect)은 {"skipped": 이유}를 결과로 반환합니다.
+        """
+        # 각 리포트 타입에 대한 분석 태스크 생성
         analysis_tasks = []
+        # 분석하지 않는 리포트 타입 (결과에 건너뛴 이유를 기록)
+        skipped: Dict[str, Any] = {}
         for report_type in report_types:
-            user_report = self.create_battle_report(user_data, report_type, f"user_{report_type}_report.txt")
-            verify_report = self.create_battle_report(verify_data, report_type, f"verify_{report_type}_report.txt")
+            user_report = user_reports.get(report_type)
+            verify_report = verify_reports.get(report_type)
             
             if report_type in ["status", "hp", "attack"]:
-                task = self.process_analyze_by_turn(user_report, verify_report, report_type.upper())
+                task = self.process_analyze_by_turn(user_report, verify_report, report_type.upper(), flagged_turns)
             elif report_type == "full":
                 task = self.process_analyze_full(user_report, verify_report)
+            else:
+                # 분석 프롬프트가 없는 리포트 타입 (예: effect)은 건너뛰고 결과에 표시
+                print(f"분석하지 않는 리포트 타입입니다: {report_type}")
+                skipped[report_type] = {"skipped": f"unsupported report type: {report_type}"}
+                continue
             
             analysis_tasks.append((report_type, task))
         
@@ -80,40 +139,26 @@ class LangChainService:
         # 결과를 리포트 타입과 매핑
         for report_type, result in zip(report_types, analysis_results):
             results[report_type] = result
+        results.update(skipped)
         
         return results
 
-    def create_battle_report(self, data: Dict[str, Any], report_type: Optional[str] = None, output_filename: Optional[str] = None) -> Optional[str]:
-
-        # 전투 리포트 생성
-        battle_report = generate_battle_report(data, report_type)
-        if not battle_report:
-            print("리포트 생성에 실패했습니다.")
-            return None
-
-        # 파일 저장
-        if output_filename:
-            try:
-                # reports 폴더 없으면 생성
-                current_folder = os.getcwd()
-                reports_folder = os.path.join(current_folder, "reports")
-                if not os.path.exists(reports_folder):
-                    os.makedirs(reports_folder)
-
-                report_file_path = os.path.join(reports_folder, output_filename)
-                with open(report_file_path, "w", encoding="utf-8") as report_file:
-                    report_file.write(battle_report)
-                print(f"\n전투 리포트(타입: {report_type}, 파일명: {output_filename})가 {report_file_path}에 저장되었습니다.")
-            except Exception as e:
-                print(f"리포트 저장 중 오류 발생: {e}")
-        
-        return battle_report
-
-    async def process_analyze_by_turn(self, user_report: str, verify_report: str, prompt_type: str) -> str:
+    async def process_analyze_by_turn(self, user_report: str, verify_report: str, prompt_type: str, flagged_turns: Optional[Set[Any]] = None) -> str:
         """## 턴별 분석을 수행하고 결과를 반환합니다."""
         # 턴별로 분리
         user_turns = split_turns(user_report)
         verify_turns = split_turns(verify_report)
+
+        if flagged_turns is not None and not flagged_turns:
+            # 구조 비교에서 차이가 없으면 LLM 호출 없이 결과 반환
+            json_result = {
+                "topic": f"{prompt_type} 검증",
+                "summary": f"유저와 서버의 전투 기록이 모든 턴({len(user_turns)}턴)에서 일치합니다.",
+                "key_differences": "없음",
+                "opinion": "구조 비교 결과 조작 흔적이 발견되지 않았습니다."
+            }
+            self.emit("summary", {"report_type": prompt_type.lower(), "result": json_result})
+            return json_result
         
         # 턴 비교 프롬프트 템플릿 생성
         turn_compare_prompt = ChatPromptTemplate.from_messages([
@@ -125,6 +170,16 @@ class LangChainService:
             Please analyze this turn considering the previous turn's summary.""")
         ])
         
+        # 여러 턴 묶음 비교 프롬프트 템플릿 생성
+        packed_compare_prompt = ChatPromptTemplate.from_messages([
+            ("system", BATTLE_PROMPTS[prompt_type]["turn_compare"]),
+            ("user", """Turns {turn_indices} Analysis:
+            Previous Turn Summary: {previous_summary}
+            {packed_turns}
+            Analyze each turn above separately, considering the previous turn's summary.
+            Write one verdict block per turn, in turn order, each starting with "turn <index>:" as in the output format.""")
+        ])
+        
         # 요약 프롬프트 템플릿 생성
         summary_prompt = ChatPromptTemplate.from_messages([
             ("system", BATTLE_PROMPTS[prompt_type]["summary"]),
@@ -157,54 +212,200 @@ class LangChainService:
             output_key="korean_summary"
         )
 
-        # 순차적 체인 생성
-        turn_analysis_chain = SequentialChain(
-            chains=[turn_compare_chain, summary_chain],
-            input_variables=["turn_index", "user_turn_content", "server_turn_content", "previous_summary", "turn_summaries"],
-            output_variables=["turn_analysis", "summary"],
-            verbose=True
-        )
-        
-        turn_summaries = []
-        previous_summary = "No previous turn data available."
-        
-        for idx, ((_, user_turn_content), (_, verify_turn_content)) in enumerate(zip(user_turns, verify_turns)):
-            try:
-                # 현재 턴 분석
-                result = await turn_analysis_chain.ainvoke({
-                    "turn_index": idx,
-                    "user_turn_content": user_turn_content,
-                    "server_turn_content": verify_turn_content,
-                    "previous_summary": previous_summary,
-                    "turn_summaries": "\n".join(turn_summaries) if turn_summaries else "No previous turns analyzed."
-                })
-                
-                # 현재 턴의 분석 결과 저장
-                turn_summaries.append(f"[Turn {idx}] Summary:\n{result['turn_analysis']}\n")
-                
-                # 다음 턴을 위한 이전 턴 요약 업데이트
-                previous_summary = result['turn_analysis']
-                
-            except Exception as e:
-                print(f"Turn {idx} analysis error: {e}")
-                await asyncio.sleep(5)
+        # 이 리포트 타입의 모든 체인 호출에서 토큰 사용량 집계
+        usage_config = {"callbacks": [self.token_usage.callback(prompt_type.lower())]}
+
+        rolling = self.context_mode != "full"
+        if rolling:
+            # 턴마다 비교 체인만 호출하고, 요약은 마지막에 한 번만 생성
+            turn_template = template_hash(turn_compare_prompt)
+
+            async def analyze_turn(inputs: Dict[str, Any]) -> Dict[str, str]:
+                result = await turn_compare_chain.ainvoke(inputs, config=usage_config)
+                return {"turn_analysis": result["turn_analysis"]}
+        else:
+            # 순차적 체인 생성
+            turn_analysis_chain = SequentialChain(
+                chains=[turn_compare_chain, summary_chain],
+                input_variables=["turn_index", "user_turn_content", "server_turn_content", "previous_summary", "turn_summaries"],
+                output_variables=["turn_analysis", "summary"],
+                verbose=True
+            )
+            turn_template = template_hash(turn_compare_prompt, summary_prompt)
+
+            async def analyze_turn(inputs: Dict[str, Any]) -> Dict[str, str]:
+                result = await turn_analysis_chain.ainvoke(inputs, config=usage_config)
+                return {"turn_analysis": result["turn_analysis"], "summary": result["summary"]}
+        analyze_turn = self.instrument("turn", analyze_turn)
+
+        turn_pairs = list(zip(user_turns, verify_turns))
+        # 프롬프트, 턴별 요약, 진행 이벤트에는 전투 기록의 turn_index("## Turn N")를 사용
+        # (구조 비교의 diverging_turns와 같은 번호, 번호가 없거나 중복되면 순서로 대신함)
+        turn_numbers = [turn_number(turn_id) for (turn_id, _), _ in turn_pairs]
+        if None in turn_numbers or len(set(turn_numbers)) != len(turn_numbers):
+            turn_numbers = list(range(len(turn_pairs)))
+        skipped_turns = 0
+
+        packed_template = template_hash(packed_compare_prompt)
+        packed_chain = packed_compare_prompt | self.llm
+        # 묶음 호출마다 반복되는 시스템 프롬프트와 턴별 응답 분량
+        base_tokens = count_tokens(BATTLE_PROMPTS[prompt_type]["turn_compare"], self.provider, self.model)
+        packing = rolling and self.pack_budget_tokens > 0 and self.pack_max_turns > 1
+
+        async def analyze_packed(inputs: Dict[str, Any]) -> Dict[str, str]:
+            response = await packed_chain.ainvoke(inputs, config=usage_config)
+            # 채팅 모델은 메시지, 텍스트 모델(local)은 문자열을 반환
+            return {"turn_analysis": getattr(response, "content", response)}
+        analyze_packed = self.instrument("packed_turns", analyze_packed)
+
+        def emit_turn(idx: int, analysis: Optional[str], source: str) -> None:
+            if analysis is None:
+                verdict = "error"
+            else:
+                verdict = "verify_fail" if "verify_fail" in analysis else "verify_success"
+            TURN_VERDICTS.inc(report_type=prompt_type.lower(), source=source, verdict=verdict)
+            self.emit("turn", {
+                "report_type": prompt_type.lower(),
+                "turn_index": turn_numbers[idx],
+                "verdict": verdict,
+                "source": source,
+                "analysis": analysis
+            })
+
+        async def analyze_turns(start: int, end: int, context: RollingTurnContext) -> List[str]:
+            """start부터 end 전까지의 턴을 순서대로 분석하여 턴별 요약을 반환합니다."""
+            nonlocal skipped_turns
+            turn_summaries: Dict[int, str] = {}
+            previous_summary = "No previous turn data available."
+            # 한 번에 분석할 턴 묶음 (턴 번호, 유저 내용, 서버 내용)과 예상 토큰 수
+            pending: List[Any] = []
+            pending_tokens = 0
+
+            async def analyze_single(idx: int, user_turn_content: str, verify_turn_content: str) -> None:
+                nonlocal previous_summary
+                number = turn_numbers[idx]
                 try:
-                    result = await turn_analysis_chain.ainvoke({
-                        "turn_index": idx,
+                    # 현재 턴 분석 (요청 제한 시에만 대기 후 재시도)
+                    inputs = {
+                        "turn_index": number,
                         "user_turn_content": user_turn_content,
                         "server_turn_content": verify_turn_content,
-                        "previous_summary": previous_summary,
-                        "turn_summaries": "\n".join(turn_summaries) if turn_summaries else "No previous turns analyzed."
-                    })
-                    turn_summaries.append(f"[Turn {idx}] Summary:\n{result['turn_analysis']}\n")
+                    }
+                    if rolling:
+                        inputs["previous_summary"] = context.render()
+                    else:
+                        inputs["previous_summary"] = previous_summary
+                        analyzed = [turn_summaries[key] for key in sorted(turn_summaries)]
+                        inputs["turn_summaries"] = "\n".join(analyzed) if analyzed else "No previous turns analyzed."
+                    result = await self.cached_call(turn_template, inputs, analyze_turn, inputs)
+
+                    # 현재 턴의 분석 결과 저장
+                    turn_summaries[idx] = f"[Turn {number}] Summary:\n{result['turn_analysis']}\n"
+                    emit_turn(idx, result['turn_analysis'], "llm")
+
+                    # 다음 턴을 위한 이전 턴 요약 업데이트
                     previous_summary = result['turn_analysis']
+                    context.add(number, result['turn_analysis'])
+
                 except Exception as e:
-                    print(f"Turn {idx} retry failed: {e}")
-                    turn_summaries.append(f"[Turn {idx}] Analysis failed\n")
-            
-            # 각 턴 분석 사이에 2초 대기
-            await asyncio.sleep(30)
+                    print(f"Turn {number} analysis failed: {e}")
+                    turn_summaries[idx] = f"[Turn {number}] Analysis failed\n"
+                    emit_turn(idx, None, "llm")
+
+            async def flush() -> None:
+                nonlocal pending, pending_tokens
+                batch, pending, pending_tokens = pending, [], 0
+                if len(batch) == 1:
+                    await analyze_single(*batch[0])
+                    return
+                if not batch:
+                    return
+
+                numbers = [turn_numbers[idx] for idx, _, _ in batch]
+                inputs = {
+                    "turn_index": "N",
+                    "turn_indices": ", ".join(str(number) for number in numbers),
+                    "previous_summary": context.render(),
+                    "packed_turns": "\n".join(
+                        f"### Turn {turn_numbers[idx]}\nUser Turn Content: {user_turn_content}\nServer Turn Content: {verify_turn_content}"
+                        for idx, user_turn_content, verify_turn_content in batch
+                    ),
+                }
+                try:
+                    result = await self.cached_call(packed_template, inputs, analyze_packed, inputs)
+                    verdicts = split_turn_verdicts(result["turn_analysis"], numbers)
+                except Exception as e:
+                    print(f"Turns {inputs['turn_indices']} analysis failed: {e}")
+                    verdicts = {}
+
+                for idx, user_turn_content, verify_turn_content in batch:
+                    number = turn_numbers[idx]
+                    if number in verdicts:
+                        turn_summaries[idx] = f"[Turn {number}] Summary:\n{verdicts[number]}\n"
+                        emit_turn(idx, verdicts[number], "llm")
+                        context.add(number, verdicts[number])
+                    else:
+                        # 응답에서 판정을 찾지 못한 턴은 단독으로 다시 분석
+                        await analyze_single(idx, user_turn_content, verify_turn_content)
+
+            for idx in range(start, end):
+                (turn_id, user_turn_content), (_, verify_turn_content) = turn_pairs[idx]
+                number = turn_numbers[idx]
+                if flagged_turns is not None and turn_number(turn_id) not in flagged_turns:
+                    # 구조 비교에서 차이가 없는 턴은 로컬에서 검증 성공 처리
+                    turn_summaries[idx] = f"[Turn {number}] Summary:\nturn {number}: verify_success\n"
+                    emit_turn(idx, f"turn {number}: verify_success", "local")
+                    context.add_verified(number)
+                    skipped_turns += 1
+                    continue
+
+                if self.skip_identical_turns and normalize_turn_content(user_turn_content) == normalize_turn_content(verify_turn_content):
+                    # 동일한 턴은 로컬에서 검증 성공 처리 (이전 턴 요약은 그대로 유지)
+                    turn_summaries[idx] = f"[Turn {number}] Summary:\nturn {number}: verify_success\n"
+                    emit_turn(idx, f"turn {number}: verify_success", "local")
+                    context.add_verified(number)
+                    skipped_turns += 1
+                    continue
+
+                if not packing:
+                    await analyze_single(idx, user_turn_content, verify_turn_content)
+                    continue
+
+                # 토큰 예산 안에서 연속된 턴을 묶어 한 번에 분석
+                turn_tokens = (
+                    count_tokens(user_turn_content, self.provider, self.model)
+                    + count_tokens(verify_turn_content, self.provider, self.model)
+                    + PACK_OUTPUT_TOKENS_PER_TURN
+                )
+                if pending:
+                    budget = self.pack_budget_tokens - base_tokens - count_tokens(context.render(), self.provider, self.model)
+                    if len(pending) >= self.pack_max_turns or pending_tokens + turn_tokens > budget:
+                        await flush()
+                pending.append((idx, user_turn_content, verify_turn_content))
+                pending_tokens += turn_tokens
+            await flush()
+
+            return [turn_summaries[idx] for idx in range(start, end)]
+
+        if self.context_mode == "windowed":
+            # 턴을 윈도우로 나누어 동시에 분석 (앞 윈도우와 겹치는 턴은 원본 내용을 컨텍스트로 전달)
+            semaphore = asyncio.Semaphore(self.window_concurrency)
+
+            async def analyze_window(start: int) -> List[str]:
+                async with semaphore:
+                    preamble = overlap_preamble(turn_pairs, start, self.window_overlap, turn_numbers=turn_numbers)
+                    context = RollingTurnContext(self.context_turns, self.summary_max_chars, preamble=preamble)
+                    return await analyze_turns(start, min(start + self.window_size, len(turn_pairs)), context)
+
+            windows = await asyncio.gather(*[analyze_window(start) for start in range(0, len(turn_pairs), self.window_size)])
+            # 윈도우 결과를 턴 순서대로 병합
+            turn_summaries = [summary for window in windows for summary in window]
+        else:
+            turn_summaries = await analyze_turns(0, len(turn_pairs), RollingTurnContext(self.context_turns, self.summary_max_chars))
         
+        if skipped_turns:
+            print(f"차이가 없는 턴 {skipped_turns}개는 LLM 분석 없이 verify_success로 처리했습니다.")
+
         # 최종 요약 생성
         # final_analysis_chain = SequentialChain(
         #    chains=[summary_chain, translate_chain],
@@ -242,28 +443,42 @@ class LangChainService:
         json_prompt = json_prompt.partial(format_instructions=format_instructions)
         json_chain = json_prompt | self.llm
 
+        async def summarize(inputs: Dict[str, Any]) -> str:
+            response = await json_chain.ainvoke(inputs, config=usage_config)
+            # 채팅 모델은 메시지, 텍스트 모델(local)은 문자열을 반환
+            return getattr(response, "content", response)
+        summarize = self.instrument("summary", summarize)
+
+        def parse_summary(raw_content: str) -> Dict[str, Any]:
+            """응답을 JSON으로 파싱하고 필드를 확인합니다. 실패하면 예외를 발생시켜 캐시하지 않습니다."""
+            print("LLM 원본 응답:", raw_content)  # 디버깅을 위해 추가
+            try:
+                # JSON 문자열에서 ```json과 ``` 제거
+                json_content = raw_content.replace('```json', '').replace('```', '').strip()
+                # JSON 파싱
+                with SUMMARY_PARSE_SECONDS.time():
+                    json_result = json_parser.parse(json_content)
+                if not isinstance(json_result, dict):
+                    raise ValueError(f"JSON 객체가 아닙니다: {type(json_result).__name__}")
+                missing = [name for name in SummaryTopic.model_fields if name not in json_result]
+                if missing:
+                    raise ValueError(f"필드가 없습니다: {', '.join(missing)}")
+            except Exception as e:
+                print(f"JSON 파싱 에러: {str(e)}")
+                SUMMARY_PARSE_FAILURES.inc()
+                raise
+            return json_result
+
         try:
-            raw_response = await json_chain.ainvoke({"turn_summaries": "\n".join(turn_summaries)})
-            print("LLM 원본 응답:", raw_response)  # 디버깅을 위해 추가
+            inputs = {"turn_summaries": "\n".join(turn_summaries)}
+            # 파싱한 결과를 캐시하므로 원본 응답을 캐시하던 키와 구분
+            json_result = await self.cached_call(template_hash(json_prompt, "parsed"), inputs, summarize, inputs, parse=parse_summary)
         except Exception as e:
             print(f"에러 발생: {str(e)}")
             return None
 
-        try:
-            # AIMessage 객체에서 content만 추출
-            json_content = raw_response.content       
-            # JSON 문자열에서 ```json과 ``` 제거
-            json_content = json_content.replace('```json', '').replace('```', '').strip()
-            # JSON 파싱
-            json_result = json_parser.parse(json_content)
-            print(json_result)
-        except ValueError as e:
-            print(f"JSON 파싱 에러: {str(e)}")
-            return None
-        except Exception as e:
-            print(f"예상치 못한 에러: {str(e)}")
-            return None
-        
+        print(json_result)
+        self.emit("summary", {"report_type": prompt_type.lower(), "result": json_result})
         return json_result
 
     async def process_analyze_full(self, user_report: str, verify_report: str) -> str:
@@ -275,10 +490,10 @@ class LangChainService:
 
         chain = LLMChain(llm=self.llm, prompt=prompt)
 
-        result = await chain.arun(
-            user_report=user_report,
-            verify_report=verify_report
-        )
+        inputs = {"user_report": user_report, "verify_report": verify_report}
+        callbacks = [self.token_usage.callback("full")]
+        result = await self.cached_call(template_hash(prompt), inputs, self.instrument("full", chain.arun), callbacks=callbacks, **inputs)
+        self.emit("summary", {"report_type": "full", "result": result})
 
         return result
 
@@ -291,6 +506,6 @@ class LangChainService:
 
         chain = LLMChain(llm=self.llm, prompt=prompt)
 
-        result = await chain.arun(query=query)
+        result = await self.rate_limiter.call(self.instrument("chat", chain.arun), query=query)
 
         return result    
\ No newline at end of file
@@ -0,0 +1,125 @@
+import inspect
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_community.llms.ollama import Ollama
+from langchain_openai import ChatOpenAI
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_anthropic import ChatAnthropic
+from app.services.mock_llm import MockChatModel
+from app.utils.rate_limiter import RateLimitHeaderCallback, get_rate_limiter
+from app.config.app_config import app_config
+
+SUPPORTED_PROVIDERS = ("local", "openai", "google", "anthropic", "mock")
+
+# (제공자, 모델, temperature) -> LLM 클라이언트
+_clients: Dict[Tuple[str, str, float], Any] = {}
+
+# 클라이언트가 내부에 보관하는 HTTP/gRPC 클라이언트 속성
+_CLOSABLE_ATTRIBUTES = ("root_async_client", "root_client", "_async_client", "_client", "async_client", "client")
+
+def create_llm(provider: str, model: str, temperature: float) -> Any:
+    """제공자에 맞는 LLM 클라이언트를 생성합니다.
+
+    모든 호출의 응답 헤더가 제공자/모델별 요청 제한기에 전달되도록 콜백을 등록합니다.
+    """
+    callbacks = [RateLimitHeaderCallback(get_rate_limiter(provider, model))]
+    if provider == "local":
+        return Ollama(
+            model=model,
+            base_url="http://localhost:11434",
+            callbacks=callbacks
+        )
+    elif provider == "openai":
+        return ChatOpenAI(
+            model=model,
+            temperature=temperature,
+            openai_api_key=app_config["openai"]["api_key"],
+            # 요청 제한 헤더(x-ratelimit-*)를 response_metadata에 포함
+            include_response_headers=True,
+            callbacks=callbacks
+        )
+    elif provider == "google":
+        return ChatGoogleGenerativeAI(
+            model=model,
+            temperature=temperature,
+            google_api_key=app_config["google"]["api_key"],
+            callbacks=callbacks
+        )
+    elif provider == "anthropic":
+        return ChatAnthropic(
+            model=model,
+            temperature=temperature,
+            anthropic_api_key=app_config["anthropic"]["api_key"],
+            callbacks=callbacks
+        )
+    elif provider == "mock":
+        # 실제 LLM 없이 파이프라인을 실행하는 테스트용 제공자
+        return MockChatModel(
+            model_name=model,
+            callbacks=callbacks,
+            **app_config["mock_llm"]
+        )
+    else:
+        raise ValueError(f"지원하지 않는 모델 제공자입니다: {provider}")
+
+def allowed_models(provider: str) -> Optional[List[str]]:
+    """제공자별로 요청할 수 있는 모델 목록 (설정된 모델 + 미리 생성할 모델). 설정하지 않았으면 None (모든 모델 허용)."""
+    llm_clients = app_config["llm_clients"]
+    if provider not in llm_clients["allowed_models"]:
+        return None
+    models = list(llm_clients["allowed_models"][provider])
+    models += [model for name, model, _ in llm_clients["preload"] if name == provider and model not in models]
+    return models
+
+def validate_llm_settings(provider: Any, model: Any, temperature: Any) -> Tuple[str, str, float]:
+    """요청의 제공자/모델/temperature를 확인하고 정규화한 값을 반환합니다.
+
+    모델은 LLM_ALLOWED_MODELS로 목록을 설정한 제공자만 확인합니다 (설정하지 않은 제공자는 모든 모델 허용).
+    temperature는 0~2 범위만 허용하고 소수점 한 자리로 반올림합니다.
+    """
+    if provider not in SUPPORTED_PROVIDERS:
+        raise ValueError(f"지원하지 않는 모델 제공자입니다: {provider}")
+    models = allowed_models(provider)
+    if models is not None and model not in models:
+        raise ValueError(f"허용되지 않은 모델입니다: {provider}/{model} (LLM_ALLOWED_MODELS로 설정)")
+    if isinstance(temperature, bool) or not isinstance(temperature, (int, float)) or not 0 <= temperature <= 2:
+        raise ValueError(f"temperature는 0~2 사이의 숫자여야 합니다: {temperature}")
+    return provider, model, round(float(temperature), 1)
+
+def get_llm(provider: str, model: str, temperature: float) -> Any:
+    """(제공자, 모델, temperature)별로 공유되는 LLM 클라이언트를 반환합니다.
+
+    클라이언트와 연결 풀은 작업 간에 재사용됩니다.
+    """
+    key = (provider, model, float(temperature))
+    if key not in _clients:
+        _clients[key] = create_llm(provider, model, temperature)
+    return _clients[key]
+
+def preload_llm_clients() -> None:
+    """설정된 클라이언트 객체를 미리 생성합니다. (앱 시작 시 호출)
+
+    객체만 만들며 연결이나 인증 확인은 하지 않습니다. 연결은 첫 요청 때 만들어집니다.
+    """
+    for provider, model, temperature in app_config["llm_clients"]["preload"]:
+        try:
+            get_llm(provider, model, temperature)
+        except Exception as e:
+            print(f"LLM 클라이언트 생성 실패 ({provider}/{model}): {e}")
+
+async def close_llm_clients() -> None:
+    """생성된 클라이언트의 연결을 닫고 등록을 해제합니다. (앱 종료 시 호출)"""
+    clients = list(_clients.values())
+    _clients.clear()
+    for llm in clients:
+        # 이미 만들어진 내부 클라이언트만 닫음 (지연 생성 속성은 건드리지 않음)
+        for name in _CLOSABLE_ATTRIBUTES:
+            client = llm.__dict__.get(name)
+            close = getattr(client, "close", None)
+            if close is None:
+                continue
+            try:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"LLM 클라이언트 종료 중 오류 발생: {e}")
@@ -0,0 +1,173 @@
+import asyncio
+import json
+import math
+import random
+import re
+import time
+from typing import Any, List, Optional, Tuple
+import httpx
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+from app.utils.app_utils import split_turns, normalize_turn_content
+from app.utils.token_utils import estimate_tokens
+
+# LangChainService의 턴 비교 프롬프트에서 유저/서버 턴 내용을 찾는 패턴
+_SINGLE_TURN = re.compile(r"Turn (\d+) Analysis:.*?User Turn Content: (.*?)\s*Server Turn Content: (.*?)\s*Please analyze this turn", re.S)
+_PACKED_TURN = re.compile(r"### Turn (\d+)\nUser Turn Content: (.*?)\nServer Turn Content: (.*?)(?=\n### Turn \d+\n|\s*Analyze each turn above separately)", re.S)
+_REPORT_HEADER = "◆ Battle Analysis Report"
+
+class MockLLMError(Exception):
+    """mock 제공자가 주입하는 일반 오류."""
+
+class MockRateLimitError(Exception):
+    """mock 제공자가 주입하는 요청 제한(429) 오류. 실제 제공자처럼 retry-after 헤더를 포함합니다."""
+
+    status_code = 429
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"mock rate limit exceeded, retry after {retry_after}s")
+        self.response = httpx.Response(429, headers={"retry-after": str(retry_after)})
+
+def compare_turn(user_content: str, server_content: str) -> Optional[str]:
+    """유저/서버 턴 내용을 줄 단위로 비교하여 첫 번째 차이를 반환합니다. 같으면 None."""
+    user_lines = normalize_turn_content(user_content).splitlines()
+    server_lines = normalize_turn_content(server_content).splitlines()
+    for user_line, server_line in zip(user_lines, server_lines):
+        if user_line != server_line:
+            return f"user: {user_line} / server: {server_line}"
+    if len(user_lines) != len(server_lines):
+        return f"user {len(user_lines)} lines / server {len(server_lines)} lines"
+    return None
+
+class MockChatModel(BaseChatModel):
+    """실제 LLM 없이 분석 파이프라인을 실행하기 위한 채팅 모델.
+
+    턴 비교 프롬프트에는 유저/서버 턴 내용을 비교한 판정(turn N: verify_success/verify_fail)을,
+    JSON 요약 프롬프트에는 SummaryTopic 형식의 JSON을 반환합니다. 응답 지연 분포,
+    오류/요청 제한(429) 비율을 설정하여 대기열/동시성/재시도 동작을 오프라인에서 재현할 수 있습니다.
+    """
+
+    model_name: str = "mock"
+    latency_distribution: str = "lognormal"
+    latency_mean: float = 0.0
+    latency_stddev: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: float = 1.0
+    verdict: str = "rule"
+    seed: Optional[int] = None
+
+    _random: random.Random = PrivateAttr()
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._random = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "mock"
+
+    def sample_latency(self) -> float:
+        """설정된 분포에서 응답 지연(초)을 뽑습니다."""
+        mean, stddev = self.latency_mean, self.latency_stddev
+        if mean <= 0:
+            return 0.0
+        if stddev <= 0 or self.latency_distribution == "fixed":
+            return mean
+        if self.latency_distribution == "uniform":
+            return self._random.uniform(max(mean - stddev, 0.0), mean + stddev)
+        if self.latency_distribution == "normal":
+            return max(self._random.gauss(mean, stddev), 0.0)
+        # lognormal: 평균/표준편차가 설정값이 되도록 변환 (긴 꼬리를 가진 실제 응답 시간에 가까움)
+        sigma = math.sqrt(math.log(1 + (stddev / mean) ** 2))
+        return self._random.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)
+
+    def sample_failure(self) -> Optional[Exception]:
+        """이번 호출에 주입할 오류를 정합니다. 없으면 None."""
+        value = self._random.random()
+        if value < self.rate_limit_rate:
+            return MockRateLimitError(self.retry_after)
+        if value < self.rate_limit_rate + self.error_rate:
+            return MockLLMError("mock provider error")
+        return None
+
+    def turn_verdict(self, turn_index: str, user_content: str, server_content: str) -> str:
+        if self.verdict == "success":
+            difference = None
+        elif self.verdict == "fail":
+            difference = "forced verify_fail"
+        else:
+            difference = compare_turn(user_content, server_content)
+
+        if difference is None:
+            return f"turn {turn_index}: verify_success"
+        return f"turn {turn_index}: verify_fail\nfact: {difference}\nopinion: mock 판정 (유저/서버 턴 내용 불일치)"
+
+    def respond(self, messages: List[BaseMessage]) -> str:
+        """프롬프트 종류에 맞는 응답을 만듭니다."""
+        system = "\n".join(str(message.content) for message in messages if isinstance(message, SystemMessage))
+        prompt = str(messages[-1].content) if messages else ""
+
+        # JSON 요약 단계 (SummaryTopic)
+        if '"key_differences"' in system:
+            failed_turns = sorted(set(re.findall(r"turn (\d+): verify_fail", prompt)), key=int)
+            succeeded_turns = set(re.findall(r"turn (\d+): verify_success", prompt))
+            return json.dumps({
+                "topic": "mock 검증",
+                "summary": f"verify_fail {len(failed_turns)}턴, verify_success {len(succeeded_turns)}턴",
+                "key_differences": ", ".join(f"turn {turn}" for turn in failed_turns) or "없음",
+                "opinion": "mock 제공자의 규칙 기반 판정입니다."
+            }, ensure_ascii=False)
+
+        # 여러 턴 묶음 비교
+        packed = _PACKED_TURN.findall(prompt)
+        if packed:
+            return "\n".join(self.turn_verdict(*turn) for turn in packed)
+
+        # 한 턴 비교
+        single = _SINGLE_TURN.search(prompt)
+        if single:
+            return self.turn_verdict(*single.groups())
+
+        # 전체 리포트 비교 (유저/서버 리포트를 이어 붙인 입력)
+        if prompt.count(_REPORT_HEADER) >= 2:
+            split_at = prompt.index(_REPORT_HEADER, prompt.index(_REPORT_HEADER) + 1)
+            pairs: List[Tuple[Any, Any]] = list(zip(split_turns(prompt[:split_at]), split_turns(prompt[split_at:])))
+            return "\n".join(
+                self.turn_verdict(turn_id.replace("## Turn", "").strip(), user_content, server_content)
+                for (turn_id, user_content), (_, server_content) in pairs
+            )
+
+        # 그 밖의 프롬프트 (턴 요약, 번역, 채팅 등)
+        return f"mock response ({estimate_tokens(prompt)} tokens)"
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        content = self.respond(messages)
+        input_tokens = sum(estimate_tokens(str(message.content)) for message in messages)
+        output_tokens = estimate_tokens(content)
+        message = AIMessage(
+            content=content,
+            usage_metadata={"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens},
+            response_metadata={"model_name": self.model_name}
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        failure = self.sample_failure()
+        if not isinstance(failure, MockRateLimitError):
+            time.sleep(self.sample_latency())
+        if failure is not None:
+            raise failure
+        return self._result(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        failure = self.sample_failure()
+        # 요청 제한 오류는 실제 제공자처럼 바로 반환
+        if not isinstance(failure, MockRateLimitError):
+            await asyncio.sleep(self.sample_latency())
+        if failure is not None:
+            raise failure
+        return self._result(messages)
@@ -0,0 +1,84 @@
+import json
+import time
+from itertools import zip_longest
+from typing import Dict, Any, List, Optional
+from battle_report import BattleReportBuilder, generate_battle_reports
+from app.utils.app_utils import iter_analysis_data
+from app.utils.battle_diff import BattleRecordDiff
+from app.utils.battle_record import iter_turns
+
+# 분석 대상 기록 (접두어 -> result_info 키)
+RECORD_KEYS = {
+    "user": "user_record_minimal",
+    "verify": "verify_record_minimal",
+}
+
+def prepare_analysis(battle_data: Dict[str, Any], report_types: List[str]) -> Dict[str, Any]:
+    """유저/서버 기록을 디코딩하여 리포트와 구조 비교 결과를 생성합니다.
+
+    두 기록을 턴 단위로 함께 스트리밍하여 턴 쌍마다 리포트와 구조 비교에 넘긴 뒤 버리므로,
+    디코딩한 기록 전체를 메모리에 올리지 않습니다.
+    CPU 작업만 수행하므로 프로세스 풀 워커에서 실행할 수 있습니다.
+    리포트 파일은 저장하지 않으며, 저장은 산출물 저장소(artifact_store)가 담당합니다.
+    단계별 소요 시간(초)은 "timings"에 담아 반환합니다 (워커 프로세스에서는 메트릭을 직접 기록할 수 없음).
+    """
+    turns = {
+        prefix: iter_turns(iter_analysis_data(battle_data, "result_info", key))
+        for prefix, key in RECORD_KEYS.items()
+    }
+    builders = {prefix: BattleReportBuilder(report_types) for prefix in RECORD_KEYS}
+    diff = BattleRecordDiff()
+    timings = {"decode": 0.0, "report_build": 0.0, "diff": 0.0}
+
+    clock = time.perf_counter()
+    for user_turn, verify_turn in zip_longest(turns["user"], turns["verify"], fillvalue=None):
+        now = time.perf_counter()
+        timings["decode"] += now - clock
+        clock = now
+
+        for prefix, turn in (("user", user_turn), ("verify", verify_turn)):
+            if turn is not None:
+                builders[prefix].add_turn(turn)
+        now = time.perf_counter()
+        timings["report_build"] += now - clock
+        clock = now
+
+        diff.add(user_turn, verify_turn)
+        now = time.perf_counter()
+        timings["diff"] += now - clock
+        clock = now
+    timings["decode"] += time.perf_counter() - clock
+
+    started = time.perf_counter()
+    analysis = {prefix: checked_reports(builder.finish()) for prefix, builder in builders.items()}
+    timings["report_build"] += time.perf_counter() - started
+    analysis["diff"] = diff.result()
+    analysis["timings"] = timings
+    return analysis
+
+def report_artifacts(prepared: Dict[str, Any]) -> Dict[str, str]:
+    """prepare_analysis 결과를 산출물 이름 -> 내용으로 변환합니다 (예: user_status_report)."""
+    artifacts = {}
+    for prefix in RECORD_KEYS:
+        for report_type, battle_report in prepared[prefix].items():
+            if battle_report:
+                artifacts[f"{prefix}_{report_type}_report"] = battle_report
+    artifacts["diff"] = json.dumps(prepared["diff"], ensure_ascii=False, indent=2, default=str)
+    return artifacts
+
+def checked_reports(battle_reports: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """생성되지 않은(빈) 리포트는 None으로 바꿉니다."""
+    reports = {}
+    for report_type, battle_report in battle_reports.items():
+        if not battle_report:
+            print(f"리포트 생성에 실패했습니다. (타입: {report_type})")
+            reports[report_type] = None
+            continue
+        reports[report_type] = battle_report
+
+    return reports
+
+def create_battle_reports(data, report_types: List[str]) -> Dict[str, Optional[str]]:
+
+    # 한 번의 순회로 모든 타입의 전투 리포트 생성
+    return checked_reports(generate_battle_reports(data, report_types))
@@ -0,0 +1,105 @@
+import re
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 묶음 분석 응답에서 턴별 판정의 시작 ("turn 3:", "- turn 3:", "**turn 3**:")
+_VERDICT_START = re.compile(r"^[\s\-*#]*turn\s+(\d+)\**\s*:", re.IGNORECASE | re.MULTILINE)
+
+class RollingTurnContext:
+    """턴 분석에 넘겨줄 고정 크기의 이전 턴 컨텍스트.
+
+    최근 N개 턴의 분석 결과는 그대로, 그보다 오래된 턴은 판정 한 줄로 압축하여
+    보관합니다. 전투가 길어져도 렌더링 결과의 길이는 일정한 상한을 넘지 않습니다.
+    """
+
+    def __init__(self, recent_turns: int = 3, summary_max_chars: int = 2000, turn_max_chars: int = 1500, preamble: str = ""):
+        # 윈도우 분석 시 앞 윈도우와 겹치는 턴의 원본 내용 (참고용)
+        self.preamble = preamble
+        self.recent: Deque[Tuple[int, str]] = deque()
+        self.recent_turns = recent_turns
+        self.summary_max_chars = summary_max_chars
+        self.turn_max_chars = turn_max_chars
+        # 오래된 턴의 압축 요약
+        self.success_count = 0
+        self.failed_count = 0
+        self.fail_lines: Deque[str] = deque()
+        self.fail_chars = 0
+
+    @staticmethod
+    def verdict_line(turn_index: int, analysis: str) -> str:
+        """분석 결과에서 판정이 담긴 첫 줄을 추출합니다."""
+        for line in analysis.splitlines():
+            line = line.strip()
+            if line:
+                return line[:200]
+        return f"turn {turn_index}: (empty analysis)"
+
+    def _compress(self, turn_index: int, analysis: str) -> None:
+        if "verify_fail" not in analysis:
+            self.success_count += 1
+            return
+        self.failed_count += 1
+        line = self.verdict_line(turn_index, analysis)
+        self.fail_lines.append(line)
+        self.fail_chars += len(line) + 1
+        # 상한을 넘으면 가장 오래된 불일치 줄부터 제거 (개수는 유지)
+        while self.fail_chars > self.summary_max_chars and len(self.fail_lines) > 1:
+            self.fail_chars -= len(self.fail_lines.popleft()) + 1
+
+    def add(self, turn_index: int, analysis: str) -> None:
+        """LLM이 분석한 턴을 추가합니다."""
+        self.recent.append((turn_index, analysis[:self.turn_max_chars]))
+        while len(self.recent) > self.recent_turns:
+            self._compress(*self.recent.popleft())
+
+    def add_verified(self, turn_index: int) -> None:
+        """LLM 없이 검증 성공으로 처리한 턴을 추가합니다."""
+        self.success_count += 1
+
+    def render(self) -> str:
+        if not self.preamble and not self.recent and not self.success_count and not self.failed_count:
+            return "No previous turn data available."
+
+        parts = [self.preamble] if self.preamble else []
+        if self.success_count or self.failed_count:
+            parts.append(f"Earlier turns: {self.success_count} verify_success, {self.failed_count} verify_fail.")
+            if self.fail_lines:
+                omitted = self.failed_count - len(self.fail_lines)
+                if omitted:
+                    parts.append(f"(oldest {omitted} verify_fail lines omitted)")
+                parts.extend(self.fail_lines)
+        for turn_index, analysis in self.recent:
+            parts.append(f"[Turn {turn_index}] Summary:\n{analysis}")
+        return "\n".join(parts)
+
+def overlap_preamble(turns: List[Tuple[Tuple[str, str], Tuple[str, str]]], start: int, overlap: int, turn_max_chars: int = 1500, turn_numbers: Optional[Sequence[int]] = None) -> str:
+    """윈도우 시작 전 overlap개 턴의 유저/서버 원본 내용을 컨텍스트 문자열로 만듭니다.
+
+    turn_numbers가 주어지면 턴 순서 대신 그 번호로 표시합니다.
+    """
+    lines = []
+    for idx in range(max(start - overlap, 0), start):
+        (_, user_turn_content), (_, verify_turn_content) = turns[idx]
+        number = turn_numbers[idx] if turn_numbers is not None else idx
+        lines.append(
+            f"[Turn {number}] (context only, analysed in the previous window)\n"
+            f"User: {user_turn_content[:turn_max_chars]}\n"
+            f"Server: {verify_turn_content[:turn_max_chars]}"
+        )
+    return "\n".join(lines)
+
+def split_turn_verdicts(text: str, turn_indices: Iterable[int]) -> Dict[int, str]:
+    """여러 턴을 한 번에 분석한 응답을 "turn N:" 기준으로 턴별로 나눕니다.
+
+    요청한 턴만 반환하며, 응답에 없는 턴은 결과에서 빠집니다.
+    """
+    wanted = set(turn_indices)
+    matches = list(_VERDICT_START.finditer(text))
+    verdicts: Dict[int, str] = {}
+    for position, match in enumerate(matches):
+        turn_index = int(match.group(1))
+        if turn_index not in wanted or turn_index in verdicts:
+            continue
+        end = matches[position + 1].start() if position + 1 < len(matches) else len(text)
+        verdicts[turn_index] = text[match.start():end].strip()
+    return verdicts
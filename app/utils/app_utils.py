@@ -1,9 +1,15 @@
 import os
 import json
 import base64
+import codecs
 import zlib
 import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Iterator
+
+# 스트리밍 디코딩 시 한 번에 처리할 base64 문자 수 (4의 배수)
+BASE64_CHUNK_SIZE = 64 * 1024
+# 압축 해제 시 한 번에 만들어낼 최대 바이트 수
+DECOMPRESS_CHUNK_SIZE = 256 * 1024
 
 def split_turns(log_text: str):
     
@@ -15,6 +21,15 @@ def split_turns(log_text: str):
         turns.append((turn_id, content))
     return turns
 
+def turn_number(turn_id: str) -> Optional[int]:
+    """'## Turn 3' 형식의 턴 헤더에서 턴 번호를 추출합니다."""
+    match = re.search(r"\d+", turn_id)
+    return int(match.group()) if match else None
+
+def normalize_turn_content(content: str) -> str:
+    """비교용으로 턴 내용의 공백 차이를 제거합니다."""
+    return "\n".join(" ".join(line.split()) for line in content.splitlines() if line.strip())
+
 def print_json_recursively(data: Any, indent: int = 0) -> None:
 
     indent_str = "  " * indent
@@ -60,6 +75,149 @@ def decode64_and_decompress(encoded_data: str) -> Optional[str]:
         print(f"디코딩/압축 해제 오류: {e}")
         return None
 
+def iter_decode64_and_decompress(encoded_data: str, chunk_size: int = BASE64_CHUNK_SIZE) -> Iterator[str]:
+    """base64 문자열을 조각 단위로 디코딩/압축 해제하여 텍스트 조각을 순서대로 반환합니다."""
+    decompressor = zlib.decompressobj()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+
+    for start in range(0, len(encoded_data), chunk_size):
+        chunk = encoded_data[start:start + chunk_size]
+        if " " in chunk or not chunk.isprintable():
+            # 공백/개행은 제거하여 4문자 단위 정렬을 유지
+            chunk = "".join(chunk.split())
+        chunk = pending + chunk
+        aligned = len(chunk) - len(chunk) % 4
+        pending = chunk[aligned:]
+        if not aligned:
+            continue
+
+        data = base64.b64decode(chunk[:aligned])
+        while data:
+            text = text_decoder.decode(decompressor.decompress(data, DECOMPRESS_CHUNK_SIZE))
+            data = decompressor.unconsumed_tail
+            if text:
+                yield text
+
+    if pending:
+        raise base64.binascii.Error("base64 데이터 길이가 올바르지 않습니다.")
+
+    text = text_decoder.decode(decompressor.flush(), final=True)
+    if text:
+        yield text
+    if not decompressor.eof:
+        raise zlib.error("압축 데이터가 완전하지 않습니다.")
+
+def iter_json_array(chunks: Iterator[str]) -> Iterator[Any]:
+    """텍스트 조각으로 전달되는 JSON 배열을 요소 단위로 파싱하여 하나씩 반환합니다."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    exhausted = False
+    # 요소가 완성되지 않았을 때 다음 파싱을 시도할 버퍼 길이
+    retry_at = 0
+
+    def fill(min_size: int = 0) -> bool:
+        # 남은 버퍼가 min_size 이상이 될 때까지 조각을 모아 한 번에 이어붙임
+        nonlocal buffer, pos, exhausted
+        parts = [buffer[pos:]]
+        size = len(parts[0])
+        while True:
+            chunk = next(chunks, None)
+            if chunk is None:
+                exhausted = True
+                break
+            parts.append(chunk)
+            size += len(chunk)
+            if size >= min_size:
+                break
+        buffer = "".join(parts)
+        pos = 0
+        return len(parts) > 1
+
+    def skip_whitespace() -> None:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buffer) or not fill():
+                return
+
+    skip_whitespace()
+    if pos >= len(buffer) or buffer[pos] != "[":
+        raise json.JSONDecodeError("JSON 배열이 아닙니다.", buffer, pos)
+    pos += 1
+
+    def finish() -> None:
+        # 배열 뒤에 남은 데이터까지 모두 소비하여 입력 끝의 오류도 확인
+        nonlocal pos
+        pos += 1
+        skip_whitespace()
+        if pos < len(buffer):
+            raise json.JSONDecodeError("배열 뒤에 추가 데이터가 있습니다.", buffer, pos)
+
+    skip_whitespace()
+    if pos < len(buffer) and buffer[pos] == "]":
+        finish()
+        return
+
+    while True:
+        skip_whitespace()
+        # 버퍼가 충분히 쌓일 때까지 기다려 큰 요소의 반복 파싱 비용을 제한
+        if len(buffer) - pos < retry_at and not exhausted:
+            fill(retry_at)
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if exhausted or not fill():
+                raise
+            retry_at = (len(buffer) - pos) * 2
+            continue
+
+        # 숫자는 조각 경계에서 잘릴 수 있으므로 숫자가 아닌 문자가 뒤따라야 확정
+        if isinstance(item, (int, float)) and not isinstance(item, bool) and not exhausted:
+            tail = end
+            while tail < len(buffer) and buffer[tail] in "0123456789.eE+-":
+                tail += 1
+            if tail >= len(buffer) and fill():
+                retry_at = 0
+                continue
+
+        retry_at = 0
+        yield item
+        pos = end
+
+        skip_whitespace()
+        if pos >= len(buffer):
+            raise json.JSONDecodeError("JSON 배열이 끝나지 않았습니다.", buffer, pos)
+        if buffer[pos] == "]":
+            finish()
+            return
+        if buffer[pos] != ",":
+            raise json.JSONDecodeError("배열 구분자(,)가 필요합니다.", buffer, pos)
+        pos += 1
+
+def iter_analysis_data(json_data: Dict[str, Any], header: str, key: str) -> Iterator[Dict[str, Any]]:
+    """압축된 전투 기록을 스트리밍으로 디코딩하여 턴 데이터를 하나씩 반환하는 반복자를 만듭니다.
+
+    전체 압축 해제 텍스트와 파싱 결과를 한꺼번에 메모리에 올리지 않습니다.
+    헤더/키가 없으면 바로 ValueError를 발생시키고, 데이터가 잘못된 경우에는
+    순회 중에 ValueError(또는 하위 클래스)를 발생시킵니다.
+    """
+    if not json_data or header not in json_data:
+        raise ValueError(f"헤더 '{header}'를 찾을 수 없습니다.")
+
+    if not isinstance(json_data[header], dict) or key not in json_data[header]:
+        raise ValueError(f"키 '{key}'를 찾을 수 없습니다.")
+
+    return _iter_decoded_json_array(json_data[header][key])
+
+def _iter_decoded_json_array(encoded_data: str) -> Iterator[Any]:
+    try:
+        yield from iter_json_array(iter_decode64_and_decompress(encoded_data))
+    except (base64.binascii.Error, zlib.error, UnicodeDecodeError) as e:
+        raise ValueError(f"디코딩/압축 해제 오류: {e}") from e
+
 def process_json_data(json_data: Dict[str, Any], header: str, key: str) -> Optional[Dict[str, Any]]:
 
     if not json_data or header not in json_data:
@@ -0,0 +1,156 @@
+import asyncio
+import gzip
+import os
+import re
+import shutil
+import time
+from typing import Any, Dict, Optional, Set
+from app.config.app_config import app_config
+
+try:
+    import zstandard
+except ImportError:  # zstandard가 없으면 gzip 사용
+    zstandard = None
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+def _safe_name(value: str) -> str:
+    return _UNSAFE_CHARS.sub("_", value)[:128] or "_"
+
+class ArtifactStore:
+    """작업별 분석 산출물(리포트 등) 저장소의 기본 구현 (저장하지 않음).
+
+    save는 저장을 예약만 하고 바로 반환하므로 분석 경로에서 파일 입출력을
+    기다리지 않습니다. 새 저장소는 이 클래스를 상속하여 write/cleanup을 구현하고
+    ARTIFACT_BACKENDS에 등록합니다.
+    """
+
+    enabled = False
+
+    def __init__(self, **_: Any):
+        self.pending: Set[asyncio.Task] = set()
+        self.cleaner: Optional[asyncio.Task] = None
+
+    def save(self, task_id: str, elk_id: str, artifacts: Dict[str, str]) -> None:
+        """산출물(이름 -> 내용) 저장을 백그라운드에서 실행합니다."""
+        if not self.enabled or not artifacts:
+            return
+        task = asyncio.create_task(self._save(task_id, elk_id, artifacts))
+        self.pending.add(task)
+        task.add_done_callback(self.pending.discard)
+
+    async def _save(self, task_id: str, elk_id: str, artifacts: Dict[str, str]) -> None:
+        try:
+            await asyncio.to_thread(self.write, task_id, elk_id, artifacts)
+        except Exception as e:
+            print(f"산출물 저장 중 오류 발생 ({task_id}): {e}")
+
+    def write(self, task_id: str, elk_id: str, artifacts: Dict[str, str]) -> None:
+        """산출물을 저장합니다. 작업 스레드에서 호출됩니다."""
+
+    def cleanup(self) -> None:
+        """보관 기간이 지난 산출물을 삭제합니다. 작업 스레드에서 호출됩니다."""
+
+    def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        """예약된 저장이 끝날 때까지 기다립니다."""
+        if self.cleaner is not None:
+            self.cleaner.cancel()
+            await asyncio.gather(self.cleaner, return_exceptions=True)
+            self.cleaner = None
+        if self.pending:
+            await asyncio.gather(*self.pending, return_exceptions=True)
+
+class LocalArtifactStore(ArtifactStore):
+    """로컬 디스크 산출물 저장소.
+
+    {directory}/{elk_id}/{task_id}/{이름}.zst (zstandard가 없으면 .gz)에 압축하여
+    저장하고, retention_seconds가 지난 작업 폴더는 주기적으로 삭제합니다.
+    """
+
+    enabled = True
+
+    def __init__(self, directory: str, compression: str, retention_seconds: float, cleanup_interval: float, **_: Any):
+        super().__init__()
+        self.directory = directory
+        self.compression = "zstd" if compression == "zstd" and zstandard is not None else "gzip"
+        self.retention_seconds = retention_seconds
+        self.cleanup_interval = cleanup_interval
+
+    def _compress(self, content: str) -> bytes:
+        data = content.encode("utf-8")
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor(level=3).compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    def task_dir(self, task_id: str, elk_id: str) -> str:
+        return os.path.join(self.directory, _safe_name(elk_id), _safe_name(task_id))
+
+    def write(self, task_id: str, elk_id: str, artifacts: Dict[str, str]) -> None:
+        directory = self.task_dir(task_id, elk_id)
+        os.makedirs(directory, exist_ok=True)
+        extension = ".zst" if self.compression == "zstd" else ".gz"
+        for name, content in artifacts.items():
+            if content is None:
+                continue
+            path = os.path.join(directory, _safe_name(name) + extension)
+            # 임시 파일에 쓴 뒤 교체하여 읽는 쪽이 쓰다 만 파일을 보지 않도록 함
+            with open(path + ".tmp", "wb") as file:
+                file.write(self._compress(content))
+            os.replace(path + ".tmp", path)
+
+    def read(self, task_id: str, elk_id: str, name: str) -> Optional[str]:
+        """저장된 산출물을 읽습니다. 없으면 None."""
+        base = os.path.join(self.task_dir(task_id, elk_id), _safe_name(name))
+        if os.path.exists(base + ".zst") and zstandard is not None:
+            with open(base + ".zst", "rb") as file:
+                return zstandard.ZstdDecompressor().decompress(file.read()).decode("utf-8")
+        if os.path.exists(base + ".gz"):
+            with gzip.open(base + ".gz", "rb") as file:
+                return file.read().decode("utf-8")
+        return None
+
+    def cleanup(self) -> None:
+        if self.retention_seconds <= 0 or not os.path.isdir(self.directory):
+            return
+        expire_before = time.time() - self.retention_seconds
+        for elk_dir in os.scandir(self.directory):
+            if not elk_dir.is_dir():
+                continue
+            for task_dir in os.scandir(elk_dir.path):
+                if task_dir.is_dir() and task_dir.stat().st_mtime < expire_before:
+                    shutil.rmtree(task_dir.path, ignore_errors=True)
+            try:
+                os.rmdir(elk_dir.path)  # 비어 있을 때만 삭제됨
+            except OSError:
+                pass
+
+    def start(self) -> None:
+        if self.cleaner is None and self.retention_seconds > 0:
+            self.cleaner = asyncio.create_task(self._cleanup_loop())
+
+    async def _cleanup_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.cleanup)
+            except Exception as e:
+                print(f"산출물 정리 중 오류 발생: {e}")
+            await asyncio.sleep(self.cleanup_interval)
+
+# 저장소 종류 (backend -> 클래스)
+ARTIFACT_BACKENDS = {
+    "local": LocalArtifactStore,
+}
+
+def create_artifact_store(enabled: bool, backend: str, **settings: Any) -> ArtifactStore:
+    """설정에 맞는 산출물 저장소를 만듭니다. 사용하지 않으면 아무것도 저장하지 않는 저장소를 반환합니다."""
+    if not enabled:
+        return ArtifactStore()
+    if backend not in ARTIFACT_BACKENDS:
+        raise ValueError(f"Unsupported artifact store backend: {backend}")
+    return ARTIFACT_BACKENDS[backend](**settings)
+
+# 전역 산출물 저장소
+artifact_store = create_artifact_store(**app_config["artifact_store"])
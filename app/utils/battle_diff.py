@@ -0,0 +1,228 @@
+from itertools import zip_longest
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.utils.battle_record import MISSING, Action, AttackEvent, CharacterState, EffectEvent, StateInfoEvent, Turn, iter_turns
+
+# 캐릭터 목록 필드 (순서와 무관하게 id 기준으로 비교)
+CHARACTER_KEYS = ("friends", "enemies")
+
+# 변환된 기록의 클래스별 비교 필드 (type을 먼저 비교하여 이벤트 종류 차이를 우선 보고)
+_FIELDS = {
+    Turn: ("turn_index", "actions"),
+    Action: ("owner_code", "sub_type", "events"),
+    AttackEvent: ("type", *AttackEvent.__slots__),
+    StateInfoEvent: ("type", *StateInfoEvent.__slots__),
+    EffectEvent: EffectEvent.__slots__,
+    CharacterState: CharacterState.__slots__,
+}
+_EVENT_CLASSES = (AttackEvent, StateInfoEvent, EffectEvent)
+
+_MISSING = object()
+_EMPTY_STATE = {"id": None, "hp": None, "status": {}}
+
+def _characters_by_id(states: Tuple[CharacterState, ...]) -> Dict[str, CharacterState]:
+    return {str("" if state.id is MISSING else state.id): state for state in states}
+
+def _first_difference(user: Any, verify: Any, path: List[Any]) -> Optional[Tuple[List[Any], Any, Any]]:
+    """두 값에서 처음으로 다른 위치(경로)와 양쪽 값을 찾습니다."""
+    fields = _FIELDS.get(type(user))
+    if fields is not None and type(user) is type(verify):
+        for name in fields:
+            user_value = getattr(user, name)
+            verify_value = getattr(verify, name)
+            if name in CHARACTER_KEYS and user_value is not None and verify_value is not None:
+                user_value = _characters_by_id(user_value)
+                verify_value = _characters_by_id(verify_value)
+            found = _first_difference(user_value, verify_value, path + [name])
+            if found:
+                return found
+        return None
+
+    if isinstance(user, _EVENT_CLASSES) and isinstance(verify, _EVENT_CLASSES):
+        # 이벤트 종류가 다름
+        return path + ["type"], user.type, verify.type
+
+    if user == verify:
+        return None
+
+    if isinstance(user, dict) and isinstance(verify, dict):
+        for key in sorted(set(user) | set(verify), key=str):
+            found = _first_difference(user.get(key, _MISSING), verify.get(key, _MISSING), path + [key])
+            if found:
+                return found
+        return None
+
+    if isinstance(user, tuple) and isinstance(verify, tuple):
+        for index, (user_item, verify_item) in enumerate(zip_longest(user, verify, fillvalue=_MISSING)):
+            found = _first_difference(user_item, verify_item, path + [index])
+            if found:
+                return found
+        return None
+
+    return path, user, verify
+
+def _plain(value: Any) -> Any:
+    """비교 결과에 담을 수 있도록 변환된 기록 값을 dict/list로 바꿉니다."""
+    if value is _MISSING or value is MISSING:
+        return None
+    fields = _FIELDS.get(type(value))
+    if fields is not None:
+        return {name: _plain(getattr(value, name)) for name in fields}
+    if isinstance(value, tuple):
+        return [_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    return value
+
+def _format_path(path: List[Any]) -> str:
+    text = ""
+    for part in path:
+        text += f"[{part}]" if isinstance(part, int) else (f".{part}" if text else str(part))
+    return text
+
+def _describe_divergence(turn_index: Any, user_turn: Optional[Turn], verify_turn: Optional[Turn]) -> Dict[str, Any]:
+    found = _first_difference(user_turn, verify_turn, [])
+    path, user_value, verify_value = found if found else ([], user_turn, verify_turn)
+
+    divergence = {
+        "turn_index": turn_index,
+        "action_index": None,
+        "event_index": None,
+        "event_type": None,
+        "field": _format_path(path),
+        "user": _plain(user_value),
+        "verify": _plain(verify_value),
+    }
+
+    # actions[액션].events[이벤트] 경로에서 위치 정보 추출
+    if len(path) >= 2 and path[0] == "actions" and isinstance(path[1], int):
+        divergence["action_index"] = path[1]
+        if len(path) >= 4 and path[2] == "events" and isinstance(path[3], int):
+            divergence["event_index"] = path[3]
+            for turn in (user_turn, verify_turn):
+                try:
+                    divergence["event_type"] = turn.actions[path[1]].events[path[3]].type
+                    break
+                except (IndexError, AttributeError):
+                    continue
+        field_path = path[4:] if divergence["event_index"] is not None else path[2:]
+        if field_path:
+            divergence["field"] = _format_path(field_path)
+    return divergence
+
+def _track_characters(turn: Optional[Turn], characters: Dict[str, Dict[str, Any]]) -> None:
+    """턴의 sub_state_info 이벤트로 캐릭터별 최신 HP/상태를 갱신합니다."""
+    if turn is None:
+        return
+    for action in turn.actions:
+        for event in action.events:
+            if type(event) is not StateInfoEvent:
+                continue
+            for states in (event.friends, event.enemies):
+                for state in states or ():
+                    tracked = characters.get(state.code)
+                    if tracked is None:
+                        tracked = characters[state.code] = {"id": "" if state.id is MISSING else state.id, "hp": None, "status": {}}
+                    if state.hp is not MISSING:
+                        tracked["hp"] = state.hp
+                    if state.status:
+                        tracked["status"] = state.status
+
+def _state_delta(user_state: Optional[Dict[str, Any]], verify_state: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """두 캐릭터 상태의 HP/상태값 차이를 반환합니다."""
+    user_state = user_state or _EMPTY_STATE
+    verify_state = verify_state or _EMPTY_STATE
+    delta = {}
+
+    if user_state["hp"] != verify_state["hp"]:
+        delta["hp"] = _value_delta(user_state["hp"], verify_state["hp"])
+
+    status_delta = {}
+    for key in sorted(set(user_state["status"]) | set(verify_state["status"]), key=str):
+        user_value = user_state["status"].get(key)
+        verify_value = verify_state["status"].get(key)
+        if user_value != verify_value:
+            status_delta[key] = _value_delta(user_value, verify_value)
+    if status_delta:
+        delta["status"] = status_delta
+    return delta
+
+def _value_delta(user_value: Any, verify_value: Any) -> Dict[str, Any]:
+    delta = {"user": user_value, "verify": verify_value}
+    if isinstance(user_value, (int, float)) and isinstance(verify_value, (int, float)):
+        delta["delta"] = user_value - verify_value
+    return delta
+
+class BattleRecordDiff:
+    """유저/서버 턴 쌍을 하나씩 받아 비교합니다. 턴은 보관하지 않고 캐릭터 상태만 추적합니다."""
+
+    def __init__(self):
+        self.first_divergence: Optional[Dict[str, Any]] = None
+        self.diverging_turns: List[Any] = []
+        self.position = 0
+        self.user_count = 0
+        self.verify_count = 0
+        self.user_characters: Dict[str, Dict[str, Any]] = {}
+        self.verify_characters: Dict[str, Dict[str, Any]] = {}
+        self.character_deltas: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, user_turn: Optional[Turn], verify_turn: Optional[Turn]) -> None:
+        """같은 위치의 턴 쌍을 비교합니다. 한쪽 기록이 먼저 끝났으면 그쪽은 None입니다."""
+        position = self.position
+        self.position += 1
+        self.user_count += user_turn is not None
+        self.verify_count += verify_turn is not None
+        turn_index = next(
+            (turn.turn_index for turn in (user_turn, verify_turn) if turn is not None and turn.turn_index is not MISSING),
+            position
+        )
+
+        _track_characters(user_turn, self.user_characters)
+        _track_characters(verify_turn, self.verify_characters)
+
+        # 리포트에 쓰이는 필드만 비교 (변환 시 버린 이벤트/필드는 비교하지 않음)
+        if _first_difference(user_turn, verify_turn, []) is None:
+            return
+
+        self.diverging_turns.append(turn_index)
+        if self.first_divergence is None:
+            self.first_divergence = _describe_divergence(turn_index, user_turn, verify_turn)
+
+        # 캐릭터 상태가 처음 달라진 턴과 그 시점의 차이 기록
+        for code in set(self.user_characters) | set(self.verify_characters):
+            if code in self.character_deltas:
+                continue
+            delta = _state_delta(self.user_characters.get(code), self.verify_characters.get(code))
+            if delta:
+                self.character_deltas[code] = {"first_diverging_turn": turn_index, "at_divergence": delta}
+
+    def result(self) -> Dict[str, Any]:
+        character_deltas = dict(self.character_deltas)
+        # 마지막 턴 기준 최종 차이
+        for code in set(self.user_characters) | set(self.verify_characters):
+            final_delta = _state_delta(self.user_characters.get(code), self.verify_characters.get(code))
+            if final_delta:
+                character_deltas.setdefault(code, {"first_diverging_turn": None, "at_divergence": final_delta})
+            if code in character_deltas:
+                state = self.user_characters.get(code) or self.verify_characters.get(code)
+                character_deltas[code] = {"id": state["id"], **character_deltas[code], "final": final_delta}
+
+        return {
+            "identical": not self.diverging_turns,
+            "user_turn_count": self.user_count,
+            "verify_turn_count": self.verify_count,
+            "first_divergence": self.first_divergence,
+            "diverging_turns": list(self.diverging_turns),
+            "character_deltas": dict(sorted(character_deltas.items(), key=lambda item: str(item[0]))),
+        }
+
+def diff_battle_records(user_data: Iterable[Any], verify_data: Iterable[Any]) -> Dict[str, Any]:
+    """유저/서버 전투 기록을 턴 단위로 비교합니다.
+
+    처음으로 달라지는 턴/액션/이벤트/필드, 달라진 턴 목록, 캐릭터별로 처음
+    차이가 생긴 턴과 그 시점 및 마지막 턴의 HP/상태 차이를 반환합니다.
+    기록은 원본 턴 목록 또는 parse_battle_record로 변환한 Turn 목록입니다.
+    """
+    diff = BattleRecordDiff()
+    for user_turn, verify_turn in zip_longest(iter_turns(user_data), iter_turns(verify_data), fillvalue=None):
+        diff.add(user_turn, verify_turn)
+    return diff.result()
@@ -0,0 +1,147 @@
+import sys
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+# 값이 없는 필드 (None과 구분)
+MISSING: Any = type("Missing", (), {"__repr__": lambda self: "MISSING", "__bool__": lambda self: False})()
+
+# 상태 효과 이벤트 종류
+EFFECT_EVENT_TYPES = ("add_state", "remove_state", "immune", "anti_skill_effect")
+
+_intern_string = sys.intern
+_first = itemgetter(0)
+
+def _intern(value: Any) -> Any:
+    return _intern_string(value) if type(value) is str else value
+
+class CharacterState:
+    """sub_state_info 이벤트의 캐릭터 한 명의 상태."""
+    __slots__ = ("id", "code", "hp", "status")
+
+    def __init__(self, id: Any, code: str, hp: Any, status: Any):
+        self.id = id
+        self.code = code
+        self.hp = hp
+        self.status = status
+
+class AttackEvent:
+    __slots__ = ("from_uid", "from_code", "target_uid", "target_code", "dec_hp", "eff", "critical", "miss")
+    type = "attack"
+
+    def __init__(self, event: Dict[str, Any]):
+        self.from_uid = event.get("from_uid", "Unknown")
+        self.from_code = _intern(event.get("from_code", "Unknown"))
+        self.target_uid = event.get("target_uid", "Unknown")
+        self.target_code = _intern(event.get("target_code", "Unknown"))
+        self.dec_hp = event.get("dec_hp", 0)
+        self.eff = _intern(event.get("eff", "Attack"))
+        self.critical = event.get("critical", False)
+        self.miss = event.get("miss", False)
+
+class StateInfoEvent:
+    """sub_state_info 이벤트. 아군/적군은 id 순으로 정렬되어 있으며, 키가 없으면 None입니다."""
+    __slots__ = ("state", "friends", "enemies")
+    type = "sub_state_info"
+
+    def __init__(self, event: Dict[str, Any]):
+        self.state = _intern(event.get("state", ""))
+        self.friends = parse_characters(event["frineds"]) if "frineds" in event else None  # Keep typo
+        self.enemies = parse_characters(event["enemies"]) if "enemies" in event else None
+
+class EffectEvent:
+    __slots__ = ("type", "target_code", "target_uid", "state")
+
+    def __init__(self, event: Dict[str, Any]):
+        self.type = _intern(event.get("type", ""))
+        self.target_code = _intern(event.get("target_code", "Unknown"))
+        self.target_uid = sys.intern(str(event.get("target_uid", "Unknown")))
+        self.state = _intern(event.get("state", "Unknown"))
+
+Event = Union[AttackEvent, StateInfoEvent, EffectEvent]
+
+class Action:
+    """턴 안의 캐릭터 행동 (sub_history). owner_code가 MISSING이면 행동 헤더가 없습니다."""
+    __slots__ = ("owner_code", "sub_type", "events")
+
+    def __init__(self, owner_code: Any, sub_type: Any, events: Tuple[Event, ...]):
+        self.owner_code = owner_code
+        self.sub_type = sub_type
+        self.events = events
+
+class Turn:
+    """한 턴의 행동 목록."""
+    __slots__ = ("turn_index", "actions")
+
+    def __init__(self, turn_index: Any, actions: Tuple[Action, ...]):
+        self.turn_index = turn_index
+        self.actions = actions
+
+_EVENT_CLASSES = {
+    "attack": AttackEvent,
+    "sub_state_info": StateInfoEvent,
+    **{event_type: EffectEvent for event_type in EFFECT_EVENT_TYPES},
+}
+
+def sort_characters(data: Union[dict, list, Any]) -> List[Dict[str, Any]]:
+    """캐릭터 목록을 id 순으로 정렬된 dict 목록으로 만듭니다.
+
+    dict는 {"id": 키, **값} 목록으로 변환하고, 리스트는 그 자리에서 정렬합니다
+    (report_utils.convert_and_sort_data와 같은 동작).
+    """
+    if isinstance(data, dict):
+        data = [{"id": id, **value} for id, value in data.items()]
+    elif not isinstance(data, list):
+        data = [data]
+    data.sort(key=lambda x: x.get("id", ""))
+    return data
+
+def parse_characters(data: Union[dict, list, Any]) -> Tuple[CharacterState, ...]:
+    """캐릭터 목록을 id 순으로 정렬된 CharacterState 튜플로 변환합니다."""
+    if isinstance(data, dict):
+        # 변환용 dict를 만들지 않고 바로 정렬 (값에 id가 있으면 그 값이 우선)
+        items = [(value.get("id", id), value) for id, value in data.items()]
+        items.sort(key=_first)
+    else:
+        items = [(char_info.get("id", MISSING), char_info) for char_info in sort_characters(data)]
+
+    states = []
+    for char_id, char_info in items:
+        code = char_info.get("code", "")
+        states.append(CharacterState(
+            char_id,
+            _intern_string(code) if type(code) is str else code,
+            char_info.get("hp", MISSING),
+            char_info.get("status", MISSING)
+        ))
+    return tuple(states)
+
+def parse_turn(turn_data: Dict[str, Any]) -> Turn:
+    """원본 턴 데이터를 Turn으로 변환합니다. 리포트/비교에 쓰이지 않는 이벤트는 버립니다."""
+    actions = []
+    for sub_history in turn_data.get("history", ()):
+        if "sub_owner_code" in sub_history:
+            owner_code = _intern(sub_history["sub_owner_code"])
+            sub_type = _intern(sub_history["sub_type"])
+        else:
+            owner_code = sub_type = MISSING
+        events = tuple(
+            _EVENT_CLASSES[event["type"]](event)
+            for event in sub_history.get("history", ())
+            if event.get("type", "") in _EVENT_CLASSES
+        )
+        actions.append(Action(owner_code, sub_type, events))
+    return Turn(turn_data.get("turn_index", MISSING), tuple(actions))
+
+def iter_turns(data: Iterable[Any]) -> Iterator[Turn]:
+    """턴 목록을 하나씩 변환합니다. 이미 변환된 턴은 그대로 반환합니다."""
+    for turn in data:
+        yield turn if isinstance(turn, Turn) else parse_turn(turn)
+
+def parse_battle_record(data: Iterable[Dict[str, Any]]) -> List[Turn]:
+    """전투 기록 전체를 Turn 목록으로 변환합니다."""
+    return list(iter_turns(data))
+
+def character_uid(state: CharacterState) -> Any:
+    if state.id is MISSING:
+        raise KeyError("id")
+    return state.id
@@ -0,0 +1,84 @@
+import asyncio
+import random
+import time
+from typing import Any, Optional
+import httpx
+from app.config.app_config import app_config
+from app.utils.metrics import CALLBACK_SECONDS, CALLBACK_RETRIES
+
+def get_callback_url() -> str:
+    """Battle Verifier 서버의 콜백 URL을 생성합니다."""
+    verifier_config = app_config["battle_verifier"]
+    return f"{verifier_config['protocol']}://{verifier_config['host']}:{verifier_config['port']}/api/report_gen_finish"
+
+def get_callback_batch_url() -> Optional[str]:
+    """배치 콜백 URL을 생성합니다. 배치 경로가 설정되지 않았으면 None을 반환합니다."""
+    verifier_config = app_config["battle_verifier"]
+    if not verifier_config.get("batch_path"):
+        return None
+    return f"{verifier_config['protocol']}://{verifier_config['host']}:{verifier_config['port']}{verifier_config['batch_path']}"
+
+class CallbackClient:
+    """Battle Verifier 콜백용 공유 HTTP 클라이언트.
+
+    연결 수 제한과 keep-alive가 적용된 하나의 httpx.AsyncClient를 앱 전체에서
+    재사용하며, 네트워크 오류/5xx/429 응답은 지터가 있는 백오프로 재시도합니다.
+    """
+
+    def __init__(self, timeout: float, connect_timeout: float, max_connections: int, max_keepalive_connections: int, max_retries: int, base_backoff: float, max_backoff: float):
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.client: Optional[httpx.AsyncClient] = None
+
+    def start(self) -> httpx.AsyncClient:
+        if self.client is None or self.client.is_closed:
+            self.client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+        return self.client
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    def backoff_delay(self, attempt: int) -> float:
+        delay = min(self.base_backoff * (2 ** attempt), self.max_backoff)
+        return random.uniform(0, delay)
+
+    async def post(self, payload: Any, url: Optional[str] = None, max_retries: Optional[int] = None) -> httpx.Response:
+        """콜백을 전송합니다. 재시도 후에도 실패하면 예외를 발생시킵니다.
+
+        max_retries를 지정하면 설정된 재시도 횟수 대신 사용합니다 (0이면 재시도하지 않음).
+        """
+        client = self.start()
+        url = url or get_callback_url()
+        max_retries = self.max_retries if max_retries is None else max_retries
+        attempt = 0
+        started = time.perf_counter()
+        while True:
+            try:
+                response = await client.post(url, json=payload)
+                if response.status_code < 500 and response.status_code != 429:
+                    response.raise_for_status()
+                    CALLBACK_SECONDS.observe(time.perf_counter() - started, outcome="success")
+                    return response
+                error: Exception = httpx.HTTPStatusError(
+                    f"콜백 응답 오류: {response.status_code}", request=response.request, response=response
+                )
+            except httpx.HTTPStatusError:
+                CALLBACK_SECONDS.observe(time.perf_counter() - started, outcome="error")
+                raise
+            except httpx.TransportError as e:
+                error = e
+
+            if attempt >= max_retries:
+                CALLBACK_SECONDS.observe(time.perf_counter() - started, outcome="error")
+                raise error
+            CALLBACK_RETRIES.inc()
+            await asyncio.sleep(self.backoff_delay(attempt))
+            attempt += 1
+
+# 전역 콜백 클라이언트
+callback_client = CallbackClient(**app_config["battle_verifier"]["client"])
@@ -0,0 +1,215 @@
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+from app.config.app_config import app_config
+from app.utils.metrics import metrics
+from app.utils.callback_client import callback_client, get_callback_url, get_callback_batch_url
+
+def _is_permanent_error(error: BaseException) -> bool:
+    """다시 보내도 실패하는 응답(429를 제외한 4xx)인지 확인합니다."""
+    if not isinstance(error, httpx.HTTPStatusError):
+        return False
+    status_code = error.response.status_code
+    return 400 <= status_code < 500 and status_code != 429
+
+class CallbackOutbox:
+    """Battle Verifier 콜백 아웃박스.
+
+    콜백은 먼저 SQLite 파일에 기록되고, 백그라운드 디스패처가 전송합니다.
+    실패한 콜백은 백오프 후 다시 보내며, 재시작 후에도 남은 콜백을 이어서
+    전송합니다. 배치 경로가 설정되어 있으면 여러 콜백을 한 번에 보냅니다.
+    재시도는 아웃박스만 수행하고 (콜백 클라이언트는 재시도하지 않음), 429를 제외한
+    4xx 응답은 다시 보내도 실패하므로 바로 전송을 중단합니다. 전송을 중단한 콜백은
+    dead_retention_seconds 동안 보관한 뒤 삭제합니다.
+    """
+
+    def __init__(self, path: str, batch_size: int, poll_interval: float, max_attempts: int, base_backoff: float, max_backoff: float, dead_retention_seconds: float, cleanup_interval: float):
+        self.path = path
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.dead_retention_seconds = dead_retention_seconds
+        self.cleanup_interval = cleanup_interval
+        self.connection: Optional[sqlite3.Connection] = None
+        self.lock = threading.Lock()
+        self.wakeup: Optional[asyncio.Event] = None
+        self.dispatcher: Optional[asyncio.Task] = None
+        self.cleaner: Optional[asyncio.Task] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS callbacks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    task_id TEXT,
+                    payload TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_error TEXT,
+                    dead INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            connection.execute("CREATE INDEX IF NOT EXISTS callbacks_due ON callbacks (dead, next_attempt_at)")
+            self.connection = connection
+        return self.connection
+
+    def _insert(self, task_id: str, payload: str) -> None:
+        now = time.time()
+        with self.lock:
+            self._connect().execute(
+                "INSERT INTO callbacks (task_id, payload, next_attempt_at, created_at) VALUES (?, ?, ?, ?)",
+                (task_id, payload, now, now)
+            )
+
+    def _fetch_due(self) -> Tuple[List[Tuple[int, int, str]], Optional[float]]:
+        """전송할 콜백과 다음 콜백의 예정 시각을 반환합니다."""
+        now = time.time()
+        with self.lock:
+            connection = self._connect()
+            rows = connection.execute(
+                "SELECT id, attempts, payload FROM callbacks WHERE dead = 0 AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+                (now, self.batch_size)
+            ).fetchall()
+            next_row = connection.execute(
+                "SELECT MIN(next_attempt_at) FROM callbacks WHERE dead = 0 AND next_attempt_at > ?", (now,)
+            ).fetchone()
+        return rows, next_row[0] if next_row else None
+
+    def _mark_delivered(self, ids: List[int]) -> None:
+        with self.lock:
+            self._connect().executemany("DELETE FROM callbacks WHERE id = ?", [(row_id,) for row_id in ids])
+
+    def _mark_failed(self, rows: List[Tuple[int, int, str]], error: str, permanent: bool = False) -> None:
+        updates = []
+        for row_id, attempts, _ in rows:
+            attempts += 1
+            dead = permanent or attempts >= self.max_attempts
+            if dead:
+                # 전송을 중단한 콜백은 next_attempt_at에 중단 시각을 기록 (보관 기간 계산용)
+                next_attempt_at = time.time()
+            else:
+                delay = min(self.base_backoff * (2 ** (attempts - 1)), self.max_backoff)
+                next_attempt_at = time.time() + random.uniform(delay / 2, delay)
+            updates.append((attempts, next_attempt_at, error, int(dead), row_id))
+        with self.lock:
+            self._connect().executemany(
+                "UPDATE callbacks SET attempts = ?, next_attempt_at = ?, last_error = ?, dead = ? WHERE id = ?",
+                updates
+            )
+
+    def cleanup(self) -> int:
+        """보관 기간이 지난 전송 중단 콜백을 삭제하고 삭제한 수를 반환합니다."""
+        if self.dead_retention_seconds <= 0:
+            return 0
+        expire_before = time.time() - self.dead_retention_seconds
+        with self.lock:
+            return self._connect().execute(
+                "DELETE FROM callbacks WHERE dead = 1 AND next_attempt_at < ?", (expire_before,)
+            ).rowcount
+
+    def pending_count(self) -> int:
+        with self.lock:
+            return self._connect().execute("SELECT COUNT(*) FROM callbacks WHERE dead = 0").fetchone()[0]
+
+    async def enqueue(self, payload: Dict[str, Any]) -> None:
+        """콜백을 아웃박스에 기록합니다. 전송은 디스패처가 수행합니다."""
+        await asyncio.to_thread(self._insert, payload.get("task_id", ""), json.dumps(payload, ensure_ascii=False, default=str))
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    def start(self) -> None:
+        if self.dispatcher is None:
+            self._connect()
+            self.wakeup = asyncio.Event()
+            self.dispatcher = asyncio.create_task(self._dispatch())
+        if self.cleaner is None and self.dead_retention_seconds > 0:
+            self.cleaner = asyncio.create_task(self._cleanup_loop())
+
+    async def stop(self) -> None:
+        for task in (self.dispatcher, self.cleaner):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self.dispatcher = None
+        self.cleaner = None
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    async def _deliver(self, rows: List[Tuple[int, int, str]]) -> None:
+        batch_url = get_callback_batch_url()
+        if batch_url and len(rows) > 1:
+            # 배치 전송을 지원하면 한 번의 요청으로 전송
+            payloads = [json.loads(payload) for _, _, payload in rows]
+            try:
+                await callback_client.post({"callbacks": payloads}, batch_url, max_retries=0)
+            except Exception as e:
+                print(f"콜백 배치 전송 실패 ({len(rows)}건): {e}")
+                await asyncio.to_thread(self._mark_failed, rows, str(e), _is_permanent_error(e))
+            else:
+                await asyncio.to_thread(self._mark_delivered, [row[0] for row in rows])
+            return
+
+        url = get_callback_url()
+        results = await asyncio.gather(
+            *[callback_client.post(json.loads(payload), url, max_retries=0) for _, _, payload in rows],
+            return_exceptions=True
+        )
+        delivered = [row[0] for row, result in zip(rows, results) if not isinstance(result, BaseException)]
+        if delivered:
+            await asyncio.to_thread(self._mark_delivered, delivered)
+        for row, result in zip(rows, results):
+            if isinstance(result, BaseException):
+                print(f"콜백 전송 실패 (id={row[0]}): {result}")
+                await asyncio.to_thread(self._mark_failed, [row], str(result), _is_permanent_error(result))
+
+    async def _dispatch(self) -> None:
+        while True:
+            self.wakeup.clear()
+            try:
+                rows, next_due = await asyncio.to_thread(self._fetch_due)
+                if rows:
+                    await self._deliver(rows)
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"콜백 디스패처 오류: {e}")
+                next_due = None
+
+            # 새 콜백이 들어오거나 다음 재시도 시각이 될 때까지 대기
+            timeout = self.poll_interval if next_due is None else min(max(next_due - time.time(), 0.0), self.poll_interval)
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _cleanup_loop(self) -> None:
+        while True:
+            try:
+                deleted = await asyncio.to_thread(self.cleanup)
+                if deleted:
+                    print(f"보관 기간이 지난 콜백 {deleted}건 삭제")
+            except Exception as e:
+                print(f"콜백 아웃박스 정리 중 오류 발생: {e}")
+            await asyncio.sleep(self.cleanup_interval)
+
+# 전역 콜백 아웃박스
+callback_outbox = CallbackOutbox(**app_config["callback_outbox"])
+
+metrics.gauge("reporter_callback_outbox_pending", "Callbacks waiting in the outbox for delivery", function=lambda: callback_outbox.pending_count() if callback_outbox.connection is not None else 0)
@@ -0,0 +1,38 @@
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+from app.config.app_config import app_config
+
+# CPU 작업(디코딩, 리포트 생성)용 전역 프로세스 풀
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+def start_process_pool() -> Optional[ProcessPoolExecutor]:
+    """설정된 워커 수로 프로세스 풀을 생성합니다. 워커 수가 0이면 스레드에서 실행합니다."""
+    global _process_pool
+    if _process_pool is None:
+        max_workers = app_config["executor"]["max_workers"]
+        if max_workers > 0:
+            # 이벤트 루프 스레드를 fork하지 않도록 spawn 사용
+            _process_pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+    return _process_pool
+
+def shutdown_process_pool() -> None:
+    """프로세스 풀을 종료합니다."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=True, cancel_futures=True)
+        _process_pool = None
+
+async def run_cpu_bound(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """CPU 작업을 이벤트 루프 밖(프로세스 풀 또는 스레드)에서 실행합니다."""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(func, *args, **kwargs)
+    pool = start_process_pool()
+    if pool is None:
+        return await asyncio.to_thread(call)
+    return await loop.run_in_executor(pool, call)
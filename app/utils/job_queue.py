@@ -0,0 +1,147 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from app.config.app_config import app_config
+from app.utils.metrics import metrics, ANALYSIS_STAGE_SECONDS
+
+class QueueFullError(Exception):
+    """대기열이 가득 차 작업을 받을 수 없습니다."""
+
+class QueueUnavailableError(Exception):
+    """대기열이 실행 중이 아니어서 작업을 받을 수 없습니다."""
+
+class _Job:
+    __slots__ = ("task_id", "provider", "run", "queued_at")
+
+    def __init__(self, task_id: str, provider: str, run: Callable[[], Awaitable[Any]]):
+        self.task_id = task_id
+        self.provider = provider
+        self.run = run
+        self.queued_at = time.monotonic()
+
+class AnalysisQueue:
+    """분석 작업 대기열.
+
+    고정된 수의 워커가 대기 순서대로 작업을 실행하며, 제공자별 동시 실행
+    수를 넘는 작업은 건너뛰고 다음 작업을 먼저 실행합니다.
+    """
+
+    def __init__(self, max_workers: int, max_queue_size: int, provider_limits: Dict[str, int], default_provider_limit: int):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.provider_limits = provider_limits
+        self.default_provider_limit = default_provider_limit
+        self.pending: "OrderedDict[str, _Job]" = OrderedDict()
+        self.running: Dict[str, int] = {}
+        self.workers: List[asyncio.Task] = []
+        self.condition: Optional[asyncio.Condition] = None
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self.workers)
+
+    @property
+    def depth(self) -> int:
+        return len(self.pending)
+
+    @property
+    def in_flight(self) -> int:
+        return sum(self.running.values())
+
+    def start(self) -> None:
+        if self.workers:
+            return
+        self.condition = asyncio.Condition()
+        self.workers = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+
+    async def stop(self) -> None:
+        workers, self.workers = self.workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self.pending.clear()
+        self.running.clear()
+
+    def free_slots(self) -> int:
+        return max(self.max_queue_size - len(self.pending), 0)
+
+    async def submit(self, task_id: str, provider: str, run: Callable[[], Awaitable[Any]]) -> int:
+        """작업을 대기열에 추가하고 대기 순번(1부터)을 반환합니다."""
+        if not self.workers:
+            raise QueueUnavailableError("분석 대기열이 실행 중이 아닙니다.")
+        if len(self.pending) >= self.max_queue_size:
+            raise QueueFullError(f"분석 대기열이 가득 찼습니다. (최대 {self.max_queue_size})")
+
+        self.pending[task_id] = _Job(task_id, provider, run)
+        async with self.condition:
+            self.condition.notify()
+        return len(self.pending)
+
+    async def submit_many(self, jobs: List[Tuple[str, str, Callable[[], Awaitable[Any]]]]) -> List[int]:
+        """여러 작업을 한꺼번에 추가합니다. 자리가 모자라면 하나도 추가하지 않습니다."""
+        if not self.workers:
+            raise QueueUnavailableError("분석 대기열이 실행 중이 아닙니다.")
+        if len(jobs) > self.free_slots():
+            raise QueueFullError(f"분석 대기열에 자리가 부족합니다. (요청 {len(jobs)}, 남은 자리 {self.free_slots()})")
+
+        positions = []
+        for task_id, provider, run in jobs:
+            self.pending[task_id] = _Job(task_id, provider, run)
+            positions.append(len(self.pending))
+        async with self.condition:
+            self.condition.notify_all()
+        return positions
+
+    def get_queue_info(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """대기 중인 작업의 순번과 대기 시간을 반환합니다."""
+        job = self.pending.get(task_id)
+        if job is None:
+            return None
+        for position, pending_id in enumerate(self.pending, start=1):
+            if pending_id == task_id:
+                break
+        return {
+            "queue_position": position,
+            "queued_seconds": round(time.monotonic() - job.queued_at, 3)
+        }
+
+    def _provider_limit(self, provider: str) -> int:
+        return self.provider_limits.get(provider, self.default_provider_limit)
+
+    def _next_job(self) -> Optional[_Job]:
+        for job in self.pending.values():
+            if self.running.get(job.provider, 0) < self._provider_limit(job.provider):
+                return job
+        return None
+
+    async def _worker(self) -> None:
+        while True:
+            async with self.condition:
+                job = self._next_job()
+                while job is None:
+                    await self.condition.wait()
+                    job = self._next_job()
+                del self.pending[job.task_id]
+                self.running[job.provider] = self.running.get(job.provider, 0) + 1
+            ANALYSIS_STAGE_SECONDS.observe(time.monotonic() - job.queued_at, stage="queue_wait")
+
+            try:
+                await job.run()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"분석 작업 실행 중 오류 발생 ({job.task_id}): {e}")
+            finally:
+                self.running[job.provider] -= 1
+                if not self.running[job.provider]:
+                    del self.running[job.provider]
+                # 제공자 슬롯이 비었으므로 건너뛴 작업이 있는 워커도 깨움
+                async with self.condition:
+                    self.condition.notify_all()
+
+# 전역 분석 대기열
+analysis_queue = AnalysisQueue(**app_config["job_queue"])
+
+metrics.gauge("reporter_queue_depth", "Analysis tasks waiting in the queue", function=lambda: analysis_queue.depth)
+metrics.gauge("reporter_tasks_in_flight", "Analysis tasks currently running", function=lambda: analysis_queue.in_flight)
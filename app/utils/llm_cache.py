@@ -0,0 +1,142 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+from app.config.app_config import app_config
+from app.utils.metrics import metrics, LLM_CACHE_LOOKUPS
+
+def template_hash(*prompts: Any) -> str:
+    """프롬프트 템플릿 내용으로 해시를 만듭니다."""
+    parts = []
+    for prompt in prompts:
+        for message in getattr(prompt, "messages", [prompt]):
+            template = getattr(getattr(message, "prompt", None), "template", None)
+            parts.append(template if template is not None else repr(message))
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+class LLMResponseCache:
+    """LLM 응답 캐시 (메모리 LRU + 로컬 디스크).
+
+    키는 제공자, 모델, temperature, 프롬프트 템플릿 해시, 렌더링 입력값으로
+    만들며, 값은 JSON으로 직렬화 가능한 응답이어야 합니다.
+    """
+
+    def __init__(self, enabled: bool, max_memory_entries: int, disk_dir: str, max_disk_bytes: int):
+        self.enabled = enabled
+        self.max_memory_entries = max_memory_entries
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.memory: "OrderedDict[str, Any]" = OrderedDict()
+        # 디스크 항목 (키 -> 크기), 오래된 순서 유지
+        self.disk_index: Optional["OrderedDict[str, int]"] = None
+        self.disk_bytes = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(provider: str, model: str, temperature: float, template: str, inputs: Dict[str, Any]) -> str:
+        payload = json.dumps(
+            [provider, model, temperature, template, inputs],
+            ensure_ascii=False, sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, value: Any) -> None:
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+
+    def _load_disk_index(self) -> None:
+        """기존 디스크 캐시 파일을 수정 시각 순으로 읽어 인덱스를 만듭니다."""
+        entries = []
+        if os.path.isdir(self.disk_dir):
+            for root, _, files in os.walk(self.disk_dir):
+                for name in files:
+                    if name.endswith(".json"):
+                        stat = os.stat(os.path.join(root, name))
+                        entries.append((stat.st_mtime, name[:-5], stat.st_size))
+        entries.sort()
+        self.disk_index = OrderedDict((key, size) for _, key, size in entries)
+        self.disk_bytes = sum(self.disk_index.values())
+
+    def _disk_get(self, key: str) -> Optional[Any]:
+        with self.lock:
+            if self.disk_index is None:
+                self._load_disk_index()
+            if key not in self.disk_index:
+                return None
+            self.disk_index.move_to_end(key)
+        try:
+            with open(self._disk_path(key), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _disk_set(self, key: str, value: Any) -> None:
+        data = json.dumps(value, ensure_ascii=False)
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(data)
+        except OSError as e:
+            print(f"LLM 캐시 저장 중 오류 발생: {e}")
+            return
+
+        size = len(data.encode("utf-8"))
+        with self.lock:
+            if self.disk_index is None:
+                self._load_disk_index()
+            self.disk_bytes += size - self.disk_index.pop(key, 0)
+            self.disk_index[key] = size
+            # 용량을 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+            while self.disk_bytes > self.max_disk_bytes and len(self.disk_index) > 1:
+                old_key, old_size = self.disk_index.popitem(last=False)
+                self.disk_bytes -= old_size
+                try:
+                    os.remove(self._disk_path(old_key))
+                except OSError:
+                    pass
+
+    async def get(self, key: str) -> Optional[Any]:
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            LLM_CACHE_LOOKUPS.inc(result="memory_hit")
+            return self.memory[key]
+        if self.max_disk_bytes > 0:
+            value = await asyncio.to_thread(self._disk_get, key)
+            if value is not None:
+                LLM_CACHE_LOOKUPS.inc(result="disk_hit")
+                self._remember(key, value)
+                return value
+        LLM_CACHE_LOOKUPS.inc(result="miss")
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        self._remember(key, value)
+        if self.max_disk_bytes > 0:
+            await asyncio.to_thread(self._disk_set, key, value)
+
+    async def get_or_call(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """캐시에 없으면 호출하여 결과를 저장합니다."""
+        if not self.enabled:
+            return await func()
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+        value = await func()
+        if value is not None:
+            await self.set(key, value)
+        return value
+
+# 전역 LLM 응답 캐시
+llm_cache = LLMResponseCache(**app_config["llm_cache"])
+
+metrics.gauge("reporter_llm_cache_memory_entries", "Entries in the in-memory LLM response cache", function=lambda: len(llm_cache.memory))
+metrics.gauge("reporter_llm_cache_disk_bytes", "Bytes used by the on-disk LLM response cache", function=lambda: llm_cache.disk_bytes)
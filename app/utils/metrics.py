@@ -0,0 +1,240 @@
+import math
+from bisect import bisect_left
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# 기본 히스토그램 구간(초): 짧은 CPU 단계부터 긴 LLM 호출까지
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+LabelValues = Tuple[str, ...]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name}: 레이블은 {self.label_names}이어야 합니다. (받은 값: {tuple(labels)})")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}", *self.samples()]
+
+class Counter(_Metric):
+    """증가만 하는 값 (요청 수, 실패 수 등)."""
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        with self.lock:
+            values = sorted(self.values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in values]
+
+class Gauge(_Metric):
+    """현재 값 (대기열 길이 등). function을 주면 조회할 때마다 값을 계산합니다 (레이블 없음)."""
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (), function: Optional[Callable[[], float]] = None):
+        super().__init__(name, documentation, label_names)
+        self.values: Dict[LabelValues, float] = {}
+        self.function = function
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def samples(self) -> List[str]:
+        if self.function is not None:
+            try:
+                return [f"{self.name} {_format_value(self.function())}"]
+            except Exception as e:
+                print(f"메트릭 값 계산 중 오류 발생 ({self.name}): {e}")
+                return []
+        with self.lock:
+            values = sorted(self.values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in values]
+
+class Histogram(_Metric):
+    """값의 분포 (소요 시간 등). 구간별 누적 개수와 합계, 개수를 기록합니다."""
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # 레이블 값 -> (구간별 개수, 합계, 개수)
+        self.values: Dict[LabelValues, List] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [[0] * len(self.buckets), 0.0, 0]
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """with 블록의 소요 시간(초)을 기록합니다. 예외가 나도 기록합니다."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[str]:
+        with self.lock:
+            values = sorted((key, (list(state[0]), state[1], state[2])) for key, state in self.values.items())
+        lines = []
+        for key, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels(self.label_names, key, 'le="%s"' % _format_value(bound))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            inf_labels = _format_labels(self.label_names, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf_labels} {count}")
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+class MetricsRegistry:
+    """메트릭 목록. render는 Prometheus 텍스트 형식(0.0.4)으로 출력합니다."""
+
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"이미 등록된 메트릭입니다: {metric.name}")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = (), function: Optional[Callable[[], float]] = None) -> Gauge:
+        return self.register(Gauge(name, documentation, label_names, function))
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+# 전역 메트릭 목록
+metrics = MetricsRegistry()
+
+# 분석 작업
+ANALYSIS_STAGE_SECONDS = metrics.histogram(
+    "reporter_analysis_stage_seconds",
+    "Time spent in each stage of an analysis task",
+    ["stage"]
+)
+ANALYSIS_TASKS = metrics.counter(
+    "reporter_analysis_tasks_total",
+    "Finished analysis tasks by status",
+    ["status"]
+)
+
+# LLM 호출
+LLM_REQUEST_SECONDS = metrics.histogram(
+    "reporter_llm_request_seconds",
+    "Latency of a single LLM request attempt",
+    ["provider", "model", "call"]
+)
+LLM_REQUESTS = metrics.counter(
+    "reporter_llm_requests_total",
+    "LLM request attempts by outcome",
+    ["provider", "model", "call", "outcome"]
+)
+LLM_RETRIES = metrics.counter(
+    "reporter_llm_retries_total",
+    "LLM request retries by reason",
+    ["provider", "model", "reason"]
+)
+LLM_TOKENS = metrics.counter(
+    "reporter_llm_tokens_total",
+    "LLM tokens reported by the provider, by report type and kind (prompt, completion, cached)",
+    ["provider", "model", "report_type", "kind"]
+)
+TURN_VERDICTS = metrics.counter(
+    "reporter_turn_verdicts_total",
+    "Per-turn verdicts by report type, source (llm or local) and verdict",
+    ["report_type", "source", "verdict"]
+)
+SUMMARY_PARSE_SECONDS = metrics.histogram(
+    "reporter_summary_parse_seconds",
+    "Time spent parsing the JSON summary response",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+)
+SUMMARY_PARSE_FAILURES = metrics.counter(
+    "reporter_summary_parse_failures_total",
+    "JSON summary responses that could not be parsed or were missing fields"
+)
+
+# LLM 응답 캐시
+LLM_CACHE_LOOKUPS = metrics.counter(
+    "reporter_llm_cache_lookups_total",
+    "LLM response cache lookups by result (memory_hit, disk_hit, miss)",
+    ["result"]
+)
+
+# 콜백
+CALLBACK_SECONDS = metrics.histogram(
+    "reporter_callback_seconds",
+    "Time to deliver a callback to the Battle Verifier, including retries",
+    ["outcome"]
+)
+CALLBACK_RETRIES = metrics.counter(
+    "reporter_callback_retries_total",
+    "Callback delivery retries"
+)
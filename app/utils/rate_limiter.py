@@ -0,0 +1,186 @@
+import asyncio
+import random
+import re
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from app.config.app_config import app_config
+from app.utils.metrics import LLM_RETRIES
+
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_PATTERN = re.compile(r"(?:\d+(?:\.\d+)?(?:ms|h|m|s))+")
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """제공자의 요청 제한(429) 오류인지 확인합니다."""
+    status_code = getattr(error, "status_code", None)
+    response = getattr(error, "response", None)
+    if status_code is None and response is not None:
+        status_code = getattr(response, "status_code", None)
+    if status_code == 429:
+        return True
+    name = type(error).__name__
+    return "RateLimit" in name or "ResourceExhausted" in name
+
+def _parse_duration(value: str) -> Optional[float]:
+    """'1.5', '20ms', '6m0s', RFC3339 시각 등의 헤더 값을 초 단위로 변환합니다."""
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    # OpenAI 형식 (예: 6m0s, 1s, 20ms)
+    if _DURATION_PATTERN.fullmatch(value):
+        return sum(float(number) * _DURATION_UNITS[unit] for number, unit in _DURATION_PART.findall(value))
+
+    # Anthropic 형식 (RFC3339 시각)
+    try:
+        reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if reset_at.tzinfo is None:
+        reset_at = reset_at.replace(tzinfo=timezone.utc)
+    return max((reset_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+def get_retry_delay(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """요청 제한 응답 헤더에서 다시 요청할 수 있을 때까지의 시간을 구합니다."""
+    if not headers:
+        return None
+    if headers.get("retry-after-ms"):
+        delay = _parse_duration(headers["retry-after-ms"])
+        if delay is not None:
+            return delay / 1000.0
+    for name in ("retry-after", "x-ratelimit-reset-requests", "anthropic-ratelimit-requests-reset"):
+        if headers.get(name):
+            delay = _parse_duration(headers[name])
+            if delay is not None:
+                return delay
+    return None
+
+def _error_headers(error: BaseException) -> Optional[Mapping[str, str]]:
+    response = getattr(error, "response", None)
+    return getattr(response, "headers", None)
+
+class RateLimiter:
+    """제공자/모델별 토큰 버킷 + 동시 실행 제한.
+
+    평상시에는 설정된 분당 요청 수 안에서 바로 요청하고, 제공자가 요청 제한을
+    알려올 때(429 또는 남은 요청 0)만 버킷 전체를 잠시 멈춥니다.
+    """
+
+    def __init__(self, requests_per_minute: float, max_concurrency: int, burst: int, max_retries: int, base_backoff: float, max_backoff: float, provider: str = "", model: str = ""):
+        # 메트릭 레이블
+        self.provider = provider
+        self.model = model
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.lock = asyncio.Lock()
+
+    async def _take_token(self) -> None:
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                if self.rate <= 0:
+                    return
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def block_for(self, delay: float) -> None:
+        self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+
+    def observe_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        """성공 응답의 헤더에서 남은 요청 수가 0이면 초기화 시점까지 대기합니다."""
+        if not headers:
+            return
+        for remaining_name in ("x-ratelimit-remaining-requests", "anthropic-ratelimit-requests-remaining"):
+            remaining = headers.get(remaining_name)
+            if remaining is not None and remaining.strip() == "0":
+                delay = get_retry_delay(headers)
+                if delay:
+                    self.block_for(delay)
+                return
+
+    def backoff_delay(self, attempt: int) -> float:
+        # 지수 백오프 + 지터
+        delay = min(self.base_backoff * (2 ** attempt), self.max_backoff)
+        return random.uniform(delay / 2, delay)
+
+    async def call(self, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """제한 안에서 호출하고, 실패 시 최대 max_retries번 다시 시도합니다."""
+        attempt = 0
+        while True:
+            async with self.semaphore:
+                await self._take_token()
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    error = e
+
+            if attempt >= self.max_retries:
+                raise error
+
+            LLM_RETRIES.inc(provider=self.provider, model=self.model, reason="rate_limit" if is_rate_limit_error(error) else "error")
+            if is_rate_limit_error(error):
+                # 제공자가 알려준 시간만큼 버킷 전체를 멈춤
+                delay = get_retry_delay(_error_headers(error))
+                self.block_for(delay if delay is not None else self.backoff_delay(attempt))
+                print(f"요청 제한 발생, {self.blocked_until - time.monotonic():.1f}초 후 재시도: {error}")
+            else:
+                delay = self.backoff_delay(attempt)
+                print(f"요청 실패, {delay:.1f}초 후 재시도: {error}")
+                await asyncio.sleep(delay)
+            attempt += 1
+
+class RateLimitHeaderCallback(BaseCallbackHandler):
+    """LLM 응답 메시지의 헤더(response_metadata["headers"])를 제한기에 전달합니다.
+
+    체인 종류와 관계없이 모델 호출마다 실행되도록 LLM 클라이언트에 등록합니다.
+    헤더를 주지 않는 제공자(응답이 문자열인 모델 포함)는 아무 작업도 하지 않습니다.
+    """
+
+    # 이벤트 루프 스레드에서 바로 실행 (스레드 풀로 넘기지 않음)
+    run_inline = True
+
+    def __init__(self, rate_limiter: "RateLimiter"):
+        self.rate_limiter = rate_limiter
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                metadata = getattr(getattr(generation, "message", None), "response_metadata", None)
+                if isinstance(metadata, dict):
+                    self.rate_limiter.observe_headers(metadata.get("headers"))
+
+# 제공자/모델별 전역 제한기
+_rate_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+
+def get_rate_limiter(provider: str, model: str) -> RateLimiter:
+    """제공자/모델별로 공유되는 제한기를 반환합니다."""
+    key = (provider, model)
+    if key not in _rate_limiters:
+        rate_limits = app_config["rate_limits"]
+        # 기본값 < 제공자 < "제공자:모델" 순으로 덮어씀
+        settings = {
+            **rate_limits["default"],
+            **rate_limits.get(provider, {}),
+            **rate_limits.get(f"{provider}:{model}", {})
+        }
+        _rate_limiters[key] = RateLimiter(**settings, provider=provider, model=model)
+    return _rate_limiters[key]
@@ -1,58 +1,99 @@
-from typing import Union, Any
+from bisect import insort
+from typing import Union, Any, Dict, List, Optional, Tuple
 
-# 전역 상태 추적기
 class StateTracker:
+    """리포트 생성 한 번에 사용하는 상태 효과 추적기.
+
+    uid와 상태를 정렬된 상태로 유지하고, 요약 문자열은 상태가 바뀔 때만
+    바뀐 uid의 줄만 다시 만듭니다.
+    """
+
     def __init__(self):
-        self.states = {}  # uid -> set(states)
-    
+        self.states: Dict[str, set] = {}  # uid -> set(states)
+        self.sorted_states: Dict[str, List[str]] = {}  # uid -> 정렬된 상태 목록
+        # 정렬된 uid 목록 ((정렬 키, uid)), 정수가 아닌 uid가 있으면 문자열 기준으로 정렬
+        self.sorted_uids: List[Tuple[object, str]] = []
+        self.non_int_uids = 0
+        self.lines: Dict[str, str] = {}  # uid -> 요약 줄
+        self.summary_cache: Optional[str] = None
+
+    @staticmethod
+    def _int_key(uid: str) -> Optional[int]:
+        try:
+            return int(uid)
+        except ValueError:
+            return None
+
+    def _sort_key(self, uid: str) -> object:
+        return uid if self.non_int_uids else int(uid)
+
+    def _resort_uids(self) -> None:
+        # 정렬 기준이 바뀔 때만 전체를 다시 정렬 (같은 키는 추가된 순서 유지)
+        self.sorted_uids = sorted(((self._sort_key(uid), uid) for uid in self.states), key=lambda item: item[0])
+
     def add_state(self, uid: Union[str, int], state: str):
         uid_str = str(uid)
+        state_str = str(state)
         if uid_str not in self.states:
             self.states[uid_str] = set()
-        self.states[uid_str].add(str(state))
-    
+            self.sorted_states[uid_str] = []
+            if self._int_key(uid_str) is None:
+                self.non_int_uids += 1
+                if self.non_int_uids == 1:
+                    self._resort_uids()
+                    return self._add_sorted_state(uid_str, state_str)
+            insort(self.sorted_uids, (self._sort_key(uid_str), uid_str), key=lambda item: item[0])
+        self._add_sorted_state(uid_str, state_str)
+
+    def _add_sorted_state(self, uid_str: str, state_str: str) -> None:
+        if state_str in self.states[uid_str]:
+            return
+        self.states[uid_str].add(state_str)
+        insort(self.sorted_states[uid_str], state_str)
+        self._invalidate(uid_str)
+
     def remove_state(self, uid: Union[str, int], state: str):
         uid_str = str(uid)
-        if uid_str in self.states:
-            self.states[uid_str].discard(str(state))
-            if not self.states[uid_str]:
-                del self.states[uid_str]
-    
+        state_str = str(state)
+        if uid_str not in self.states or state_str not in self.states[uid_str]:
+            return
+        self.states[uid_str].discard(state_str)
+        self.sorted_states[uid_str].remove(state_str)
+        self._invalidate(uid_str)
+        if not self.states[uid_str]:
+            del self.states[uid_str]
+            del self.sorted_states[uid_str]
+            if self._int_key(uid_str) is None:
+                self.non_int_uids -= 1
+                if not self.non_int_uids:
+                    self._resort_uids()
+                    return
+            self.sorted_uids.remove((self._sort_key(uid_str), uid_str))
+
+    def _invalidate(self, uid_str: str) -> None:
+        self.lines.pop(uid_str, None)
+        self.summary_cache = None
+
     def get_states(self, uid: Union[str, int]) -> set:
         return self.states.get(str(uid), set())
-    
+
     def get_all_states(self) -> dict:
-        try:
-            # uid를 정수로 변환하여 정렬
-            sorted_uids = sorted(self.states.keys(), key=lambda x: int(x))
-            result = {}
-            for uid in sorted_uids:
-                # 각 상태를 문자열로 처리하여 정렬
-                states = self.states[uid]
-                result[uid] = sorted(str(state) for state in states)
-            return result
-        except (ValueError, TypeError):
-            # 정수 변환 실패 시 문자열 기준 정렬
-            sorted_uids = sorted(self.states.keys())
-            return {uid: sorted(str(state) for state in self.states[uid]) 
-                   for uid in sorted_uids}
-
-# 전역 상태 추적기 인스턴스 생성
-state_tracker = StateTracker()
-
-def get_current_states_summary() -> str:
-    summary = ["\n### Current States Summary\n"]
-    
-    try:
-        all_states = state_tracker.get_all_states()
-        for uid in all_states:
-            states = all_states[uid]
-            if states:  # Only display if states exist
-                summary.append(f" * UID:{uid} Current States: {', '.join(states)}\n")
-    except Exception as e:
-        summary.append(f"* Error processing state information: {str(e)}\n")
-    
-    return "".join(summary) if len(summary) > 1 else ""
+        return {uid: list(self.sorted_states[uid]) for _, uid in self.sorted_uids}
+
+    def summary(self) -> str:
+        """현재 상태 요약을 반환합니다. 상태가 바뀌지 않았으면 이전 결과를 그대로 반환합니다."""
+        if self.summary_cache is None:
+            lines = ["\n### Current States Summary\n"]
+            for _, uid in self.sorted_uids:
+                line = self.lines.get(uid)
+                if line is None:
+                    line = self.lines[uid] = f" * UID:{uid} Current States: {', '.join(self.sorted_states[uid])}\n"
+                lines.append(line)
+            self.summary_cache = "".join(lines) if len(lines) > 1 else ""
+        return self.summary_cache
+
+def get_current_states_summary(tracker: StateTracker) -> str:
+    return tracker.summary()
 
 def format_status(status: dict | None) -> str:
     if not status:
@@ -94,6 +135,17 @@ def compare_status_values(old_status: dict | None, new_status: dict | None) -> l
     
     return changes
 
+def format_attack_info(from_code: Any, from_uid: Any, target_code: Any, target_uid: Any, dec_hp: Any, eff: Any, is_critical: Any, is_miss: Any) -> str:
+    attack_desc = f"- ATTACK INFO: {from_code}(UID:{from_uid}) deals {dec_hp} damage to {target_code}(UID:{target_uid})"
+    if eff:
+        attack_desc += f" [Effect: {eff}]"
+    if is_critical:
+        attack_desc += f" (Critical)"
+    if is_miss:
+        attack_desc += f" (Miss)"
+
+    return attack_desc + "\n"
+
 def process_attack_event(event: dict, report_type: str = "full") -> str:
     if report_type not in ["attack", "full"]:
         return ""  # 빈 문자열 반환
@@ -107,15 +159,7 @@ def process_attack_event(event: dict, report_type: str = "full") -> str:
     is_critical = event.get("critical", False)
     is_miss = event.get("miss", False)
     
-    attack_desc = f"- ATTACK INFO: {from_code}(UID:{from_uid}) deals {dec_hp} damage to {target_code}(UID:{target_uid})"
-    if has_eff:
-        attack_desc += f" [Effect: {has_eff}]"
-    if is_critical:
-        attack_desc += f" (Critical)"
-    if is_miss:
-        attack_desc += f" (Miss)"
-
-    return attack_desc + "\n"
+    return format_attack_info(from_code, from_uid, target_code, target_uid, dec_hp, has_eff, is_critical, is_miss)
 
 def process_state_info(state: str, report_type: str = "full") -> str:
     if report_type not in ["status", "full"]:
@@ -156,24 +200,30 @@ def process_character_status(
     
     return report
 
-def process_eff_info(event: dict, report_type: str = "effect") -> str:
-    if report_type not in ["effect", "full"]:
-        return ""  # 빈 문자열 반환
-        
-    event_type = event.get("type", "")
-    target_code = event.get("target_code", "Unknown")
-    state = event.get("state", "Unknown")
-    target_uid = str(event.get("target_uid", "Unknown"))
-    
+def format_eff_info(event_type: str, target_code: Any, target_uid: str, state: Any, tracker: Optional[StateTracker] = None) -> str:
+    """상태 효과 이벤트를 한 줄로 만들고, 추가/제거된 상태를 상태 추적기에 반영합니다."""
     if event_type == "add_state":
-        state_tracker.add_state(target_uid, state)
+        if tracker is not None:
+            tracker.add_state(target_uid, state)
         return f"- EFFECT ADD: {target_code}(UID:{target_uid}) [ {state} ]\n"
     elif event_type == "remove_state":
-        state_tracker.remove_state(target_uid, state)
+        if tracker is not None:
+            tracker.remove_state(target_uid, state)
         return f"- EFFECT REMOVE: {target_code}(UID:{target_uid}) [ {state} ]\n"
     elif event_type == "immune":
         return f"- EFFECT IMMUNE: {target_code}(UID:{target_uid}) immune [ {state} ]\n"
     elif event_type == "anti_skill_effect":
         return f"- EFFECT ANTISKILL: {target_code}(UID:{target_uid}) anti [ {state} ]\n"
     else:
-        return f"- Unknown state effect: {event_type}\n"
\ No newline at end of file
+        return f"- Unknown state effect: {event_type}\n"
+
+def process_eff_info(event: dict, report_type: str = "effect", tracker: Optional[StateTracker] = None) -> str:
+    if report_type not in ["effect", "full"]:
+        return ""  # 빈 문자열 반환
+        
+    event_type = event.get("type", "")
+    target_code = event.get("target_code", "Unknown")
+    state = event.get("state", "Unknown")
+    target_uid = str(event.get("target_uid", "Unknown"))
+    
+    return format_eff_info(event_type, target_code, target_uid, state, tracker)
@@ -0,0 +1,94 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Set
+from app.config.app_config import app_config
+
+# 작업의 마지막 이벤트
+TERMINAL_EVENTS = ("completed", "failed")
+
+class TaskEventBus:
+    """작업별 진행 이벤트 버스.
+
+    작업마다 최근 이벤트를 보관하여 나중에 구독한 클라이언트도 처음부터 받을 수
+    있게 하고, 구독 중인 클라이언트에게는 새 이벤트를 바로 전달합니다. 종료된
+    작업의 이벤트는 TTL이 지나면 제거됩니다.
+    """
+
+    def __init__(self, max_events_per_task: int, heartbeat_seconds: float, ttl_seconds: float):
+        self.max_events_per_task = max_events_per_task
+        self.heartbeat_seconds = heartbeat_seconds
+        self.ttl_seconds = ttl_seconds
+        self.history: Dict[str, Deque[Dict[str, Any]]] = {}
+        self.counters: Dict[str, int] = {}
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        # 종료된 작업 (task_id -> 종료 시각), 종료 순서 유지
+        self.finished: "OrderedDict[str, float]" = OrderedDict()
+
+    def publish(self, task_id: str, event: str, data: Optional[Dict[str, Any]] = None) -> None:
+        """이벤트를 기록하고 구독자에게 전달합니다. 이벤트 루프 스레드에서 호출해야 합니다."""
+        if task_id not in self.history:
+            self.evict()
+            self.history[task_id] = deque(maxlen=self.max_events_per_task)
+        self.counters[task_id] = self.counters.get(task_id, 0) + 1
+        item = {"id": self.counters[task_id], "event": event, "data": data or {}, "time": time.time()}
+        self.history[task_id].append(item)
+        for queue in self.subscribers.get(task_id, ()):
+            queue.put_nowait(item)
+        if event in TERMINAL_EVENTS:
+            self.finished[task_id] = time.monotonic()
+            self.finished.move_to_end(task_id)
+
+    def has_events(self, task_id: str) -> bool:
+        return task_id in self.history
+
+    async def subscribe(self, task_id: str, last_event_id: int = 0) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """last_event_id 이후의 이벤트를 순서대로 반환합니다.
+
+        새 이벤트가 heartbeat_seconds 동안 없으면 None을 반환하며, 종료 이벤트를
+        반환한 뒤에는 끝납니다.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self.subscribers.setdefault(task_id, set()).add(queue)
+        try:
+            last_id = last_event_id
+            for item in list(self.history.get(task_id, ())):
+                if item["id"] <= last_id:
+                    continue
+                last_id = item["id"]
+                yield item
+                if item["event"] in TERMINAL_EVENTS:
+                    return
+
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if item["id"] <= last_id:
+                    continue
+                last_id = item["id"]
+                yield item
+                if item["event"] in TERMINAL_EVENTS:
+                    return
+        finally:
+            subscribers = self.subscribers.get(task_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self.subscribers[task_id]
+
+    def evict(self) -> None:
+        """종료 후 TTL이 지난 작업의 이벤트를 제거합니다."""
+        expire_before = time.monotonic() - self.ttl_seconds
+        while self.finished:
+            task_id, finished_at = next(iter(self.finished.items()))
+            if finished_at > expire_before:
+                break
+            del self.finished[task_id]
+            self.history.pop(task_id, None)
+            self.counters.pop(task_id, None)
+
+# 전역 작업 이벤트 버스
+task_events = TaskEventBus(ttl_seconds=app_config["task_store"]["ttl_seconds"], **app_config["task_events"])
@@ -1,29 +1,240 @@
-from typing import Dict, Any
+import asyncio
+import gzip
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
 from datetime import datetime
+from app.config.app_config import app_config
+from app.utils.job_queue import analysis_queue
 
-# 작업 상태를 저장하는 전역 딕셔너리
-task_status: Dict[str, Dict[str, Any]] = {}
+class TaskStore:
+    """작업 상태 저장소.
+
+    완료/실패한 작업은 TTL이 지나면 제거되고, 저장 개수가 상한을 넘으면
+    가장 먼저 끝난 작업부터 제거합니다. 큰 결과는 압축 파일로 내려두고
+    조회 시에만 읽어옵니다. 압축 파일 저장/읽기는 이벤트 루프를 막지 않도록
+    스레드에서 실행합니다.
+    """
+
+    def __init__(self, max_tasks: int, ttl_seconds: float, spill_threshold_bytes: int, spill_dir: str):
+        self.max_tasks = max_tasks
+        self.ttl_seconds = ttl_seconds
+        self.spill_threshold_bytes = spill_threshold_bytes
+        self.spill_dir = spill_dir
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        # 종료된 작업 (task_id -> 종료 시각), 종료 순서 유지
+        self.finished: "OrderedDict[str, float]" = OrderedDict()
+        # 결과가 디스크에 저장된 작업 (task_id -> 파일 경로)
+        self.spilled: Dict[str, str] = {}
+
+    def init(self, task_id: str) -> None:
+        self.evict()
+        self.tasks[task_id] = {
+            "status": "pending",
+            "started_at": datetime.utcnow().isoformat(),
+            "completed_at": None,
+            "result": None,
+            "error": None
+        }
+
+    async def update(self, task_id: str, status: str, result: Any = None, error: str = None) -> None:
+        if task_id not in self.tasks:
+            return
+        if status == "completed":
+            result = await asyncio.to_thread(self.spill, task_id, result)
+        task = self.tasks.get(task_id)
+        if task is None:
+            # 저장하는 동안 삭제된 작업이면 저장한 결과 파일도 삭제
+            self.remove(task_id)
+            return
+        task["status"] = status
+        if status == "processing":
+            # 접수 후 실행 시작까지 대기한 시간
+            started_at = datetime.fromisoformat(task["started_at"])
+            task["queue_wait_seconds"] = round((datetime.utcnow() - started_at).total_seconds(), 3)
+        elif status == "completed":
+            task["completed_at"] = datetime.utcnow().isoformat()
+            task["result"] = result
+        elif status == "failed":
+            task["error"] = error
+        if status in ("completed", "failed"):
+            self.finished[task_id] = time.monotonic()
+            self.finished.move_to_end(task_id)
+
+    async def get(self, task_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        """작업 정보를 반환합니다. include_result가 False이면 결과를 제외합니다 (디스크의 결과를 읽지 않음)."""
+        self.evict()
+        task = self.tasks.get(task_id)
+        if task is None:
+            return None
+        if not include_result:
+            return {key: value for key, value in task.items() if key != "result"}
+        if task_id in self.spilled:
+            return {**task, "result": await asyncio.to_thread(self.load, task_id)}
+        return task
+
+    def get_status(self, task_id: str) -> Optional[str]:
+        """작업 상태만 반환합니다. 만료 작업 제거는 호출 측에서 evict()로 수행합니다."""
+        task = self.tasks.get(task_id)
+        return task["status"] if task else None
+
+    def spill(self, task_id: str, result: Any) -> Any:
+        """결과가 임계값보다 크면 압축 파일로 저장하고 메모리에서는 제외합니다. (스레드에서 실행)"""
+        if result is None or self.spill_threshold_bytes <= 0:
+            return result
+        try:
+            encoded = json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        except (TypeError, ValueError):
+            return result
+        if len(encoded) < self.spill_threshold_bytes:
+            return result
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            path = os.path.join(self.spill_dir, f"{task_id}.json.gz")
+            with gzip.open(path, "wb", compresslevel=6) as file:
+                file.write(encoded)
+        except OSError as e:
+            print(f"작업 결과 저장 중 오류 발생: {e}")
+            return result
+        self.spilled[task_id] = path
+        return None
+
+    def load(self, task_id: str) -> Any:
+        """압축 파일로 저장된 결과를 읽습니다. (스레드에서 실행)"""
+        path = self.spilled.get(task_id)
+        if path is None:
+            return None
+        try:
+            with gzip.open(path, "rb") as file:
+                return json.loads(file.read())
+        except (OSError, ValueError) as e:
+            print(f"작업 결과 로드 중 오류 발생: {e}")
+            return None
+
+    def remove(self, task_id: str) -> None:
+        self.tasks.pop(task_id, None)
+        self.finished.pop(task_id, None)
+        path = self.spilled.pop(task_id, None)
+        if path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def evict(self) -> None:
+        """만료된 작업과 상한을 넘는 오래된 종료 작업을 제거합니다."""
+        expire_before = time.monotonic() - self.ttl_seconds
+        while self.finished:
+            task_id, finished_at = next(iter(self.finished.items()))
+            if finished_at > expire_before and len(self.tasks) < self.max_tasks:
+                break
+            self.remove(task_id)
+
+class BatchStore:
+    """배치 분석 요청 저장소.
+
+    배치는 항목별 작업 ID만 보관하고, 진행 상황은 조회 시 작업 상태를 모아
+    계산합니다. TTL이 지나거나 개수가 상한을 넘으면 오래된 배치부터 제거합니다.
+    """
+
+    def __init__(self, max_batches: int, ttl_seconds: float):
+        self.max_batches = max_batches
+        self.ttl_seconds = ttl_seconds
+        # batch_id -> (생성 시각, 배치 정보), 생성 순서 유지
+        self.batches: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def init(self, batch_id: str, items: List[Dict[str, Any]]) -> None:
+        self.evict()
+        self.batches[batch_id] = (time.monotonic(), {
+            "created_at": datetime.utcnow().isoformat(),
+            "items": items
+        })
+
+    def get(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        self.evict()
+        entry = self.batches.get(batch_id)
+        return entry[1] if entry else None
+
+    def evict(self) -> None:
+        expire_before = time.monotonic() - self.ttl_seconds
+        while self.batches:
+            created_at, _ = next(iter(self.batches.values()))
+            if created_at > expire_before and len(self.batches) < self.max_batches:
+                break
+            self.batches.popitem(last=False)
+
+# 작업 상태를 저장하는 전역 저장소
+task_store = TaskStore(**app_config["task_store"])
+
+# 배치 요청을 저장하는 전역 저장소 (작업 저장소와 같은 보관 기간 사용)
+batch_store = BatchStore(app_config["task_store"]["max_tasks"], app_config["task_store"]["ttl_seconds"])
 
 def init_task_status(task_id: str) -> None:
     """새로운 작업의 상태를 초기화합니다."""
-    task_status[task_id] = {
-        "status": "pending",
-        "started_at": datetime.utcnow().isoformat(),
-        "completed_at": None,
-        "result": None,
-        "error": None
-    }
+    task_store.init(task_id)
 
-def update_task_status(task_id: str, status: str, result: Any = None, error: str = None) -> None:
+async def update_task_status(task_id: str, status: str, result: Any = None, error: str = None) -> None:
     """작업 상태를 업데이트합니다."""
-    if task_id in task_status:
-        task_status[task_id]["status"] = status
-        if status == "completed":
-            task_status[task_id]["completed_at"] = datetime.utcnow().isoformat()
-            task_status[task_id]["result"] = result
-        elif status == "failed":
-            task_status[task_id]["error"] = error
+    await task_store.update(task_id, status, result=result, error=error)
+
+def remove_task_status(task_id: str) -> None:
+    """작업 상태를 삭제합니다."""
+    task_store.remove(task_id)
 
-def get_task_status(task_id: str) -> Dict[str, Any]:
-    """작업 상태를 조회합니다."""
-    return task_status.get(task_id, {"status": "not_found"}) 
\ No newline at end of file
+async def get_task_status(task_id: str, include_result: bool = True) -> Dict[str, Any]:
+    """작업 상태를 조회합니다. 대기 중인 작업은 대기 순번과 대기 시간을 포함합니다.
+
+    include_result가 False이면 결과 없이 상태만 조회합니다.
+    """
+    task = await task_store.get(task_id, include_result=include_result)
+    if task is None:
+        return {"status": "not_found"}
+    if task["status"] == "pending":
+        queue_info = analysis_queue.get_queue_info(task_id)
+        if queue_info:
+            return {**task, **queue_info}
+    return task
+
+
+def init_batch_status(batch_id: str, items: List[Dict[str, Any]]) -> None:
+    """배치 상태를 초기화합니다. items는 항목별 elk_id와 task_id를 담습니다."""
+    batch_store.init(batch_id, items)
+
+def get_batch_status(batch_id: str) -> Dict[str, Any]:
+    """배치에 속한 작업들의 상태를 모아 진행 상황을 반환합니다."""
+    batch = batch_store.get(batch_id)
+    if batch is None:
+        return {"status": "not_found"}
+
+    counts = {"pending": 0, "processing": 0, "completed": 0, "failed": 0}
+    task_states: Dict[str, str] = {}
+    # 상태만 필요하므로 디스크에 저장된 결과는 읽지 않음
+    task_store.evict()
+    for item in batch["items"]:
+        task_id = item["task_id"]
+        if task_id not in task_states:
+            # 보관 기간이 지나 제거된 작업은 만료로 표시
+            task_states[task_id] = task_store.get_status(task_id) or "expired"
+            counts[task_states[task_id]] = counts.get(task_states[task_id], 0) + 1
+
+    total = len(task_states)
+    finished = total - counts["pending"] - counts["processing"]
+    if finished == total:
+        status = "completed"
+    elif counts["pending"] == total:
+        status = "pending"
+    else:
+        status = "processing"
+
+    return {
+        "batch_id": batch_id,
+        "status": status,
+        "created_at": batch["created_at"],
+        "total_items": len(batch["items"]),
+        "unique_tasks": total,
+        "counts": counts,
+        "progress": round(finished / total, 3) if total else 1.0,
+        "items": [{**item, "status": task_states[item["task_id"]]} for item in batch["items"]]
+    }
@@ -0,0 +1,104 @@
+import threading
+from typing import Any, Dict, Mapping, Optional
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from app.utils.metrics import LLM_TOKENS
+
+TOKEN_KINDS = ("prompt_tokens", "completion_tokens", "cached_tokens", "total_tokens")
+
+def _empty_usage() -> Dict[str, int]:
+    return {"calls": 0, **{kind: 0 for kind in TOKEN_KINDS}}
+
+def _number(value: Any) -> int:
+    return value if isinstance(value, int) and value > 0 else 0
+
+def _usage_from_llm_output(token_usage: Mapping[str, Any]) -> Dict[str, int]:
+    """llm_output의 토큰 사용량 (OpenAI: prompt_tokens, Anthropic: input_tokens 형식)."""
+    prompt_tokens = _number(token_usage.get("prompt_tokens")) or _number(token_usage.get("input_tokens"))
+    completion_tokens = _number(token_usage.get("completion_tokens")) or _number(token_usage.get("output_tokens"))
+    prompt_details = token_usage.get("prompt_tokens_details") or {}
+    cached_tokens = _number(prompt_details.get("cached_tokens")) or _number(token_usage.get("cache_read_input_tokens"))
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cached_tokens": cached_tokens,
+        "total_tokens": _number(token_usage.get("total_tokens")) or prompt_tokens + completion_tokens,
+    }
+
+def extract_token_usage(response: LLMResult) -> Optional[Dict[str, int]]:
+    """LLM 응답에서 토큰 사용량을 꺼냅니다. 제공자가 알려주지 않으면 None.
+
+    채팅 모델 메시지의 usage_metadata를 우선 사용하고, 없으면 llm_output의 token_usage/usage를 사용합니다.
+    cached_tokens는 제공자 프롬프트 캐시에서 읽은 입력 토큰 수입니다 (prompt_tokens에 포함).
+    """
+    usage = {kind: 0 for kind in TOKEN_KINDS}
+    found = False
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if not metadata:
+                continue
+            found = True
+            details = metadata.get("input_token_details") or {}
+            usage["prompt_tokens"] += _number(metadata.get("input_tokens"))
+            usage["completion_tokens"] += _number(metadata.get("output_tokens"))
+            usage["cached_tokens"] += _number(details.get("cache_read"))
+            usage["total_tokens"] += _number(metadata.get("total_tokens")) or _number(metadata.get("input_tokens")) + _number(metadata.get("output_tokens"))
+    if found:
+        return usage
+
+    llm_output = response.llm_output or {}
+    token_usage = llm_output.get("token_usage") or llm_output.get("usage")
+    if isinstance(token_usage, Mapping) and token_usage:
+        return _usage_from_llm_output(token_usage)
+    return None
+
+class TokenUsage:
+    """한 작업의 LLM 토큰 사용량을 리포트 타입별로 집계합니다. 집계할 때 메트릭에도 기록합니다."""
+
+    def __init__(self, provider: str, model: str):
+        self.provider = provider
+        self.model = model
+        self.by_report_type: Dict[str, Dict[str, int]] = {}
+        self.lock = threading.Lock()
+
+    def add(self, report_type: str, usage: Optional[Dict[str, int]]) -> None:
+        with self.lock:
+            totals = self.by_report_type.setdefault(report_type, _empty_usage())
+            totals["calls"] += 1
+            for kind in TOKEN_KINDS:
+                totals[kind] += usage.get(kind, 0) if usage else 0
+        if usage:
+            # total은 prompt + completion이므로 메트릭에는 기록하지 않음
+            for kind in ("prompt_tokens", "completion_tokens", "cached_tokens"):
+                if usage.get(kind):
+                    LLM_TOKENS.inc(usage[kind], provider=self.provider, model=self.model, report_type=report_type, kind=kind.replace("_tokens", ""))
+
+    def callback(self, report_type: str) -> "TokenUsageCallback":
+        """report_type으로 집계하는 LangChain 콜백 핸들러를 만듭니다."""
+        return TokenUsageCallback(self, report_type)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self.lock:
+            by_report_type = {report_type: dict(totals) for report_type, totals in self.by_report_type.items()}
+        total = _empty_usage()
+        for totals in by_report_type.values():
+            for key, value in totals.items():
+                total[key] += value
+        return {"provider": self.provider, "model": self.model, **total, "by_report_type": by_report_type}
+
+class TokenUsageCallback(BaseCallbackHandler):
+    """LLM 호출이 끝날 때마다 응답의 토큰 사용량을 TokenUsage에 더합니다.
+
+    실패한 시도(재시도 전 오류)와 응답 캐시에서 가져온 결과는 토큰을 쓰지 않으므로 집계하지 않습니다.
+    """
+
+    # 이벤트 루프 스레드에서 바로 실행 (스레드 풀로 넘기지 않음)
+    run_inline = True
+
+    def __init__(self, usage: TokenUsage, report_type: str):
+        self.usage = usage
+        self.report_type = report_type
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        self.usage.add(self.report_type, extract_token_usage(response))
@@ -0,0 +1,42 @@
+from functools import lru_cache
+from typing import Any, Optional
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken이 없으면 문자 수로 추정
+    tiktoken = None
+
+@lru_cache(maxsize=None)
+def _get_encoding(provider: str, model: str) -> Optional[Any]:
+    """OpenAI 모델의 tiktoken 인코딩을 반환합니다. 사용할 수 없으면 None."""
+    if tiktoken is None or provider != "openai":
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        try:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            print(f"tiktoken 인코딩 로드 실패, 추정값 사용: {e}")
+            return None
+    except Exception as e:
+        # 인코딩 파일을 내려받지 못한 경우 등
+        print(f"tiktoken 인코딩 로드 실패, 추정값 사용: {e}")
+        return None
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 토큰 수를 추정합니다.
+
+    ASCII는 4글자당 1토큰, 한글 등 그 외 문자는 1글자당 1토큰으로 계산합니다.
+    """
+    non_ascii = sum(1 for char in text if ord(char) > 127)
+    return (len(text) - non_ascii + 3) // 4 + non_ascii
+
+def count_tokens(text: str, provider: str, model: str) -> int:
+    """제공자/모델 기준 토큰 수를 반환합니다 (OpenAI는 tiktoken, 그 외는 추정값)."""
+    if not text:
+        return 0
+    encoding = _get_encoding(provider, model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
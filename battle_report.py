@@ -2,86 +2,165 @@
 # 전투 데이터 분석 및 리포트 생성 모듈
 
 from app.utils.report_utils import (
-    process_attack_event, 
-    process_state_info, 
-    process_character_status,
-    convert_and_sort_data,
-    process_eff_info,
-    get_current_states_summary
+    format_attack_info,
+    process_state_info,
+    format_status,
+    compare_status_values,
+    format_eff_info,
+    StateTracker
 )
-from typing import Union, Any
+from app.utils.battle_record import (
+    MISSING,
+    AttackEvent,
+    StateInfoEvent,
+    CharacterState,
+    Turn,
+    iter_turns,
+    parse_turn,
+    character_uid
+)
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 리포트 타입별로 포함되는 섹션 (턴/액션 헤더는 모든 리포트에 포함)
+REPORT_SECTIONS: Dict[str, frozenset] = {
+    "status": frozenset({"status"}),
+    "hp": frozenset({"hp"}),
+    "attack": frozenset({"attack"}),
+    "effect": frozenset({"effect"}),
+    "full": frozenset({"status", "hp", "attack", "effect"}),
+}
+
+class _ReportViews:
+    """한 번의 순회 결과를 여러 리포트 타입에 분배합니다."""
+
+    def __init__(self, report_types: Iterable[Optional[str]]):
+        self.reports: Dict[Optional[str], List[str]] = {}
+        self.by_section: Dict[str, List[List[str]]] = {}
+        for report_type in report_types:
+            if report_type in self.reports:
+                continue
+            report = ["◆ Battle Analysis Report ({report_type})\n"]
+            self.reports[report_type] = report
+            for section in REPORT_SECTIONS.get(report_type, ()):
+                self.by_section.setdefault(section, []).append(report)
+
+    def wants(self, section: str) -> bool:
+        return section in self.by_section
+
+    def emit(self, text: str, section: Optional[str] = None) -> None:
+        if not text:
+            return
+        targets = self.reports.values() if section is None else self.by_section.get(section, ())
+        for report in targets:
+            report.append(text)
+
+class BattleReportBuilder:
+    """턴을 하나씩 받아 요청된 모든 타입의 리포트를 만듭니다. 받은 턴은 보관하지 않습니다."""
+
+    def __init__(self, report_types: Iterable[Optional[str]]):
+        self.views = _ReportViews(report_types)
+        self.characters = {}
+        # 리포트 생성마다 별도의 상태 추적기 사용
+        self.tracker = StateTracker()
+        self.current_turn = 0
+
+    def add_turn(self, turn: Turn) -> None:
+        if turn.turn_index is not MISSING:
+            self.current_turn = turn.turn_index
+        _process_turn(turn, self.characters, self.views, self.tracker)
+
+    def finish(self) -> Dict[Optional[str], str]:
+        if "full" in self.views.reports:
+            report = self.views.reports["full"]
+            report.extend(["\n◆ Battle Summary\n",f"• Total Turns: {self.current_turn}\n","• Participating Characters:\n"])
+            for code, info in self.characters.items():
+                report.append(f"  ◦ {code} (ID: {info['id']})\n")
+
+        return {report_type: "".join(report) for report_type, report in self.views.reports.items()}
+
+def generate_battle_reports(data, report_types: Iterable[Optional[str]]) -> Dict[Optional[str], str]:
+    """전투 데이터를 한 번만 순회하여 요청된 모든 타입의 리포트를 생성합니다.
+
+    data는 원본 턴 목록 또는 battle_record.parse_battle_record로 변환한 Turn 목록입니다.
+    """
+    builder = BattleReportBuilder(report_types)
+    for turn in iter_turns(data):
+        builder.add_turn(turn)
+    return builder.finish()
 
 def generate_battle_report(data, report_type=None):
-    report = ["◆ Battle Analysis Report ({report_type})\n"]
-    characters = {}
-    current_turn = 0
-    
-    for turn_data in data:
-        current_turn = turn_data.get("turn_index", current_turn)
-        report.extend(process_battle_events(turn_data, characters, report_type))
-    
-    if report_type == "full":
-        report.extend(["\n◆ Battle Summary\n",f"• Total Turns: {current_turn}\n","• Participating Characters:\n"])
-        for code, info in characters.items():
-            report.append(f"  ◦ {code} (ID: {info['id']})\n")
-    
-    return "".join(report)
-
-def process_battle_events(turn_data: dict, characters: dict, report_type: str) -> list[str]:
-    report = []
-    
-    if "turn_index" in turn_data:
-        report.append(f"\n## Turn {turn_data['turn_index']}\n")
-    
-    if "history" in turn_data:
-        for sub_history in turn_data["history"]:
-            if "sub_owner_code" in sub_history:
-                report.append(f"# {sub_history['sub_owner_code']} Action ({sub_history['sub_type']})\n")
-
-                # Add status summary
-                if report_type == "full" or report_type == "effect":
-                    state_summary = get_current_states_summary()
-                    if state_summary:
-                        report.append(state_summary)
-            
-            if "history" in sub_history:
-                for event in sub_history["history"]:
-                    event_type = event.get("type", "")
-                    
-                    if event_type == "attack":
-                        report.append(process_attack_event(event, report_type))
-                    
-                    elif event_type == "sub_state_info":
-                        state = event.get("state", "")
-                        report.append(process_state_info(state, report_type))
-                        
-                        # Process allies
-                        if "frineds" in event:  # Keep typo
-                            friends_data = convert_and_sort_data(event["frineds"])
-                            for char_info in friends_data:
-                                report.extend(process_character_status(
-                                    char_info.get("code", ""),
-                                    char_info,
-                                    characters,
-                                    is_friend=True,
-                                    report_type=report_type
-                                ))
-                        
-                        # Process enemies
-                        if "enemies" in event:
-                            enemies_data = convert_and_sort_data(event["enemies"])
-                            for enemy_info in enemies_data:
-                                report.extend(process_character_status(
-                                    enemy_info.get("code", ""),
-                                    enemy_info,
-                                    characters,
-                                    is_friend=False,
-                                    report_type=report_type
-                                ))
-
-                    elif event_type in ["add_state", "remove_state", "immune", "anti_skill_effect"]:
-                        eff_report = process_eff_info(event, report_type)
-                        if eff_report:
-                            report.append(eff_report)
-    
-    return report
\ No newline at end of file
+    return generate_battle_reports(data, [report_type])[report_type]
+
+def process_battle_events(turn_data: dict, characters: dict, report_type: str, tracker: Optional[StateTracker] = None) -> list[str]:
+    """한 턴의 리포트 줄을 반환합니다. 여러 턴에 걸쳐 상태를 이어가려면 같은 tracker를 넘깁니다."""
+    views = _ReportViews([report_type])
+    turn = turn_data if isinstance(turn_data, Turn) else parse_turn(turn_data)
+    _process_turn(turn, characters, views, tracker if tracker is not None else StateTracker())
+    # 리포트 제목 줄은 제외하고 턴 이벤트만 반환
+    return views.reports[report_type][1:]
+
+def _process_turn(turn: Turn, characters: dict, views: _ReportViews, tracker: StateTracker) -> None:
+    if turn.turn_index is not MISSING:
+        views.emit(f"\n## Turn {turn.turn_index}\n")
+
+    wants_attack = views.wants("attack")
+    wants_status = views.wants("status")
+    wants_effect = views.wants("effect")
+    wants_characters = wants_status or views.wants("hp")
+
+    for action in turn.actions:
+        if action.owner_code is not MISSING:
+            views.emit(f"# {action.owner_code} Action ({action.sub_type})\n")
+
+            # Add status summary
+            if wants_effect:
+                views.emit(tracker.summary(), "effect")
+
+        for event in action.events:
+            if type(event) is AttackEvent:
+                if wants_attack:
+                    views.emit(format_attack_info(
+                        event.from_code, event.from_uid, event.target_code, event.target_uid,
+                        event.dec_hp, event.eff, event.critical, event.miss
+                    ), "attack")
+
+            elif type(event) is StateInfoEvent:
+                if wants_status:
+                    views.emit(process_state_info(event.state, "status"), "status")
+
+                if wants_characters:
+                    # Process allies
+                    if event.friends is not None:
+                        _process_characters(event.friends, characters, views)
+
+                    # Process enemies
+                    if event.enemies is not None:
+                        _process_characters(event.enemies, characters, views)
+
+            elif wants_effect:
+                views.emit(format_eff_info(event.type, event.target_code, event.target_uid, event.state, tracker), "effect")
+
+def _process_characters(states: Tuple[CharacterState, ...], characters: dict, views: _ReportViews) -> None:
+    wants_status = views.wants("status")
+    wants_hp = views.wants("hp")
+    for state in states:
+        code = state.code
+        # 캐릭터 정보 저장
+        info = characters.get(code)
+        if info is None:
+            info = characters[code] = {"id": "" if state.id is MISSING else state.id, "code": code, "status": {}}
+
+        # 캐릭터별로 STATUS 다음 HP 순서를 유지
+        if wants_status and state.status is not MISSING:
+            old_status = info["status"]
+            info["status"] = state.status
+
+            if not old_status and state.status:
+                views.emit(f"- STATUS INIT: {code}(UID:{character_uid(state)})\n{format_status(state.status)}\n", "status")
+            elif old_status != state.status:
+                status_changes = compare_status_values(old_status, state.status)
+                if status_changes:
+                    views.emit(f"- STATUS CHANGE: {code}(UID:{character_uid(state)}) {status_changes}\n", "status")
+
+        if wants_hp and state.hp is not MISSING:
+            views.emit(f"- HP INFO: {code}(UID:{character_uid(state)}) [ {state.hp} ]\n", "hp")
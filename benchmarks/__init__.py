@@ -0,0 +1,4 @@
+"""리포트 생성/분석 경로의 벤치마크 도구.
+
+python -m benchmarks.run_benchmarks 로 실행합니다.
+"""
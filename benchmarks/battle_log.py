@@ -0,0 +1,125 @@
+import base64
+import json
+import random
+import zlib
+from typing import Any, Dict, List, Optional, Set
+
+# 상태 효과 이벤트에 쓰는 상태 이름
+STATES = ("stun", "burn", "poison", "freeze", "silence", "atk_up", "def_down", "shield")
+# 이벤트 종류별 비율 (attack이 가장 많고, 리포트에 쓰이지 않는 이벤트도 섞음)
+EVENT_WEIGHTS = {
+    "attack": 45,
+    "sub_state_info": 15,
+    "add_state": 15,
+    "remove_state": 10,
+    "immune": 5,
+    "anti_skill_effect": 5,
+    "heal": 5,
+}
+
+def _character_code(uid: int) -> str:
+    return f"{'hero' if uid < 100 else 'monster'}_{uid:03d}"
+
+def generate_battle_log(
+    seed: int = 1,
+    turns: int = 30,
+    characters: int = 5,
+    actions_per_turn: int = 3,
+    events_per_action: int = 4,
+    divergent_turns: Optional[Set[int]] = None
+) -> List[Dict[str, Any]]:
+    """시드로 재현 가능한 전투 기록(턴 목록)을 생성합니다.
+
+    characters는 한 편의 캐릭터 수입니다 (아군 uid 1부터, 적군 uid 101부터).
+    divergent_turns에 있는 턴은 같은 시드의 다른 기록과 피해량/면역 상태만 달라지고,
+    나머지 턴은 그대로 같습니다.
+    """
+    rng = random.Random(seed)
+    divergent_turns = divergent_turns or set()
+    friends = list(range(1, characters + 1))
+    enemies = list(range(101, 101 + characters))
+    hp = {uid: 10000 for uid in friends + enemies}
+    status = {uid: {"atk": 1000 + uid, "def": 500, "spd": 100} for uid in friends + enemies}
+    event_types = list(EVENT_WEIGHTS)
+    weights = list(EVENT_WEIGHTS.values())
+
+    battle_log = []
+    for turn_index in range(1, turns + 1):
+        diverge = turn_index in divergent_turns
+        history = []
+        for _ in range(actions_per_turn):
+            owner = rng.choice(friends + enemies)
+            opponents = enemies if owner in friends else friends
+            events = []
+            for event_type in rng.choices(event_types, weights, k=events_per_action):
+                target = rng.choice(opponents)
+                if event_type == "attack":
+                    damage = rng.randint(0, 1500)
+                    hp[target] = max(0, hp[target] - damage)
+                    event = {
+                        "type": "attack",
+                        "from_uid": owner,
+                        "from_code": _character_code(owner),
+                        "target_uid": target,
+                        "target_code": _character_code(target),
+                        # 다른 턴에 영향을 주지 않도록 기록되는 값만 바꿈
+                        "dec_hp": damage + 1 if diverge else damage,
+                        "critical": rng.random() < 0.2,
+                        "miss": rng.random() < 0.05,
+                    }
+                    if rng.random() < 0.3:
+                        event["eff"] = rng.choice(("Fire", "Ice", "Pierce"))
+                elif event_type == "sub_state_info":
+                    changed = rng.choice(friends + enemies)
+                    status[changed] = dict(status[changed], atk=status[changed]["atk"] + rng.randint(-50, 50))
+                    event = {
+                        "type": "sub_state_info",
+                        "state": rng.choice(("turn_start", "turn_end", "skill")),
+                        # 아군은 uid를 키로 하는 dict, 적군은 리스트 (실제 로그 형식, 키 오타 유지)
+                        "frineds": {str(uid): {"code": _character_code(uid), "hp": hp[uid], "status": status[uid]} for uid in friends},
+                        "enemies": [{"id": uid, "code": _character_code(uid), "hp": hp[uid], "status": status[uid]} for uid in reversed(enemies)],
+                    }
+                elif event_type == "heal":
+                    event = {"type": "heal", "target_uid": target, "value": rng.randint(100, 500)}
+                else:
+                    state = rng.choice(STATES)
+                    if diverge and event_type == "immune":
+                        state = STATES[(STATES.index(state) + 1) % len(STATES)]
+                    event = {
+                        "type": event_type,
+                        "target_uid": target,
+                        "target_code": _character_code(target),
+                        "state": state,
+                    }
+                events.append(event)
+            history.append({
+                "sub_owner_code": _character_code(owner),
+                "sub_type": rng.choice(("normal", "skill", "ultimate")),
+                "history": events,
+            })
+        battle_log.append({"turn_index": turn_index, "history": history})
+    return battle_log
+
+def encode_battle_log(battle_log: List[Dict[str, Any]]) -> str:
+    """전투 기록을 실제 요청과 같이 zlib 압축 후 base64로 인코딩합니다."""
+    return base64.b64encode(zlib.compress(json.dumps(battle_log).encode("utf-8"))).decode("ascii")
+
+def generate_battle_data(
+    seed: int = 1,
+    turns: int = 30,
+    characters: int = 5,
+    actions_per_turn: int = 3,
+    events_per_action: int = 4,
+    divergent_turns: Optional[Set[int]] = None
+) -> Dict[str, Any]:
+    """유저/서버 기록이 담긴 battle_data({"result_info": {...}})를 생성합니다.
+
+    두 기록은 같은 시드로 만들어지며, divergent_turns의 턴만 유저 기록이 달라집니다.
+    """
+    settings = dict(seed=seed, turns=turns, characters=characters, actions_per_turn=actions_per_turn, events_per_action=events_per_action)
+    return {
+        "result_info": {
+            "user_record_minimal": encode_battle_log(generate_battle_log(divergent_turns=divergent_turns, **settings)),
+            "verify_record_minimal": encode_battle_log(generate_battle_log(**settings)),
+        }
+    }
@@ -0,0 +1,336 @@
+"""분석 서버 부하 테스트.
+
+설정한 도착률로 POST /api/analysis를 보내고 GET /api/analysis/{task_id}로 상태를 확인하며,
+Battle Verifier 대역 서버를 띄워 /api/report_gen_finish 콜백을 받습니다.
+처리량, 콜백까지 걸린 시간(p50/p95/p99), 이벤트 루프 지연, RSS를 시간대별로 기록합니다.
+
+사용법:
+    # 같은 프로세스에서 서버를 띄워 측정 (이벤트 루프 지연/RSS가 서버 값)
+    python -m benchmarks.load_test --in-process --rate 5 --duration 60 --output load.json
+
+    # 이미 실행 중인 서버에 부하 (서버는 콜백을 대역 서버로 보내도록 실행)
+    BATTLE_VERIFIER_HOST=127.0.0.1 BATTLE_VERIFIER_PORT=3900 uvicorn main:app --port 8000
+    python -m benchmarks.load_test --base-url http://127.0.0.1:8000 --verifier-port 3900 --server-pid <PID>
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import resource
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+import uvicorn
+from fastapi import FastAPI
+from benchmarks.battle_log import generate_battle_data
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+def percentiles(values: List[float]) -> Dict[str, Any]:
+    """p50/p95/p99/최대값(ms)을 계산합니다 (nearest-rank)."""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def rank(percent: float) -> float:
+        index = max(int(len(ordered) * percent / 100 + 0.999999) - 1, 0)
+        return round(ordered[min(index, len(ordered) - 1)] * 1000, 1)
+
+    return {
+        "count": len(ordered),
+        "p50_ms": rank(50),
+        "p95_ms": rank(95),
+        "p99_ms": rank(99),
+        "max_ms": round(ordered[-1] * 1000, 1),
+    }
+
+def read_rss_bytes(pid: Optional[int] = None) -> Optional[int]:
+    """프로세스의 현재 RSS(바이트)를 읽습니다. /proc가 없으면 현재 프로세스의 최대 RSS를 반환합니다."""
+    try:
+        with open(f"/proc/{pid or 'self'}/status", "r") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if pid is None:
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS는 바이트, Linux는 KB 단위
+        return usage if sys.platform == "darwin" else usage * 1024
+    return None
+
+class LoadTestState:
+    """요청별 시각과 콜백 수신 결과를 모읍니다."""
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.submitted = 0
+        self.rejected: Dict[str, int] = {}
+        self.submit_latencies: List[float] = []
+        self.submitted_at: Dict[str, float] = {}  # task_id -> 요청 시작 시각
+        self.callback_at: Dict[str, float] = {}  # task_id -> 콜백 수신 시각
+        self.callback_status: Dict[str, str] = {}  # task_id -> 콜백의 status
+        self.polled_at: Dict[str, float] = {}  # task_id -> 폴링으로 종료를 확인한 시각
+        self.timeline: List[Dict[str, Any]] = []
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def record_callback(self, payload: Dict[str, Any]) -> None:
+        # 요청 응답보다 콜백이 먼저 올 수 있으므로 모두 기록하고, 집계 시 이번 요청만 셈
+        task_id = payload.get("task_id")
+        if task_id is None or task_id in self.callback_at:
+            return
+        self.callback_at[task_id] = time.monotonic()
+        self.callback_status[task_id] = payload.get("status", "unknown")
+
+    def callbacks(self) -> List[str]:
+        """이번 테스트에서 보낸 요청 중 콜백을 받은 task_id 목록."""
+        return [task_id for task_id in self.submitted_at if task_id in self.callback_at]
+
+    def in_flight(self) -> int:
+        return sum(1 for task_id in self.submitted_at if task_id not in self.callback_at)
+
+def create_verifier_app(state: LoadTestState) -> FastAPI:
+    """콜백을 받기만 하는 Battle Verifier 대역 서버를 만듭니다."""
+    verifier = FastAPI(title="Battle Verifier stand-in")
+
+    @verifier.post("/api/report_gen_finish")
+    async def report_gen_finish(payload: dict):
+        state.record_callback(payload)
+        return {"response": "ok"}
+
+    @verifier.post("/api/report_gen_finish_batch")
+    async def report_gen_finish_batch(payload: dict):
+        for callback in payload.get("callbacks", []):
+            state.record_callback(callback)
+        return {"response": "ok"}
+
+    return verifier
+
+async def start_server(app: Any, host: str, port: int) -> Tuple[uvicorn.Server, asyncio.Task]:
+    """현재 이벤트 루프에서 uvicorn 서버를 실행하고, 요청을 받을 수 있을 때까지 기다립니다."""
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="on"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        if serving.done():
+            # 포트 사용 중 등으로 시작하지 못함
+            serving.result()
+            raise RuntimeError(f"서버를 시작하지 못했습니다: {host}:{port}")
+        await asyncio.sleep(0.05)
+    return server, serving
+
+async def stop_server(server: Tuple[uvicorn.Server, asyncio.Task]) -> None:
+    server[0].should_exit = True
+    await server[1]
+
+def build_request_bodies(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """시드가 다른 요청 본문을 미리 만들어 둡니다 (부하 생성 중 데이터 생성 비용 제외)."""
+    divergent_turns = set(range(args.divergent_every, args.turns + 1, args.divergent_every)) if args.divergent_every > 0 else set()
+    bodies = []
+    for variant in range(args.payload_variants):
+        battle_data = generate_battle_data(
+            seed=args.seed + variant,
+            turns=args.turns,
+            characters=args.characters,
+            events_per_action=args.events,
+            divergent_turns=divergent_turns
+        )
+        bodies.append({
+            "provider": args.provider,
+            "model": args.model,
+            "temperature": 0.0,
+            "battle_data": json.dumps(battle_data),
+        })
+    return bodies
+
+async def submit_and_poll(client: httpx.AsyncClient, state: LoadTestState, body: Dict[str, Any], args: argparse.Namespace) -> None:
+    started = time.monotonic()
+    state.submitted += 1
+    try:
+        response = await client.post("/api/analysis", json=body)
+    except httpx.HTTPError as e:
+        state.rejected[type(e).__name__] = state.rejected.get(type(e).__name__, 0) + 1
+        return
+    state.submit_latencies.append(time.monotonic() - started)
+    if response.status_code != 200:
+        state.rejected[str(response.status_code)] = state.rejected.get(str(response.status_code), 0) + 1
+        return
+
+    task_id = response.json()["task_id"]
+    state.submitted_at[task_id] = started
+    if args.poll_interval <= 0:
+        return
+
+    deadline = started + args.task_timeout
+    while time.monotonic() < deadline:
+        await asyncio.sleep(args.poll_interval)
+        try:
+            status = (await client.get(f"/api/analysis/{task_id}")).json().get("status")
+        except (httpx.HTTPError, ValueError):
+            continue
+        if status in TERMINAL_STATUSES:
+            state.polled_at[task_id] = time.monotonic()
+            return
+
+async def generate_load(client: httpx.AsyncClient, state: LoadTestState, bodies: List[Dict[str, Any]], args: argparse.Namespace) -> List[asyncio.Task]:
+    """설정한 도착률로 요청을 보냅니다 (응답을 기다리지 않는 open-loop). 요청/상태 조회 태스크를 반환합니다."""
+    rng = random.Random(args.seed)
+    tasks = []
+    next_at = time.monotonic()
+    end_at = next_at + args.duration
+    index = 0
+    while next_at < end_at and (args.requests <= 0 or index < args.requests):
+        await asyncio.sleep(max(next_at - time.monotonic(), 0))
+        body = dict(bodies[index % len(bodies)], elk_id=f"load-{index}")
+        tasks.append(asyncio.create_task(submit_and_poll(client, state, body, args)))
+        index += 1
+        next_at += rng.expovariate(args.rate) if args.arrival == "poisson" else 1.0 / args.rate
+    return tasks
+
+async def sample_metrics(client: httpx.AsyncClient, state: LoadTestState, args: argparse.Namespace, server_pid: Optional[int]) -> None:
+    """이벤트 루프 지연, /api/ping 응답 시간, RSS를 주기적으로 기록합니다."""
+    while True:
+        expected = time.monotonic() + args.sample_interval
+        await asyncio.sleep(args.sample_interval)
+        loop_lag = max(time.monotonic() - expected, 0.0)
+
+        ping_started = time.monotonic()
+        try:
+            await client.post("/api/ping", json={})
+            ping = time.monotonic() - ping_started
+        except httpx.HTTPError:
+            ping = None
+
+        state.timeline.append({
+            "t": round(state.elapsed(), 2),
+            "loop_lag_ms": round(loop_lag * 1000, 2),
+            "ping_ms": round(ping * 1000, 2) if ping is not None else None,
+            "rss_bytes": read_rss_bytes(server_pid),
+            "submitted": state.submitted,
+            "in_flight": state.in_flight(),
+            "callbacks": len(state.callbacks()),
+        })
+
+async def wait_for_callbacks(state: LoadTestState, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while state.in_flight() and time.monotonic() < deadline:
+        await asyncio.sleep(0.2)
+
+def build_report(state: LoadTestState, args: argparse.Namespace, load_seconds: float) -> Dict[str, Any]:
+    callbacks = state.callbacks()
+    callback_times = [state.callback_at[task_id] - state.submitted_at[task_id] for task_id in callbacks]
+    callback_status: Dict[str, int] = {}
+    for task_id in callbacks:
+        callback_status[state.callback_status[task_id]] = callback_status.get(state.callback_status[task_id], 0) + 1
+    poll_times = [state.polled_at[task_id] - started for task_id, started in state.submitted_at.items() if task_id in state.polled_at]
+    total_seconds = state.elapsed()
+    # 처리량은 부하 시작부터 마지막 콜백까지를 기준으로 계산
+    busy_seconds = max((state.callback_at[task_id] for task_id in callbacks), default=state.started_at) - state.started_at
+    lags = [sample["loop_lag_ms"] for sample in state.timeline]
+    rss = [sample["rss_bytes"] for sample in state.timeline if sample["rss_bytes"] is not None]
+    return {
+        "params": {key: value for key, value in vars(args).items() if key != "output"},
+        "summary": {
+            "load_seconds": round(load_seconds, 2),
+            "total_seconds": round(total_seconds, 2),
+            "submitted": state.submitted,
+            "accepted": len(state.submitted_at),
+            "rejected": state.rejected,
+            "callbacks": len(callbacks),
+            "callback_status": callback_status,
+            "missing_callbacks": state.in_flight(),
+            # 이번 테스트와 관계없는 콜백 (이전 실행의 아웃박스에 남아 있던 콜백 등)
+            "unknown_callbacks": len(state.callback_at) - len(callbacks),
+            "throughput_per_second": round(len(callbacks) / busy_seconds, 3) if busy_seconds > 0 else None,
+            "submit_latency": percentiles(state.submit_latencies),
+            "time_to_callback": percentiles(callback_times),
+            "time_to_poll_completion": percentiles(poll_times),
+            "loop_lag_max_ms": max(lags) if lags else None,
+            "rss_max_bytes": max(rss) if rss else None,
+        },
+        "timeline": state.timeline,
+    }
+
+async def run_load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    state = LoadTestState()
+    bodies = build_request_bodies(args)
+    verifier = await start_server(create_verifier_app(state), args.verifier_host, args.verifier_port)
+
+    service = None
+    base_url = args.base_url
+    server_pid = args.server_pid
+    if args.in_process:
+        # 서버 설정을 읽기 전에 콜백 대상과 LLM 캐시 설정을 지정
+        os.environ["BATTLE_VERIFIER_HOST"] = args.verifier_host
+        os.environ["BATTLE_VERIFIER_PORT"] = str(args.verifier_port)
+        os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+        from main import app
+        service = await start_server(app, "127.0.0.1", args.port)
+        base_url = f"http://127.0.0.1:{args.port}"
+        server_pid = None
+
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.request_timeout, limits=limits) as client:
+        state.started_at = load_started = time.monotonic()
+        sampler = asyncio.create_task(sample_metrics(client, state, args, server_pid))
+        requests = await generate_load(client, state, bodies, args)
+        load_seconds = time.monotonic() - load_started
+        await asyncio.gather(*requests)
+        await wait_for_callbacks(state, args.drain_timeout)
+        sampler.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await sampler
+
+    if service is not None:
+        await stop_server(service)
+    await stop_server(verifier)
+    return build_report(state, args, load_seconds)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="분석 서버 부하 테스트")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="대상 서버 주소 (--in-process면 무시)")
+    parser.add_argument("--in-process", action="store_true", help="같은 프로세스에서 서버를 실행")
+    parser.add_argument("--port", type=int, default=8765, help="--in-process 서버 포트")
+    parser.add_argument("--server-pid", type=int, help="RSS를 측정할 외부 서버 프로세스 ID")
+    parser.add_argument("--verifier-host", default="127.0.0.1")
+    parser.add_argument("--verifier-port", type=int, default=3900)
+    parser.add_argument("--rate", type=float, default=2.0, help="초당 요청 수")
+    parser.add_argument("--arrival", choices=("poisson", "constant"), default="poisson")
+    parser.add_argument("--duration", type=float, default=30.0, help="요청을 보내는 시간(초)")
+    parser.add_argument("--requests", type=int, default=0, help="최대 요청 수 (0이면 제한 없음)")
+    parser.add_argument("--provider", default="mock")
+    parser.add_argument("--model", default="load-test")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--characters", type=int, default=5)
+    parser.add_argument("--events", type=int, default=4)
+    parser.add_argument("--divergent-every", type=int, default=10)
+    parser.add_argument("--payload-variants", type=int, default=8, help="미리 만들어 둘 서로 다른 전투 데이터 수")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="상태 조회 주기(초, 0이면 조회 안 함)")
+    parser.add_argument("--task-timeout", type=float, default=300.0, help="작업별 최대 상태 조회 시간(초)")
+    parser.add_argument("--drain-timeout", type=float, default=120.0, help="요청 종료 후 콜백을 기다리는 시간(초)")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="지연/RSS 기록 주기(초)")
+    parser.add_argument("--request-timeout", type=float, default=30.0)
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--output", help="결과 JSON 파일 경로 (없으면 표준 출력)")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    # 서버 로그가 결과 JSON에 섞이지 않도록 표준 에러로 보냄
+    with contextlib.redirect_stdout(sys.stderr):
+        result = asyncio.run(run_load_test(args))
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+        print(f"부하 테스트 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""리포트 생성/분석 경로의 단계별 소요 시간을 측정합니다.
+
+사용법:
+    python -m benchmarks.run_benchmarks --turns 100 --repeat 5 --output bench.json
+
+결과는 JSON으로 출력되며, 커밋별로 저장해 두고 비교할 수 있습니다.
+LangChainService.run은 실제 LLM 대신 mock 제공자 모델(규칙 기반 판정)로 측정합니다.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+# 앱 설정을 읽기 전에 외부 호출/캐시가 측정에 끼어들지 않도록 설정
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+os.environ.setdefault("RATE_LIMIT_RPM", "0")
+
+from battle_report import generate_battle_report
+from app.services.langchain_service import LangChainService
+from app.services.mock_llm import MockChatModel
+from app.utils.app_utils import decode64_and_decompress, make_analysis_data, split_turns
+from benchmarks.battle_log import generate_battle_data
+
+REPORT_TYPES = ["status", "hp", "attack", "effect", "full"]
+# LangChainService.analyze_reports가 분석하는 리포트 타입 (effect는 리포트 생성만 측정)
+ANALYZED_REPORT_TYPES = ["status", "hp", "attack", "full"]
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def summarize_timings(timings: List[float]) -> Dict[str, Any]:
+    return {
+        "repeat": len(timings),
+        "min_ms": round(min(timings) * 1000, 3),
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "mean_ms": round(statistics.fmean(timings) * 1000, 3),
+        "max_ms": round(max(timings) * 1000, 3),
+    }
+
+def measure(func: Callable[[], Any], repeat: int, warmup: int = 1) -> Dict[str, Any]:
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return summarize_timings(timings)
+
+async def measure_async(func: Callable[[], Any], repeat: int, warmup: int = 1) -> Dict[str, Any]:
+    for _ in range(warmup):
+        await func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        timings.append(time.perf_counter() - start)
+    return summarize_timings(timings)
+
+def make_mock_service(llm_latency: float) -> LangChainService:
+    """고정 지연의 mock 모델을 사용하는 LangChainService를 만듭니다 (오류 주입 없음)."""
+    service = LangChainService(provider="mock", model="benchmark", temperature=0.0)
+    service.llm = MockChatModel(model_name="benchmark", latency_distribution="fixed", latency_mean=llm_latency)
+    return service
+
+def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    divergent_turns = set(range(args.divergent_every, args.turns + 1, args.divergent_every)) if args.divergent_every > 0 else set()
+    battle_data = generate_battle_data(
+        seed=args.seed,
+        turns=args.turns,
+        characters=args.characters,
+        actions_per_turn=args.actions,
+        events_per_action=args.events,
+        divergent_turns=divergent_turns
+    )
+    encoded = battle_data["result_info"]["user_record_minimal"]
+    user_data = make_analysis_data(battle_data, "result_info", "user_record_minimal")
+    verify_data = make_analysis_data(battle_data, "result_info", "verify_record_minimal")
+
+    results: Dict[str, Any] = {}
+    results["decode64_and_decompress"] = measure(lambda: decode64_and_decompress(encoded), args.repeat)
+    results["make_analysis_data"] = measure(lambda: make_analysis_data(battle_data, "result_info", "user_record_minimal"), args.repeat)
+
+    reports = {}
+    for report_type in args.report_types:
+        results[f"generate_battle_report.{report_type}"] = measure(lambda: generate_battle_report(user_data, report_type), args.repeat)
+        reports[report_type] = generate_battle_report(user_data, report_type)
+    for report_type, report in reports.items():
+        results[f"split_turns.{report_type}"] = measure(lambda: split_turns(report), args.repeat)
+
+    if not args.skip_llm:
+        # run은 리포트 생성부터 요약까지 포함
+        run_types = [report_type for report_type in args.report_types if report_type in ANALYZED_REPORT_TYPES]
+        async def run_service():
+            return await make_mock_service(args.llm_latency).run(user_data, verify_data, run_types)
+        results["langchain_service.run"] = asyncio.run(measure_async(run_service, args.llm_repeat))
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "params": {
+            "seed": args.seed,
+            "turns": args.turns,
+            "characters": args.characters,
+            "actions_per_turn": args.actions,
+            "events_per_action": args.events,
+            "divergent_turns": len(divergent_turns),
+            "report_types": args.report_types,
+            "encoded_bytes": len(encoded),
+            "decoded_bytes": len(decode64_and_decompress(encoded).encode("utf-8")),
+            "report_chars": {report_type: len(report) for report_type, report in reports.items()},
+            "llm_latency": args.llm_latency,
+        },
+        "results": results,
+    }
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """두 결과의 항목별 중앙값 비율(현재/기준)을 계산합니다. 1보다 크면 느려진 것입니다."""
+    comparison = {}
+    for name, timing in current["results"].items():
+        base_timing = baseline.get("results", {}).get(name)
+        if base_timing and base_timing["median_ms"] > 0:
+            comparison[name] = round(timing["median_ms"] / base_timing["median_ms"], 3)
+    return {"baseline_commit": baseline.get("meta", {}).get("commit"), "median_ratio": comparison}
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="리포트 생성/분석 벤치마크")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--characters", type=int, default=5, help="한 편의 캐릭터 수")
+    parser.add_argument("--actions", type=int, default=3, help="턴당 행동 수")
+    parser.add_argument("--events", type=int, default=4, help="행동당 이벤트 수")
+    parser.add_argument("--divergent-every", type=int, default=5, help="N턴마다 유저 기록을 다르게 만듦 (0이면 동일)")
+    parser.add_argument("--report-types", nargs="+", default=REPORT_TYPES, choices=REPORT_TYPES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--llm-repeat", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="mock LLM 응답 지연 (초)")
+    parser.add_argument("--skip-llm", action="store_true", help="LangChainService.run 측정 생략")
+    parser.add_argument("--output", help="결과 JSON 파일 경로 (없으면 표준 출력)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일 경로")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    # 서비스 로그가 결과 JSON에 섞이지 않도록 표준 에러로 보냄
+    with contextlib.redirect_stdout(sys.stderr):
+        result = run_benchmarks(args)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            result["comparison"] = compare_results(json.load(file), result)
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+        print(f"벤치마크 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,34 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.api.routes import router
+from app.utils.executor import start_process_pool, shutdown_process_pool
+from app.utils.job_queue import analysis_queue
+from app.services.llm_registry import preload_llm_clients, close_llm_clients
+from app.utils.callback_client import callback_client
+from app.utils.callback_outbox import callback_outbox
+from app.utils.artifact_store import artifact_store
 
-app = FastAPI(title="LangChain API Service")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 시작 시 프로세스 풀, LLM/콜백 클라이언트, 분석 대기열 준비, 종료 시 정리
+    start_process_pool()
+    preload_llm_clients()
+    callback_client.start()
+    callback_outbox.start()
+    artifact_store.start()
+    analysis_queue.start()
+    yield
+    await analysis_queue.stop()
+    await artifact_store.stop()
+    await callback_outbox.stop()
+    await callback_client.close()
+    await close_llm_clients()
+    shutdown_process_pool()
+
+app = FastAPI(title="LangChain API Service", lifespan=lifespan)
 
 app.include_router(router, prefix="/api")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
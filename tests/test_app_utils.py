@@ -0,0 +1,123 @@
+import base64
+import json
+import random
+import zlib
+import pytest
+from app.utils.app_utils import iter_analysis_data, iter_decode64_and_decompress, iter_json_array
+
+def encode(text: str) -> str:
+    return base64.b64encode(zlib.compress(text.encode("utf-8"))).decode("ascii")
+
+def chunked(text: str, sizes):
+    """text를 sizes 길이의 조각으로 나눕니다 (sizes를 반복 사용)."""
+    chunks, pos, index = [], 0, 0
+    while pos < len(text):
+        size = sizes[index % len(sizes)]
+        chunks.append(text[pos:pos + size])
+        pos += size
+        index += 1
+    return chunks
+
+def random_value(rng: random.Random, depth: int = 0):
+    kinds = ["int", "float", "string", "literal"] + (["list", "dict"] if depth < 3 else [])
+    kind = rng.choice(kinds)
+    if kind == "int":
+        return rng.choice([0, -1, 7, 12345678901234567890, -rng.randint(0, 10 ** 6), rng.randint(0, 10 ** 6)])
+    if kind == "float":
+        return rng.choice([0.5, -1.25e-7, 3.0e21, 1e-300, rng.uniform(-1e6, 1e6)])
+    if kind == "string":
+        return rng.choice(["", "a", 'quote " inside', "back\\slash", "줄\n바꿈", "emoji 😀", "\u0000\t", "1e5", "true"])
+    if kind == "literal":
+        return rng.choice([True, False, None])
+    if kind == "list":
+        return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {f"k{index}": random_value(rng, depth + 1) for index in range(rng.randint(0, 4))}
+
+SAMPLE = '[1, -2.5e3, "a,]\\"b", true, false, null, {"x": [10, 200]}, 3]'
+
+def test_iter_json_array_every_two_chunk_split():
+    expected = json.loads(SAMPLE)
+    for split in range(len(SAMPLE) + 1):
+        chunks = iter([SAMPLE[:split], SAMPLE[split:]])
+        assert list(iter_json_array(chunks)) == expected, split
+
+def test_iter_json_array_single_character_chunks():
+    assert list(iter_json_array(iter(SAMPLE))) == json.loads(SAMPLE)
+
+@pytest.mark.parametrize("text", ["[12345]", "[1,23456]", "[1.5e10, 2]", "[-0.25]", "[true,null,false]", '["abc"]'])
+def test_iter_json_array_values_split_at_end(text):
+    # 마지막 요소가 조각 경계에서 잘려도 다음 조각과 이어서 파싱
+    for split in range(1, len(text)):
+        assert list(iter_json_array(iter([text[:split], text[split:]]))) == json.loads(text)
+
+def test_iter_json_array_random_splits_match_json_loads():
+    rng = random.Random(1234)
+    for _ in range(500):
+        value = [random_value(rng) for _ in range(rng.randint(0, 8))]
+        text = json.dumps(value, ensure_ascii=rng.random() < 0.5, indent=rng.choice([None, 1]))
+        sizes = [rng.randint(1, 12) for _ in range(rng.randint(1, 4))]
+        assert list(iter_json_array(iter(chunked(text, sizes)))) == json.loads(text)
+
+@pytest.mark.parametrize("text", ["[]", "  [ ]  ", "\n[\n]\n"])
+def test_iter_json_array_empty(text):
+    assert list(iter_json_array(iter(chunked(text, [1])))) == []
+
+@pytest.mark.parametrize("text", [
+    "",
+    "{}",
+    "[1 2]",
+    "[1,]",
+    "[1, 2",
+    "[1] 2",
+    '["unterminated]',
+    "[tru]",
+    "[01]",
+    "[1.]",
+])
+def test_iter_json_array_malformed(text):
+    for sizes in ([1], [3], [len(text) or 1]):
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_array(iter(chunked(text, sizes))))
+
+def test_iter_decode64_and_decompress_chunk_sizes():
+    text = json.dumps([{"code": "영웅_001", "hp": index, "emoji": "😀"} for index in range(200)], ensure_ascii=False)
+    encoded = encode(text)
+    for chunk_size in (1, 3, 4, 7, 64, len(encoded)):
+        assert "".join(iter_decode64_and_decompress(encoded, chunk_size)) == text
+
+def test_iter_decode64_and_decompress_ignores_whitespace():
+    text = json.dumps(list(range(500)))
+    encoded = encode(text)
+    wrapped = "\n".join(encoded[pos:pos + 76] for pos in range(0, len(encoded), 76))
+    assert "".join(iter_decode64_and_decompress(wrapped, 10)) == text
+
+def test_iter_decode64_and_decompress_bad_length():
+    with pytest.raises(base64.binascii.Error):
+        list(iter_decode64_and_decompress(encode("[1, 2, 3]")[:-1]))
+
+def test_iter_decode64_and_decompress_truncated_stream():
+    compressed = zlib.compress(json.dumps(list(range(1000))).encode("utf-8"))
+    truncated = base64.b64encode(compressed[:len(compressed) // 2]).decode("ascii")
+    with pytest.raises(zlib.error):
+        list(iter_decode64_and_decompress(truncated, 16))
+
+def test_iter_decode64_and_decompress_not_zlib():
+    with pytest.raises(zlib.error):
+        list(iter_decode64_and_decompress(base64.b64encode(b"not compressed data").decode("ascii")))
+
+def test_iter_analysis_data_streams_turns():
+    turns = [{"turn_index": index, "history": []} for index in range(1, 51)]
+    data = {"result_info": {"user_record_minimal": encode(json.dumps(turns))}}
+    assert list(iter_analysis_data(data, "result_info", "user_record_minimal")) == turns
+
+@pytest.mark.parametrize("data", [None, {}, {"other": {}}, {"result_info": {}}, {"result_info": "text"}])
+def test_iter_analysis_data_missing_header_or_key_raises_immediately(data):
+    # 반복을 시작하지 않아도 호출 시점에 오류 발생
+    with pytest.raises(ValueError):
+        iter_analysis_data(data, "result_info", "user_record_minimal")
+
+@pytest.mark.parametrize("encoded", ["abc", base64.b64encode(b"plain text").decode("ascii"), encode("[1, 2")])
+def test_iter_analysis_data_corrupted_data_raises_value_error(encoded):
+    turns = iter_analysis_data({"result_info": {"user_record_minimal": encoded}}, "result_info", "user_record_minimal")
+    with pytest.raises(ValueError):
+        list(turns)
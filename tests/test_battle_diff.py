@@ -0,0 +1,127 @@
+import copy
+from itertools import zip_longest
+from app.utils.battle_diff import BattleRecordDiff, diff_battle_records
+from app.utils.battle_record import iter_turns, parse_battle_record
+
+def make_turn(turn_index, dec_hp=10, enemy_hp=90, enemy_status=None, friends=None):
+    """영웅이 오크를 한 번 공격하고 상태 정보를 남기는 턴을 만듭니다."""
+    return {
+        "turn_index": turn_index,
+        "history": [{
+            "sub_owner_code": "hero",
+            "sub_type": "skill",
+            "history": [
+                {"type": "attack", "from_uid": 1, "from_code": "hero", "target_uid": 2, "target_code": "orc", "dec_hp": dec_hp},
+                {"type": "log", "message": "비교하지 않는 이벤트"},
+                {
+                    "type": "sub_state_info",
+                    "state": "after",
+                    "frineds": friends if friends is not None else {"1": {"code": "hero", "hp": 100, "status": {}}},
+                    "enemies": {"2": {"code": "orc", "hp": enemy_hp, "status": enemy_status or {}}},
+                },
+            ],
+        }],
+    }
+
+def make_record(changes=None, turns=5):
+    """1부터 시작하는 turn_index의 기록을 만듭니다. changes는 {turn_index: make_turn 인자}."""
+    hp = 100
+    record = []
+    for turn_index in range(1, turns + 1):
+        hp -= 10
+        record.append(make_turn(turn_index, **{"enemy_hp": hp, **(changes or {}).get(turn_index, {})}))
+    return record
+
+def test_identical_records():
+    record = make_record()
+    diff = diff_battle_records(record, copy.deepcopy(record))
+    assert diff == {
+        "identical": True,
+        "user_turn_count": 5,
+        "verify_turn_count": 5,
+        "first_divergence": None,
+        "diverging_turns": [],
+        "character_deltas": {},
+    }
+
+def test_first_divergence_uses_log_turn_index_and_event_path():
+    user = make_record({3: {"dec_hp": 999, "enemy_hp": 0}})
+    verify = make_record()
+    diff = diff_battle_records(user, verify)
+
+    assert not diff["identical"]
+    assert diff["diverging_turns"] == [3]
+    assert diff["first_divergence"] == {
+        "turn_index": 3,
+        "action_index": 0,
+        "event_index": 0,
+        "event_type": "attack",
+        "field": "dec_hp",
+        "user": 999,
+        "verify": 10,
+    }
+    orc = diff["character_deltas"]["orc"]
+    assert orc["id"] == "2"
+    assert orc["first_diverging_turn"] == 3
+    assert orc["at_divergence"] == {"hp": {"user": 0, "verify": 70, "delta": -70}}
+    # 이후 턴에서 HP가 다시 같아지므로 최종 차이는 없음
+    assert orc["final"] == {}
+
+def test_status_difference_is_reported_per_key():
+    user = make_record({2: {"enemy_status": {"stun": 1, "burn": 2}}})
+    verify = make_record({2: {"enemy_status": {"stun": 1}}})
+    diff = diff_battle_records(user, verify)
+    assert diff["diverging_turns"] == [2]
+    assert diff["first_divergence"]["field"] == "enemies.2.status.burn"
+    assert diff["character_deltas"]["orc"]["at_divergence"] == {"status": {"burn": {"user": 2, "verify": None}}}
+
+def test_event_type_difference_is_reported_first():
+    user = make_record()
+    verify = make_record()
+    verify[1]["history"][0]["history"][0] = {"type": "add_state", "target_code": "orc", "target_uid": 2, "state": "stun"}
+    divergence = diff_battle_records(user, verify)["first_divergence"]
+    assert divergence["turn_index"] == 2
+    assert divergence["field"] == "type"
+    assert (divergence["user"], divergence["verify"]) == ("attack", "add_state")
+
+def test_character_order_does_not_matter():
+    friends = {"1": {"code": "hero", "hp": 100, "status": {}}, "3": {"code": "mage", "hp": 80, "status": {}}}
+    reordered = dict(reversed(list(friends.items())))
+    user = make_record({1: {"friends": friends}})
+    verify = make_record({1: {"friends": reordered}})
+    assert diff_battle_records(user, verify)["identical"]
+
+def test_ignored_events_do_not_cause_divergence():
+    user = make_record()
+    verify = copy.deepcopy(user)
+    verify[0]["history"][0]["history"][1]["message"] = "다른 로그"
+    assert diff_battle_records(user, verify)["identical"]
+
+def test_shorter_verify_record_diverges_on_missing_turns():
+    diff = diff_battle_records(make_record(turns=5), make_record(turns=3))
+    assert diff["user_turn_count"] == 5
+    assert diff["verify_turn_count"] == 3
+    assert diff["diverging_turns"] == [4, 5]
+    assert diff["first_divergence"]["turn_index"] == 4
+    assert diff["first_divergence"]["verify"] is None
+
+def test_missing_turn_index_falls_back_to_position():
+    user = make_record({2: {"dec_hp": 1}}, turns=3)
+    verify = make_record(turns=3)
+    for turn in user + verify:
+        del turn["turn_index"]
+    assert diff_battle_records(user, verify)["diverging_turns"] == [1]
+
+def test_incremental_diff_matches_batch_diff():
+    user = make_record({2: {"dec_hp": 5}, 6: {"enemy_status": {"stun": 1}}}, turns=8)
+    verify = make_record(turns=7)
+
+    incremental = BattleRecordDiff()
+    for user_turn, verify_turn in zip_longest(iter_turns(user), iter_turns(verify)):
+        incremental.add(user_turn, verify_turn)
+
+    expected = diff_battle_records(user, verify)
+    assert incremental.result() == expected
+    assert expected["diverging_turns"] == [2, 6, 8]
+    # 미리 변환한 Turn 목록도 같은 결과
+    assert diff_battle_records(parse_battle_record(user), parse_battle_record(verify)) == expected
@@ -0,0 +1,32 @@
+import json
+from pathlib import Path
+import pytest
+from battle_report import generate_battle_report, generate_battle_reports
+from app.utils.battle_record import parse_battle_record
+
+DATA_DIR = Path(__file__).parent / "data"
+REPORT_TYPES = ["status", "hp", "attack", "effect", "full"]
+
+# golden_reports/*.txt는 기준 커밋(ba84947)의 battle_report.generate_battle_report로
+# battle_log.json을 리포트 타입마다 새 프로세스에서 렌더링한 결과입니다.
+
+def load_battle_log():
+    with open(DATA_DIR / "battle_log.json", encoding="utf-8") as f:
+        return json.load(f)
+
+def golden(report_type: str) -> str:
+    return (DATA_DIR / "golden_reports" / f"{report_type}.txt").read_text(encoding="utf-8")
+
+@pytest.mark.parametrize("report_type", REPORT_TYPES)
+def test_single_report_matches_baseline(report_type):
+    assert generate_battle_report(load_battle_log(), report_type) == golden(report_type)
+
+def test_single_pass_reports_match_baseline():
+    reports = generate_battle_reports(load_battle_log(), REPORT_TYPES)
+    assert list(reports) == REPORT_TYPES
+    for report_type in REPORT_TYPES:
+        assert reports[report_type] == golden(report_type)
+
+def test_parsed_turns_match_baseline():
+    reports = generate_battle_reports(parse_battle_record(load_battle_log()), REPORT_TYPES)
+    assert reports == {report_type: golden(report_type) for report_type in REPORT_TYPES}
@@ -0,0 +1,159 @@
+import asyncio
+import json
+import time
+import httpx
+import pytest
+from app.utils import callback_outbox as outbox_module
+from app.utils.callback_client import callback_client
+from app.utils.callback_outbox import CallbackOutbox
+
+def make_outbox(path, max_attempts: int = 3, batch_size: int = 10, dead_retention_seconds: float = 60) -> CallbackOutbox:
+    return CallbackOutbox(
+        str(path), batch_size=batch_size, poll_interval=0.05, max_attempts=max_attempts,
+        base_backoff=0.001, max_backoff=0.002, dead_retention_seconds=dead_retention_seconds, cleanup_interval=60
+    )
+
+@pytest.fixture
+def verifier(monkeypatch):
+    """콜백 클라이언트를 응답 상태 코드 목록을 순서대로 돌려주는 가짜 서버로 바꿉니다."""
+    state = {"statuses": [], "requests": []}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        state["requests"].append((request.url.path, json.loads(request.content)))
+        status = state["statuses"].pop(0) if state["statuses"] else 200
+        return httpx.Response(status)
+
+    monkeypatch.setattr(callback_client, "client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(outbox_module, "get_callback_batch_url", lambda: None)
+    yield state
+    asyncio.run(callback_client.client.aclose())
+
+def rows(outbox: CallbackOutbox):
+    return outbox._connect().execute("SELECT task_id, attempts, dead FROM callbacks ORDER BY id").fetchall()
+
+async def deliver_due(outbox: CallbackOutbox, rounds: int) -> None:
+    """디스패처 없이 예정 시각이 된 콜백을 rounds번 전송합니다."""
+    for _ in range(rounds):
+        await asyncio.sleep(0.005)
+        due, _ = outbox._fetch_due()
+        if due:
+            await outbox._deliver(due)
+
+def test_delivered_callback_is_deleted(tmp_path, verifier):
+    async def scenario():
+        outbox = make_outbox(tmp_path / "outbox.sqlite3")
+        await outbox.enqueue({"task_id": "t1", "status": "completed"})
+        await deliver_due(outbox, 1)
+        assert rows(outbox) == []
+        assert outbox.pending_count() == 0
+        await outbox.stop()
+    asyncio.run(scenario())
+    assert verifier["requests"] == [("/api/report_gen_finish", {"task_id": "t1", "status": "completed"})]
+
+def test_permanent_error_goes_dead_without_retry(tmp_path, verifier):
+    verifier["statuses"] = [400]
+
+    async def scenario():
+        outbox = make_outbox(tmp_path / "outbox.sqlite3")
+        await outbox.enqueue({"task_id": "t1"})
+        await deliver_due(outbox, 3)
+        assert rows(outbox) == [("t1", 1, 1)]
+        assert outbox.pending_count() == 0
+        await outbox.stop()
+    asyncio.run(scenario())
+    assert len(verifier["requests"]) == 1
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_transient_error_retries_until_max_attempts(tmp_path, verifier, status):
+    verifier["statuses"] = [status] * 10
+
+    async def scenario():
+        outbox = make_outbox(tmp_path / "outbox.sqlite3", max_attempts=3)
+        await outbox.enqueue({"task_id": "t1"})
+        await deliver_due(outbox, 1)
+        # 한 번 실패한 콜백은 백오프 후 다시 전송 대상
+        assert rows(outbox) == [("t1", 1, 0)]
+        await deliver_due(outbox, 5)
+        assert rows(outbox) == [("t1", 3, 1)]
+        await outbox.stop()
+    asyncio.run(scenario())
+    # 콜백 클라이언트는 재시도하지 않으므로 시도 한 번에 요청 한 번
+    assert len(verifier["requests"]) == 3
+
+def test_retry_succeeds_after_transient_error(tmp_path, verifier):
+    verifier["statuses"] = [503, 200]
+
+    async def scenario():
+        outbox = make_outbox(tmp_path / "outbox.sqlite3")
+        await outbox.enqueue({"task_id": "t1"})
+        await deliver_due(outbox, 3)
+        assert rows(outbox) == []
+        await outbox.stop()
+    asyncio.run(scenario())
+    assert len(verifier["requests"]) == 2
+
+def test_cleanup_purges_expired_dead_callbacks(tmp_path, verifier):
+    verifier["statuses"] = [400, 400]
+
+    async def scenario():
+        outbox = make_outbox(tmp_path / "outbox.sqlite3", dead_retention_seconds=60)
+        await outbox.enqueue({"task_id": "old"})
+        await outbox.enqueue({"task_id": "new"})
+        await deliver_due(outbox, 1)
+        assert [row[2] for row in rows(outbox)] == [1, 1]
+        # 한쪽의 중단 시각을 보관 기간 이전으로 옮김
+        outbox._connect().execute("UPDATE callbacks SET next_attempt_at = ? WHERE task_id = 'old'", (time.time() - 120,))
+        assert outbox.cleanup() == 1
+        assert [row[0] for row in rows(outbox)] == ["new"]
+        await outbox.stop()
+    asyncio.run(scenario())
+
+def test_undelivered_callbacks_survive_restart(tmp_path, verifier):
+    path = tmp_path / "outbox.sqlite3"
+
+    async def scenario():
+        outbox = make_outbox(path)
+        await outbox.enqueue({"task_id": "t1"})
+        await outbox.stop()
+
+        restarted = make_outbox(path)
+        assert restarted.pending_count() == 1
+        restarted.start()
+        for _ in range(50):
+            if restarted.pending_count() == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert restarted.pending_count() == 0
+        await restarted.stop()
+    asyncio.run(scenario())
+    assert [payload["task_id"] for _, payload in verifier["requests"]] == ["t1"]
+
+def test_batch_url_sends_callbacks_in_one_request(tmp_path, verifier, monkeypatch):
+    monkeypatch.setattr(outbox_module, "get_callback_batch_url", lambda: "http://verifier/api/report_gen_finish/batch")
+
+    async def scenario():
+        outbox = make_outbox(tmp_path / "outbox.sqlite3", batch_size=2)
+        for task_id in ("t1", "t2", "t3"):
+            await outbox.enqueue({"task_id": task_id})
+        await deliver_due(outbox, 2)
+        assert rows(outbox) == []
+        await outbox.stop()
+    asyncio.run(scenario())
+    # batch_size만큼 묶어서 보내고, 남은 하나는 단건 경로로 전송
+    assert verifier["requests"] == [
+        ("/api/report_gen_finish/batch", {"callbacks": [{"task_id": "t1"}, {"task_id": "t2"}]}),
+        ("/api/report_gen_finish", {"task_id": "t3"}),
+    ]
+
+def test_failed_batch_marks_every_row(tmp_path, verifier, monkeypatch):
+    monkeypatch.setattr(outbox_module, "get_callback_batch_url", lambda: "http://verifier/batch")
+    verifier["statuses"] = [503]
+
+    async def scenario():
+        outbox = make_outbox(tmp_path / "outbox.sqlite3")
+        await outbox.enqueue({"task_id": "t1"})
+        await outbox.enqueue({"task_id": "t2"})
+        await deliver_due(outbox, 1)
+        assert rows(outbox) == [("t1", 1, 0), ("t2", 1, 0)]
+        await outbox.stop()
+    asyncio.run(scenario())
@@ -0,0 +1,136 @@
+import asyncio
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app.api import routes
+from app.utils.job_queue import AnalysisQueue, QueueFullError, QueueUnavailableError
+from app.utils.task_manager import task_store
+from main import app
+
+def make_queue(max_workers: int = 1, max_queue_size: int = 2, provider_limits=None, default_provider_limit: int = 4) -> AnalysisQueue:
+    return AnalysisQueue(max_workers, max_queue_size, provider_limits or {}, default_provider_limit)
+
+def blocking_job(started: list, release: asyncio.Event, name: str):
+    async def run():
+        started.append(name)
+        await release.wait()
+    return run
+
+def test_submit_before_start_raises_unavailable():
+    async def scenario():
+        queue = make_queue()
+        with pytest.raises(QueueUnavailableError):
+            await queue.submit("a", "mock", blocking_job([], asyncio.Event(), "a"))
+        with pytest.raises(QueueUnavailableError):
+            await queue.submit_many([("a", "mock", blocking_job([], asyncio.Event(), "a"))])
+    asyncio.run(scenario())
+
+def test_submit_when_full_raises_queue_full():
+    async def scenario():
+        queue = make_queue(max_workers=1, max_queue_size=2)
+        queue.start()
+        started, release = [], asyncio.Event()
+        try:
+            # 워커가 첫 작업을 잡고 있는 동안 대기열 2칸을 채움
+            await queue.submit("running", "mock", blocking_job(started, release, "running"))
+            await asyncio.sleep(0)
+            assert started == ["running"]
+            assert await queue.submit("a", "mock", blocking_job(started, release, "a")) == 1
+            assert await queue.submit("b", "mock", blocking_job(started, release, "b")) == 2
+            with pytest.raises(QueueFullError):
+                await queue.submit("c", "mock", blocking_job(started, release, "c"))
+            assert queue.depth == 2
+            assert queue.get_queue_info("b")["queue_position"] == 2
+            assert queue.get_queue_info("c") is None
+        finally:
+            release.set()
+            await queue.stop()
+    asyncio.run(scenario())
+
+def test_submit_many_is_all_or_nothing():
+    async def scenario():
+        queue = make_queue(max_workers=1, max_queue_size=3)
+        queue.start()
+        started, release = [], asyncio.Event()
+        try:
+            await queue.submit("running", "mock", blocking_job(started, release, "running"))
+            await asyncio.sleep(0)
+            await queue.submit("a", "mock", blocking_job(started, release, "a"))
+            jobs = [(name, "mock", blocking_job(started, release, name)) for name in ("b", "c", "d")]
+            with pytest.raises(QueueFullError):
+                await queue.submit_many(jobs)
+            assert list(queue.pending) == ["a"]
+            assert await queue.submit_many(jobs[:2]) == [2, 3]
+        finally:
+            release.set()
+            await queue.stop()
+    asyncio.run(scenario())
+
+def test_provider_limit_skips_to_next_provider():
+    async def scenario():
+        queue = make_queue(max_workers=2, max_queue_size=10, provider_limits={"openai": 1})
+        queue.start()
+        started, release = [], asyncio.Event()
+        try:
+            await queue.submit("openai-1", "openai", blocking_job(started, release, "openai-1"))
+            await queue.submit("openai-2", "openai", blocking_job(started, release, "openai-2"))
+            await queue.submit("google-1", "google", blocking_job(started, release, "google-1"))
+            for _ in range(5):
+                await asyncio.sleep(0)
+            # openai는 동시 실행 1개까지이므로 두 번째 워커는 google 작업을 먼저 실행
+            assert started == ["openai-1", "google-1"]
+            assert list(queue.pending) == ["openai-2"]
+            assert queue.in_flight == 2
+        finally:
+            release.set()
+            await queue.stop()
+    asyncio.run(scenario())
+
+def test_failing_job_releases_provider_slot():
+    async def scenario():
+        queue = make_queue(max_workers=1, max_queue_size=10, default_provider_limit=1)
+        queue.start()
+        done = asyncio.Event()
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        async def succeed():
+            done.set()
+
+        try:
+            await queue.submit("fail", "mock", fail)
+            await queue.submit("ok", "mock", succeed)
+            await asyncio.wait_for(done.wait(), 1)
+            assert queue.in_flight == 0
+        finally:
+            await queue.stop()
+    asyncio.run(scenario())
+
+ANALYSIS_REQUEST = {"provider": "mock", "model": "mock", "temperature": 0, "battle_data": json.dumps({})}
+
+def test_analysis_route_returns_503_when_queue_not_running():
+    # lifespan을 실행하지 않으므로 대기열이 시작되지 않은 상태
+    client = TestClient(app)
+    before = set(task_store.tasks)
+    response = client.post("/api/analysis", json=ANALYSIS_REQUEST)
+    assert response.status_code == 503
+    assert set(task_store.tasks) == before
+
+def test_analysis_route_returns_429_when_queue_full(monkeypatch):
+    async def full(*args, **kwargs):
+        raise QueueFullError("full")
+
+    monkeypatch.setattr(routes.analysis_queue, "submit", full)
+    monkeypatch.setattr(routes.analysis_queue, "submit_many", full)
+    client = TestClient(app)
+    before = set(task_store.tasks)
+
+    response = client.post("/api/analysis", json=ANALYSIS_REQUEST)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "30"
+
+    response = client.post("/api/analysis/batch", json={"items": [ANALYSIS_REQUEST]})
+    assert response.status_code == 429
+    # 거절된 작업의 상태는 남기지 않음
+    assert set(task_store.tasks) == before
@@ -0,0 +1,141 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult, Generation, LLMResult
+from langchain_core.prompts import ChatPromptTemplate
+from app.utils.rate_limiter import RateLimiter, RateLimitHeaderCallback, get_rate_limiter, get_retry_delay, is_rate_limit_error
+
+def make_limiter(requests_per_minute: float = 0, max_concurrency: int = 4, burst: int = 1, max_retries: int = 2) -> RateLimiter:
+    return RateLimiter(requests_per_minute, max_concurrency, burst, max_retries, base_backoff=0.001, max_backoff=0.002)
+
+class RateLimited(Exception):
+    status_code = 429
+
+    def __init__(self, headers):
+        super().__init__("rate limited")
+        self.response = type("Response", (), {"headers": headers})()
+
+class HeaderChatModel(BaseChatModel):
+    """응답 메시지에 고정된 헤더를 넣어 반환하는 테스트용 채팅 모델."""
+    headers: dict = {}
+
+    @property
+    def _llm_type(self) -> str:
+        return "header-test"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        message = AIMessage(content="ok", response_metadata={"headers": self.headers})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+@pytest.mark.parametrize("headers, expected", [
+    (None, None),
+    ({}, None),
+    ({"retry-after": "1.5"}, 1.5),
+    ({"retry-after-ms": "250", "retry-after": "9"}, 0.25),
+    ({"x-ratelimit-reset-requests": "6m0s"}, 360.0),
+    ({"x-ratelimit-reset-requests": "1s20ms"}, 1.02),
+    ({"retry-after": "soon"}, None),
+])
+def test_get_retry_delay(headers, expected):
+    delay = get_retry_delay(headers)
+    if expected is None:
+        assert delay is None
+    else:
+        assert delay == pytest.approx(expected)
+
+def test_get_retry_delay_rfc3339_reset():
+    reset_at = (datetime.now(timezone.utc) + timedelta(seconds=30)).isoformat().replace("+00:00", "Z")
+    assert 28 < get_retry_delay({"anthropic-ratelimit-requests-reset": reset_at}) <= 30
+
+def test_is_rate_limit_error():
+    assert is_rate_limit_error(RateLimited({}))
+    assert not is_rate_limit_error(ValueError("x"))
+
+def test_token_bucket_allows_burst_then_paces():
+    async def scenario():
+        # 초당 20회, 한 번에 2회까지
+        limiter = make_limiter(requests_per_minute=1200, burst=2)
+        started = time.monotonic()
+        times = []
+        for _ in range(4):
+            await limiter._take_token()
+            times.append(time.monotonic() - started)
+        return times
+
+    times = asyncio.run(scenario())
+    assert times[1] < 0.02
+    assert times[2] >= 0.04
+    assert times[3] - times[2] >= 0.04
+
+def test_zero_rate_is_unlimited():
+    async def scenario():
+        limiter = make_limiter(requests_per_minute=0, burst=1)
+        started = time.monotonic()
+        for _ in range(100):
+            await limiter._take_token()
+        return time.monotonic() - started
+
+    assert asyncio.run(scenario()) < 0.05
+
+def test_observe_headers_blocks_only_when_exhausted():
+    limiter = make_limiter()
+    limiter.observe_headers({"x-ratelimit-remaining-requests": "3", "x-ratelimit-reset-requests": "5s"})
+    assert limiter.blocked_until == 0.0
+    limiter.observe_headers({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "5s"})
+    assert 4.5 < limiter.blocked_until - time.monotonic() <= 5
+
+def test_call_retries_rate_limit_after_retry_after():
+    async def scenario():
+        limiter = make_limiter(max_retries=2)
+        attempts = []
+
+        async def flaky():
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                raise RateLimited({"retry-after-ms": "50"})
+            return "ok"
+
+        assert await limiter.call(flaky) == "ok"
+        return attempts
+
+    attempts = asyncio.run(scenario())
+    assert len(attempts) == 2
+    assert attempts[1] - attempts[0] >= 0.045
+
+def test_call_raises_after_max_retries():
+    async def scenario():
+        limiter = make_limiter(max_retries=2)
+        attempts = []
+
+        async def broken():
+            attempts.append(1)
+            raise ValueError("broken")
+
+        with pytest.raises(ValueError):
+            await limiter.call(broken)
+        return len(attempts)
+
+    assert asyncio.run(scenario()) == 3
+
+def test_header_callback_observes_chat_model_responses():
+    limiter = make_limiter()
+    llm = HeaderChatModel(
+        headers={"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "2s"},
+        callbacks=[RateLimitHeaderCallback(limiter)]
+    )
+    chain = ChatPromptTemplate.from_messages([("user", "{question}")]) | llm
+    asyncio.run(chain.ainvoke({"question": "hi"}))
+    assert 1.5 < limiter.blocked_until - time.monotonic() <= 2
+
+def test_header_callback_ignores_text_generations():
+    limiter = make_limiter()
+    RateLimitHeaderCallback(limiter).on_llm_end(LLMResult(generations=[[Generation(text="turn 1: verify_success")]]))
+    assert limiter.blocked_until == 0.0
+
+@pytest.mark.parametrize("provider", ["local", "mock"])
+def test_local_and_mock_are_not_throttled_by_default(provider):
+    assert get_rate_limiter(provider, "test-model").rate == 0
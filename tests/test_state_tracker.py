@@ -0,0 +1,68 @@
+import random
+import pytest
+from app.utils.report_utils import StateTracker
+from battle_report import BattleReportBuilder, generate_battle_report
+from app.utils.battle_record import parse_turn
+from tests.test_battle_report import golden, load_battle_log
+
+def baseline_all_states(states: dict) -> dict:
+    """기준 구현의 get_all_states: 조회할 때마다 uid를 정수(실패 시 문자열) 기준으로 정렬합니다."""
+    try:
+        sorted_uids = sorted(states.keys(), key=lambda x: int(x))
+    except (ValueError, TypeError):
+        sorted_uids = sorted(states.keys())
+    return {uid: sorted(str(state) for state in states[uid]) for uid in sorted_uids}
+
+def baseline_summary(states: dict) -> str:
+    lines = ["\n### Current States Summary\n"]
+    for uid, uid_states in baseline_all_states(states).items():
+        lines.append(f" * UID:{uid} Current States: {', '.join(uid_states)}\n")
+    return "".join(lines) if len(lines) > 1 else ""
+
+@pytest.mark.parametrize("seed", range(20))
+def test_incremental_order_matches_baseline(seed):
+    rng = random.Random(seed)
+    # "01"과 "1"처럼 정수 값이 같은 uid, 정수가 아닌 uid를 섞음
+    uids = [1, 2, 10, 101, "3", "01", "-4", "boss", "a1"]
+    states = ["stun", "burn", "poison", "shield", 7]
+    tracker = StateTracker()
+    reference: dict = {}
+    for _ in range(300):
+        uid, state = str(rng.choice(uids)), str(rng.choice(states))
+        if rng.random() < 0.55:
+            tracker.add_state(uid, state)
+            reference.setdefault(uid, set()).add(state)
+        else:
+            tracker.remove_state(uid, state)
+            if uid in reference:
+                reference[uid].discard(state)
+                if not reference[uid]:
+                    del reference[uid]
+        assert list(tracker.get_all_states().items()) == list(baseline_all_states(reference).items())
+        assert tracker.summary() == baseline_summary(reference)
+
+def test_summary_is_rebuilt_after_change():
+    tracker = StateTracker()
+    assert tracker.summary() == ""
+    tracker.add_state(2, "stun")
+    first = tracker.summary()
+    assert tracker.summary() is first
+    tracker.add_state(1, "burn")
+    assert tracker.summary() == "\n### Current States Summary\n * UID:1 Current States: burn\n * UID:2 Current States: stun\n"
+    tracker.remove_state(1, "burn")
+    tracker.remove_state(2, "stun")
+    assert tracker.summary() == ""
+
+def test_repeated_runs_do_not_share_states():
+    # 기준 구현은 전역 추적기를 사용하여 두 번째 실행부터 effect/full 리포트가 달라졌음
+    for _ in range(3):
+        assert generate_battle_report(load_battle_log(), "effect") == golden("effect")
+
+def test_interleaved_builders_are_independent():
+    # 동시에 실행되는 작업처럼 두 리포트의 턴을 번갈아 처리
+    first, second = BattleReportBuilder(["effect"]), BattleReportBuilder(["effect", "full"])
+    for turn_data in load_battle_log():
+        first.add_turn(parse_turn(turn_data))
+        second.add_turn(parse_turn(turn_data))
+    assert first.finish()["effect"] == golden("effect")
+    assert second.finish() == {"effect": golden("effect"), "full": golden("full")}
@@ -0,0 +1,81 @@
+from app.services.turn_context import RollingTurnContext, overlap_preamble
+
+def success(turn_index: int) -> str:
+    return f"turn {turn_index}: verify_success\n결과가 일치합니다."
+
+def fail(turn_index: int) -> str:
+    return f"turn {turn_index}: verify_fail\n데미지가 다릅니다."
+
+def test_empty_context():
+    assert RollingTurnContext().render() == "No previous turn data available."
+
+def test_recent_turns_are_kept_verbatim():
+    context = RollingTurnContext(recent_turns=2)
+    for turn_index in range(3):
+        context.add(turn_index, success(turn_index))
+    rendered = context.render()
+    assert rendered.startswith("Earlier turns: 1 verify_success, 0 verify_fail.")
+    assert f"[Turn 1] Summary:\n{success(1)}" in rendered
+    assert f"[Turn 2] Summary:\n{success(2)}" in rendered
+    assert "[Turn 0]" not in rendered
+
+def test_old_turns_are_compressed_to_counts_and_fail_lines():
+    context = RollingTurnContext(recent_turns=1)
+    context.add(0, success(0))
+    context.add(1, fail(1))
+    context.add_verified(2)
+    context.add(3, success(3))
+    assert context.render().splitlines()[:2] == [
+        "Earlier turns: 2 verify_success, 1 verify_fail.",
+        "turn 1: verify_fail",
+    ]
+
+def test_fail_lines_are_bounded_by_summary_max_chars():
+    line_chars = len("turn 10: verify_fail") + 1
+    context = RollingTurnContext(recent_turns=0, summary_max_chars=line_chars * 3)
+    for turn_index in range(10, 20):
+        context.add(turn_index, fail(turn_index))
+    lines = context.render().splitlines()
+    assert lines[0] == "Earlier turns: 0 verify_success, 10 verify_fail."
+    assert lines[1] == "(oldest 7 verify_fail lines omitted)"
+    assert lines[2:] == [f"turn {turn_index}: verify_fail" for turn_index in (17, 18, 19)]
+
+def test_at_least_one_fail_line_is_kept():
+    context = RollingTurnContext(recent_turns=0, summary_max_chars=1)
+    context.add(1, fail(1))
+    context.add(2, fail(2))
+    assert context.render().splitlines()[-1] == "turn 2: verify_fail"
+
+def test_render_length_is_bounded():
+    context = RollingTurnContext(recent_turns=3, summary_max_chars=500, turn_max_chars=100)
+    lengths = []
+    for turn_index in range(200):
+        context.add(turn_index, fail(turn_index) + "x" * 1000)
+        lengths.append(len(context.render()))
+    # 턴 수가 늘어나도 상한을 넘지 않음
+    assert max(lengths) == max(lengths[100:])
+    assert max(lengths) < 500 + 3 * (100 + 30) + 100
+
+def test_recent_turn_is_truncated_to_turn_max_chars():
+    context = RollingTurnContext(turn_max_chars=10)
+    context.add(0, "0123456789abcdef")
+    assert context.render() == "[Turn 0] Summary:\n0123456789"
+
+def test_verdict_line_skips_blank_lines():
+    assert RollingTurnContext.verdict_line(4, "\n\n  turn 4: verify_fail  \n상세") == "turn 4: verify_fail"
+    assert RollingTurnContext.verdict_line(4, "   ") == "turn 4: (empty analysis)"
+
+def test_preamble_is_rendered_first():
+    context = RollingTurnContext(preamble="[Turn 9] (context only)")
+    assert context.render() == "[Turn 9] (context only)"
+    context.add(10, success(10))
+    assert context.render().splitlines()[0] == "[Turn 9] (context only)"
+
+def test_overlap_preamble_uses_turn_numbers():
+    turns = [((f"u{idx}", f"user {idx}"), (f"v{idx}", f"server {idx}")) for idx in range(5)]
+    preamble = overlap_preamble(turns, start=3, overlap=2, turn_max_chars=4, turn_numbers=[10, 11, 12, 13, 14])
+    assert preamble == (
+        "[Turn 11] (context only, analysed in the previous window)\nUser: user\nServer: serv\n"
+        "[Turn 12] (context only, analysed in the previous window)\nUser: user\nServer: serv"
+    )
+    assert overlap_preamble(turns, start=0, overlap=2) == ""
@@ -0,0 +1,77 @@
+import asyncio
+import re
+from typing import List
+from langchain_core.messages import BaseMessage
+from app.services.langchain_service import LangChainService
+from app.services.mock_llm import MockChatModel
+from app.services.turn_context import split_turn_verdicts
+from app.utils.llm_cache import llm_cache
+
+def test_split_turn_verdicts_accepts_common_formats():
+    text = "turn 1: verify_success\n- turn 2: verify_fail\nfact: hp\n**turn 3**: verify_success\n## Turn 4: verify_success"
+    assert split_turn_verdicts(text, [1, 2, 3, 4]) == {
+        1: "turn 1: verify_success",
+        2: "- turn 2: verify_fail\nfact: hp",
+        3: "**turn 3**: verify_success",
+        4: "## Turn 4: verify_success",
+    }
+
+def test_split_turn_verdicts_ignores_unwanted_and_duplicate_turns():
+    text = "turn 7: verify_fail\nfact: 요청하지 않은 턴\nturn 3: verify_success\nturn 3: verify_fail"
+    # 요청하지 않은 턴은 버리고, 같은 턴이 반복되면 처음 블록만 사용
+    assert split_turn_verdicts(text, [3, 4]) == {3: "turn 3: verify_success"}
+
+def test_split_turn_verdicts_without_verdicts():
+    assert split_turn_verdicts("분석할 수 없습니다.", [1, 2]) == {}
+
+class DroppingChatModel(MockChatModel):
+    """묶음 응답에서 drop_turn의 판정을 빠뜨리는 mock 모델."""
+    drop_turn: int = 0
+    prompts: List[str] = []
+
+    def respond(self, messages: List[BaseMessage]) -> str:
+        prompt = str(messages[-1].content)
+        self.prompts.append(prompt)
+        response = super().respond(messages)
+        if "### Turn" in prompt:
+            response = re.sub(rf"turn {self.drop_turn}: .*?(?=\nturn \d+:|\Z)", "", response, flags=re.S).strip()
+        return response
+
+def make_report(values):
+    return "\n".join(f"## Turn {turn_index}\nhp: {value}" for turn_index, value in values)
+
+def test_turn_missing_from_packed_response_is_reanalysed_alone(monkeypatch):
+    monkeypatch.setattr(llm_cache, "enabled", False)
+    events = []
+    service = LangChainService("mock", "packing-test", 0.0, context_mode="rolling", on_event=lambda event, data: events.append((event, data)))
+    service.pack_budget_tokens = 100000
+    service.pack_max_turns = 4
+    service.llm = DroppingChatModel(model_name="packing-test", drop_turn=12, prompts=[])
+
+    user_report = make_report([(11, 1), (12, 2), (13, 3)])
+    verify_report = make_report([(11, 0), (12, 0), (13, 0)])
+    summary = asyncio.run(service.process_analyze_by_turn(user_report, verify_report, "HP"))
+
+    prompts = service.llm.prompts
+    packed = [prompt for prompt in prompts if "### Turn" in prompt]
+    single = [prompt for prompt in prompts if "Please analyze this turn" in prompt]
+    assert len(packed) == 1
+    assert "Turns 11, 12, 13 Analysis" in packed[0]
+    # 응답에 없던 turn 12만 단독으로 다시 분석
+    assert len(single) == 1
+    assert "Turn 12 Analysis" in single[0]
+
+    turns = [(data["turn_index"], data["verdict"]) for event, data in events if event == "turn"]
+    # 다시 분석한 턴도 순서대로 기록
+    assert turns == [(11, "verify_fail"), (12, "verify_fail"), (13, "verify_fail")]
+    assert summary["key_differences"] == "turn 11, turn 12, turn 13"
+
+def test_packing_disabled_analyses_each_turn(monkeypatch):
+    monkeypatch.setattr(llm_cache, "enabled", False)
+    service = LangChainService("mock", "packing-test", 0.0, context_mode="rolling")
+    service.pack_budget_tokens = 0
+    service.llm = DroppingChatModel(model_name="packing-test", prompts=[])
+
+    asyncio.run(service.process_analyze_by_turn(make_report([(1, 1), (2, 2)]), make_report([(1, 0), (2, 0)]), "HP"))
+    assert not [prompt for prompt in service.llm.prompts if "### Turn" in prompt]
+    assert len([prompt for prompt in service.llm.prompts if "Please analyze this turn" in prompt]) == 2